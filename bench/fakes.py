@@ -0,0 +1,279 @@
+"""
+Offline stand-ins for the live services: an in-process MCP server with the
+same tool names as production, and a deterministic chat model for the
+planner, executor and judge (and the ReAct engine, which it answers with
+tool calls).
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional
+
+from crewai.llms.base_llm import BaseLLM
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp.server.fastmcp import FastMCP
+from mcp.shared.memory import create_connected_server_and_client_session
+
+# Which production server each fake tool stands in for (ToolRunner breakers key on it)
+FAKE_TOOL_SERVERS = {
+    "get_weather": "weather",
+    "tavily_search": "tavily",
+    "list_issues": "github",
+    "create_issue": "github",
+}
+
+
+# ============================================================================
+# FAKE MCP SERVER
+# ============================================================================
+
+def build_fake_mcp_server(latency: float = 0.05, payload_bytes: int = 2000) -> FastMCP:
+    """FastMCP server exposing get_weather, tavily_search, list_issues and create_issue"""
+    mcp = FastMCP("Fake MCP Server", log_level="WARNING")
+
+    def payload(prefix: str) -> str:
+        filler = "x" * max(0, payload_bytes - len(prefix))
+        return prefix + filler
+
+    @mcp.tool()
+    async def get_weather(location: dict) -> str:
+        """Get current weather."""
+        await asyncio.sleep(latency)
+        return f"{location.get('city', 'Unknown')}, US: 15.9°C, wind 9.1 km/h."
+
+    @mcp.tool()
+    async def tavily_search(query: str, max_results: int = 10) -> str:
+        """Search the web."""
+        await asyncio.sleep(latency)
+        return payload(f"Results for {query!r} (top {max_results}): ")
+
+    # A small static repo history, returned as JSON like the GitHub MCP server does
+    issues = [
+        {
+            "number": n,
+            "title": f"Fake issue {n}",
+            "state": "open" if n % 3 else "closed",
+            "body": payload(f"Body of issue {n}: ")[:200],
+            "labels": [{"name": "bug" if n % 2 else "enhancement"}],
+            "user": {"login": "octocat"},
+            "html_url": f"https://github.com/fake/fake/issues/{n}",
+            "created_at": f"2025-01-{n:02d}T00:00:00Z",
+            "updated_at": f"2025-02-{n:02d}T00:00:00Z",
+        }
+        for n in range(1, 26)
+    ]
+
+    @mcp.tool()
+    async def list_issues(
+        owner: str,
+        repo: str,
+        per_page: int = 30,
+        state: str = "open",
+        page: int = 1,
+        since: str = "",
+        sort: str = "created",
+        direction: str = "desc",
+    ) -> str:
+        """List issues in a GitHub repository."""
+        await asyncio.sleep(latency)
+        selected = [i for i in issues if state == "all" or i["state"] == state]
+        selected = [i for i in selected if i["updated_at"] >= since]
+        key = "updated_at" if sort == "updated" else "created_at"
+        selected.sort(key=lambda i: i[key], reverse=direction == "desc")
+        return json.dumps(selected[(page - 1) * per_page:page * per_page])
+
+    @mcp.tool()
+    async def create_issue(owner: str, repo: str, title: str, body: str = "") -> str:
+        """Create a new issue in a GitHub repository."""
+        await asyncio.sleep(latency)
+        return f"Created issue #1 in {owner}/{repo}: {title}"
+
+    return mcp
+
+
+@asynccontextmanager
+async def fake_mcp_tools(latency: float = 0.05, payload_bytes: int = 2000) -> AsyncIterator[List[Any]]:
+    """Connect to an in-process fake MCP server over memory streams and yield LangChain tools"""
+    server = build_fake_mcp_server(latency, payload_bytes)
+    async with create_connected_server_and_client_session(server._mcp_server) as session:
+        tools = await load_mcp_tools(session)
+        for tool in tools:
+            tool.metadata = {**(tool.metadata or {}), "mcp_server": FAKE_TOOL_SERVERS.get(tool.name, "fake")}
+        yield tools
+
+
+# ============================================================================
+# FAKE CHAT MODEL
+# ============================================================================
+
+def _plan_for(goal: str) -> dict:
+    goal_lower = goal.lower()
+    tools = []
+    if "weather" in goal_lower:
+        tools.append("get_weather")
+    if any(w in goal_lower for w in ["search", "find", "latest"]):
+        tools.append("tavily_search")
+    if "list" in goal_lower and "issue" in goal_lower:
+        tools.append("list_issues")
+    if "create" in goal_lower and "issue" in goal_lower:
+        tools.append("create_issue")
+    if not tools:
+        tools.append("tavily_search")
+
+    return {
+        "goal": goal,
+        "assumptions": [],
+        "steps": [
+            {
+                "step_id": i + 1,
+                "action": f"Use {tool}",
+                "tools": [tool],
+                "success_criteria": f"{tool} returns data",
+            }
+            for i, tool in enumerate(tools)
+        ],
+        "risks": [],
+    }
+
+
+def fake_completion(prompt: str) -> str:
+    """Deterministic response for a planner, executor or judge prompt"""
+    if "strict evaluator" in prompt or "Return ONLY valid JSON for this schema" in prompt:
+        return json.dumps({
+            "success": 4,
+            "plan_quality": 4,
+            "reasoning_quality": 4,
+            "notes": "Deterministic fake judge",
+        })
+
+    if "Task Planner" in prompt:
+        goals = re.findall(r"Goal: (.+)", prompt)
+        goal = goals[-1].strip() if goals else "unknown goal"
+        return json.dumps(_plan_for(goal))
+
+    goals = re.findall(r"Original user goal: (.+)", prompt)
+    goal = goals[-1].strip() if goals else "the goal"
+    return f"Completed: {goal}"
+
+
+def _prompt_text(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for m in messages:
+        content = m.get("content") if isinstance(m, dict) else getattr(m, "content", "")
+        parts.append(str(content))
+    return "\n".join(parts)
+
+
+class FakeCrewLLM(BaseLLM):
+    """CrewAI LLM returning fake_completion() in CrewAI's 'Final Answer:' format"""
+
+    def __init__(self, latency: float = 0.0, model: str = "fake-model", **kwargs: Any):
+        super().__init__(model=model, **kwargs)
+        self.latency = latency
+        self.stream = False
+        # Simulated provider prefix cache; shared by Agent.copy()'s shallow copies
+        self._prefix_cache: List[str] = []
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None) -> str:
+        prompt = _prompt_text(messages)
+        answer = fake_completion(prompt)
+        response = f"Thought: I now know the final answer\nFinal Answer: {answer}"
+        if self.stream:
+            # Spread the latency over the chunks, like a provider generating tokens
+            chunks = [response[i:i + 16] for i in range(0, len(response), 16)]
+            for chunk in chunks:
+                if self.latency:
+                    time.sleep(self.latency / len(chunks))
+                self._emit_stream_chunk_event(chunk, from_task=from_task, from_agent=from_agent)
+        elif self.latency:
+            time.sleep(self.latency)
+        cached = max((len(os.path.commonprefix([prompt, p])) for p in self._prefix_cache), default=0)
+        self._prefix_cache[:] = [prompt] + self._prefix_cache[:7]
+        self._track_token_usage_internal({
+            "prompt_tokens": len(prompt) // 4,
+            "completion_tokens": len(answer) // 4,
+            "cached_prompt_tokens": cached // 4,
+        })
+        return response
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def get_context_window_size(self) -> int:
+        return 128_000
+
+
+# Arguments the fake ReAct model passes to each fake tool
+_REACT_ARGS = {
+    "get_weather": lambda goal: {"location": {"city": "Tokyo"}},
+    "tavily_search": lambda goal: {"query": goal},
+    "list_issues": lambda goal: {"owner": "deepmehta27", "repo": "mcp-navigator-test"},
+    "create_issue": lambda goal: {"owner": "deepmehta27", "repo": "mcp-navigator-test", "title": goal},
+}
+
+
+def fake_react_message(messages: Any) -> AIMessage:
+    """ReAct turn: call the goal's tools (one LLM turn), then answer once their results are in"""
+    goal = next((str(m.content) for m in reversed(messages) if getattr(m, "type", "") == "human"), "the goal")
+    if any(isinstance(m, ToolMessage) for m in messages):
+        return AIMessage(content=f"Completed: {goal}")
+    tools = [step["tools"][0] for step in _plan_for(goal)["steps"]]
+    return AIMessage(
+        content="",
+        tool_calls=[
+            {"name": tool, "args": _REACT_ARGS[tool](goal), "id": f"call_{i}", "type": "tool_call"}
+            for i, tool in enumerate(tools)
+        ],
+    )
+
+
+class FakeChatModel(BaseChatModel):
+    """LangChain chat model returning fake_completion() (judge) or fake ReAct turns (once tools are bound)"""
+
+    latency: float = 0.0
+    react: bool = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs) -> "FakeChatModel":
+        return self.model_copy(update={"react": True})
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._result(messages)
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._result(messages)
+
+    def _result(self, messages) -> ChatResult:
+        prompt = _prompt_text(messages)
+        message = fake_react_message(messages) if self.react else AIMessage(content=fake_completion(prompt))
+        text = str(message.content) or json.dumps(message.tool_calls)
+        message.usage_metadata = {
+            "input_tokens": len(prompt) // 4,
+            "output_tokens": len(text) // 4,
+            "total_tokens": (len(prompt) + len(text)) // 4,
+        }
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+
+def fake_llms(latency: float = 0.0, judge_latency: Optional[float] = None):
+    """(crew_llm, judge_llm) pair for build_agents(llm=..., judge_llm=...)"""
+    judge_latency = latency if judge_latency is None else judge_latency
+    return FakeCrewLLM(latency=latency), FakeChatModel(latency=judge_latency)
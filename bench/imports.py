@@ -0,0 +1,125 @@
+"""
+Cold-start / import-time benchmark.
+
+    python -m bench.imports
+    python -m bench.imports --top 15
+
+Runs each entry point in a fresh interpreter with `-X importtime` and reports
+wall time, total import time, the heaviest top-level packages and whether any
+heavy framework (CrewAI, LangChain) was loaded.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["crewai", "langchain_openai", "langchain_mcp_adapters", "langchain_core", "litellm"]
+
+# (label, python argv) - entry points that should stay light, then the heavy ones
+ENTRY_POINTS: List[Tuple[str, List[str]]] = [
+    ("cli help", ["-m", "orchestrai.cli", "help"]),
+    ("cli metrics", ["-m", "orchestrai.cli", "metrics"]),
+    ("view_metrics.py", [str(ROOT / "scripts" / "view_metrics.py")]),
+    ("import orchestrai.cli", ["-c", "import orchestrai.cli"]),
+    ("import orchestrai.workflow", ["-c", "import orchestrai.workflow"]),
+]
+
+_PROBE = (
+    "import atexit, sys, json\n"
+    "atexit.register(lambda: sys.stderr.write('\\n@@heavy ' + json.dumps("
+    "[m for m in {heavy!r} if m in sys.modules]) + '\\n'))\n"
+    "sys.argv = {argv!r}\n"
+    "import runpy\n"
+)
+
+
+@dataclass
+class ImportResult:
+    label: str
+    wall_seconds: float
+    import_seconds: float
+    heavy_loaded: List[str]
+    packages: Dict[str, float] = field(default_factory=dict)
+
+
+def _probe_code(argv: List[str]) -> str:
+    """Wrap an entry point so we can see which heavy modules it loaded"""
+    script_argv = argv[1:] if argv[0] in ("-m", "-c") else argv
+    code = _PROBE.format(heavy=HEAVY_MODULES, argv=script_argv)
+    if argv[0] == "-m":
+        return code + f"runpy.run_module({argv[1]!r}, run_name='__main__', alter_sys=True)\n"
+    if argv[0] == "-c":
+        return code + argv[1] + "\n"
+    return code + f"runpy.run_path({argv[0]!r}, run_name='__main__')\n"
+
+
+def measure(label: str, argv: List[str]) -> ImportResult:
+    cmd = [sys.executable, "-X", "importtime", "-c", _probe_code(argv)]
+    start = time.perf_counter()
+    proc = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True, stdin=subprocess.DEVNULL)
+    wall = time.perf_counter() - start
+
+    packages: Counter = Counter()
+    heavy: List[str] = []
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        if line.startswith("@@heavy "):
+            heavy = json.loads(line[len("@@heavy "):])
+            continue
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, _, name = [p.strip() for p in line[len("import time:"):].split("|")]
+        except ValueError:
+            continue
+        total_us += int(self_us)
+        packages[name.split(".")[0]] += int(self_us)
+
+    return ImportResult(
+        label=label,
+        wall_seconds=wall,
+        import_seconds=total_us / 1e6,
+        heavy_loaded=heavy,
+        packages={name: us / 1e6 for name, us in packages.most_common()},
+    )
+
+
+def print_results(results: List[ImportResult], top: int = 5) -> None:
+    print("\n" + "=" * 96)
+    print("🚀 COLD START / IMPORT TIME")
+    print("=" * 96)
+    print(f"{'Entry point':<30}{'Wall s':>9}{'Import s':>10}  {'Heavy frameworks loaded'}")
+    print("-" * 96)
+    for r in results:
+        heavy = ", ".join(r.heavy_loaded) if r.heavy_loaded else "none"
+        print(f"{r.label:<30}{r.wall_seconds:>9.2f}{r.import_seconds:>10.2f}  {heavy}")
+
+    print("\nHeaviest packages (self import time):")
+    for r in results:
+        parts = ", ".join(f"{name} {sec:.2f}s" for name, sec in list(r.packages.items())[:top])
+        print(f"  {r.label:<28} {parts}")
+    print("=" * 96 + "\n")
+
+
+def run_import_benchmarks() -> List[ImportResult]:
+    return [measure(label, argv) for label, argv in ENTRY_POINTS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MCP Navigator cold-start import time")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest packages to show per entry point")
+    args = parser.parse_args()
+    print_results(run_import_benchmarks(), args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Offline benchmark suite: no network, no API keys.
+
+    python -m bench.run                                # all targets
+    python -m bench.run --target run_orchestration --runs 100 --concurrency 8
+    python -m bench.run --tool-latency-ms 50 --llm-latency-ms 200 --payload-bytes 8000
+    python -m bench.run --llm-latency-ms 200 --runs 20   # CrewAI vs ReAct engine rows side by side
+
+Reports throughput, p50/p99 latency and allocations per run for ToolRunner.call,
+execute_plan_tools, run_orchestration (CrewAI engine) and the LangGraph ReAct
+engine against bench.fakes stand-ins.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, List
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("CREWAI_TRACING_ENABLED", "false")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+# Keep fake issues out of the real data/issues.db
+os.environ.setdefault("ORCHESTRAI_ISSUE_MIRROR", os.path.join(tempfile.mkdtemp(), "issues.db"))
+
+from bench.fakes import FakeChatModel, fake_llms, fake_mcp_tools
+from orchestrai.agents import build_agents
+from orchestrai.engines import ReactEngine
+from orchestrai.metrics import MetricsTracker
+from orchestrai.schemas import TaskPlan
+from orchestrai.tool_runner import ToolRunner, parse_rate_limits
+from orchestrai.workflow import execute_plan_tools, run_orchestration
+
+GOALS = [
+    "What's the weather in Tokyo?",
+    "Search for the latest multi-agent AI frameworks",
+    "List issues for deepmehta27/mcp-navigator-test",
+    "Search for trending AI repos and create issue in deepmehta27/mcp-navigator-test titled 'Trends'",
+]
+
+TARGETS = ["tool_runner", "execute_plan_tools", "run_orchestration", "react_engine"]
+
+
+@dataclass
+class BenchResult:
+    target: str
+    runs: int
+    concurrency: int
+    wall_seconds: float
+    latencies: List[float]
+    alloc_kib_per_run: float
+    alloc_blocks_per_run: float
+
+    @property
+    def throughput(self) -> float:
+        return self.runs / self.wall_seconds if self.wall_seconds else 0.0
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+        return ordered[index]
+
+
+async def _timed_runs(fn: Callable[[int], Awaitable[Any]], runs: int, concurrency: int) -> tuple:
+    latencies: List[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(i: int) -> None:
+        async with sem:
+            start = time.perf_counter()
+            await fn(i)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    return time.perf_counter() - start, latencies
+
+
+async def _allocations(fn: Callable[[int], Awaitable[Any]], runs: int) -> tuple:
+    """Sequential runs under tracemalloc: (KiB allocated per run, blocks per run)"""
+    await fn(0)  # Warm caches so one-off imports are not counted
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(runs):
+        await fn(i)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    diffs = after.compare_to(before, "filename")
+    size = sum(d.size_diff for d in diffs if d.size_diff > 0)
+    blocks = sum(d.count_diff for d in diffs if d.count_diff > 0)
+    return size / 1024 / runs, blocks / runs
+
+
+async def bench_target(target: str, tools: List[Any], args: argparse.Namespace) -> BenchResult:
+    runner = ToolRunner(tools, rate_limits=parse_rate_limits(args.rate_limits))
+    crew_llm, judge_llm = fake_llms(args.llm_latency_ms / 1000)
+    agents = build_agents(tools, llm=crew_llm, judge_llm=judge_llm)
+    metrics = MetricsTracker(os.path.join(tempfile.mkdtemp(prefix="orchestrai-bench-"), "metrics.jsonl"))
+
+    plan = TaskPlan.model_validate({
+        "goal": GOALS[3],
+        "steps": [
+            {"step_id": 1, "action": "Search", "tools": ["tavily_search"], "success_criteria": "results"},
+            {"step_id": 2, "action": "File issue", "tools": ["create_issue"], "success_criteria": "created"},
+        ],
+    })
+
+    async def tool_runner(i: int) -> Any:
+        return await runner.call("get_weather", {"city": "Tokyo"})
+
+    async def plan_tools(i: int) -> Any:
+        return await execute_plan_tools(plan, runner, GOALS[3])
+
+    async def orchestration(i: int) -> Any:
+        return await run_orchestration(
+            GOALS[i % len(GOALS)], tools, agents=agents, metrics=metrics, runner=runner
+        )
+
+    react = ReactEngine(tools, metrics, runner, judge_llm=judge_llm, llm=FakeChatModel(latency=args.llm_latency_ms / 1000))
+
+    async def react_engine(i: int) -> Any:
+        return await react.run(GOALS[i % len(GOALS)])
+
+    fn = {
+        "tool_runner": tool_runner,
+        "execute_plan_tools": plan_tools,
+        "run_orchestration": orchestration,
+        "react_engine": react_engine,
+    }[target]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        await fn(0)  # Warm-up
+        wall, latencies = await _timed_runs(fn, args.runs, args.concurrency)
+        alloc_kib, alloc_blocks = await _allocations(fn, min(args.runs, args.alloc_runs))
+
+    return BenchResult(target, args.runs, args.concurrency, wall, latencies, alloc_kib, alloc_blocks)
+
+
+def print_results(results: List[BenchResult]) -> None:
+    print("\n" + "=" * 96)
+    print("📈 OFFLINE BENCHMARK")
+    print("=" * 96)
+    print(f"{'Target':<22}{'Runs':>6}{'Conc':>6}{'Runs/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'KiB/run':>12}{'Blocks/run':>12}")
+    print("-" * 96)
+    for r in results:
+        print(
+            f"{r.target:<22}{r.runs:>6}{r.concurrency:>6}{r.throughput:>10.1f}"
+            f"{r.percentile(50) * 1000:>10.2f}{r.percentile(99) * 1000:>10.2f}"
+            f"{r.alloc_kib_per_run:>12.1f}{r.alloc_blocks_per_run:>12.0f}"
+        )
+    print("=" * 96 + "\n")
+
+
+async def run_benchmarks(args: argparse.Namespace) -> List[BenchResult]:
+    targets = TARGETS if args.target == "all" else [args.target]
+    results = []
+    async with fake_mcp_tools(args.tool_latency_ms / 1000, args.payload_bytes) as tools:
+        for target in targets:
+            results.append(await bench_target(target, tools, args))
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Offline MCP Navigator benchmarks")
+    parser.add_argument("--target", choices=TARGETS + ["all"], default="all")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--tool-latency-ms", type=float, default=20.0)
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0)
+    parser.add_argument("--payload-bytes", type=int, default=2000)
+    parser.add_argument(
+        "--rate-limits", default="", help='Simulated upstream quotas, e.g. "weather=20/1" (calls/seconds)'
+    )
+    parser.add_argument("--alloc-runs", type=int, default=10, help="Sequential runs measured under tracemalloc")
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    print_results(asyncio.run(run_benchmarks(args)))
+
+
+if __name__ == "__main__":
+    main()
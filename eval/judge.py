@@ -1,10 +1,10 @@
 from __future__ import annotations # Allows using types before they're defined
 
 import os
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
 from pydantic import BaseModel, Field, ValidationError
-from langchain_openai import ChatOpenAI
 
 
 class JudgeScore(BaseModel):
@@ -14,31 +14,42 @@ class JudgeScore(BaseModel):
     notes: str
 
 
-def _llm() -> ChatOpenAI:
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+def _llm() -> Any:
+    from langchain_openai import ChatOpenAI
+
+    # Judging is a short scoring task: default to the small model
+    model = os.getenv("ORCHESTRAI_JUDGE_MODEL", "gpt-4o-mini")
     return ChatOpenAI(model=model, temperature=0)
 
-def judge_run(
-    goal: str,
-    plan: Dict[str, Any],
-    final_answer: str,
-    trace: Optional[str] = None,
-) -> JudgeScore:
-    """
-    LLM-as-judge for multi-agent orchestration quality.
-    Returns a strict 0-5 score per dimension.
-    """
 
-    llm = _llm()
+@lru_cache(maxsize=1)
+def _schema() -> str:
+    """JudgeScore schema, rendered once instead of on every judge/fix prompt"""
+    return str(JudgeScore.model_json_schema())
 
-    prompt = (
+
+@lru_cache(maxsize=1)
+def _judge_header() -> str:
+    """Static judge instructions; identical bytes on every call"""
+    return (
         "You are a strict evaluator for a multi-agent tool orchestration system.\n"
         "Score from 0 to 5 (integers) for each category:\n"
         "- success: does the final answer satisfy the goal?\n"
         "- plan_quality: is the plan step-by-step, realistic, and correctly scoped?\n"
         "- tool_use_quality: are the selected tools appropriate and used sensibly?\n\n"
         "Return ONLY valid JSON that matches this schema exactly:\n"
-        f"{JudgeScore.model_json_schema()}\n\n"
+        f"{_schema()}\n\n"
+    )
+
+
+def _judge_prompt(
+    goal: str,
+    plan: Dict[str, Any],
+    final_answer: str,
+    trace: Optional[str] = None,
+) -> str:
+    prompt = (
+        _judge_header() +
         f"GOAL:\n{goal}\n\n"
         f"PLAN (JSON):\n{plan}\n\n"
         f"FINAL ANSWER:\n{final_answer}\n\n"
@@ -46,17 +57,73 @@ def judge_run(
 
     if trace:
         prompt += f"TRACE:\n{trace[:6000]}\n"
+    return prompt
+
+
+def _fix_prompt(raw: str) -> str:
+    return (
+        "Return ONLY valid JSON for this schema. No markdown, no prose.\n"
+        f"{_schema()}\n\n"
+        f"Original response:\n{raw}"
+    )
+
+
+def judge_run(
+    goal: str,
+    plan: Dict[str, Any],
+    final_answer: str,
+    trace: Optional[str] = None,
+) -> JudgeScore:
+    """
+    LLM-as-judge for multi-agent orchestration quality.
+    Returns a strict 0-5 score per dimension.
+    """
+
+    llm = _llm()
 
-    raw = llm.invoke(prompt).content
+    raw = llm.invoke(_judge_prompt(goal, plan, final_answer, trace)).content
 
     try:
         return JudgeScore.model_validate_json(raw)
     except ValidationError:
         # If the judge returns extra text, try a second pass to coerce JSON-only
-        fix_prompt = (
-            "Return ONLY valid JSON for this schema. No markdown, no prose.\n"
-            f"{JudgeScore.model_json_schema()}\n\n"
-            f"Original response:\n{raw}"
-        )
-        raw2 = llm.invoke(fix_prompt).content
-        return JudgeScore.model_validate_json(raw2)
\ No newline at end of file
+        raw2 = llm.invoke(_fix_prompt(raw)).content
+        return JudgeScore.model_validate_json(raw2)
+
+
+def _track_usage(usage: Optional[Dict[str, int]], message: Any) -> None:
+    """Add a LangChain message's usage_metadata (incl. cache reads) to usage"""
+    meta = getattr(message, "usage_metadata", None)
+    if usage is None or not meta:
+        return
+    cached = (meta.get("input_token_details") or {}).get("cache_read", 0) or 0
+    usage["prompt_tokens"] = usage.get("prompt_tokens", 0) + meta.get("input_tokens", 0)
+    usage["cached_prompt_tokens"] = usage.get("cached_prompt_tokens", 0) + cached
+    usage["completion_tokens"] = usage.get("completion_tokens", 0) + meta.get("output_tokens", 0)
+
+
+async def ajudge_run(
+    goal: str,
+    plan: Dict[str, Any],
+    final_answer: str,
+    trace: Optional[str] = None,
+    llm: Optional[Any] = None,
+    usage: Optional[Dict[str, int]] = None,
+) -> JudgeScore:
+    """
+    Async judge_run: uses ainvoke so the event loop keeps serving other runs.
+    If usage is given, token counts of every judge call are added to it.
+    """
+
+    llm = llm or _llm()
+
+    message = await llm.ainvoke(_judge_prompt(goal, plan, final_answer, trace))
+    _track_usage(usage, message)
+    raw = message.content
+
+    try:
+        return JudgeScore.model_validate_json(raw)
+    except ValidationError:
+        message = await llm.ainvoke(_fix_prompt(raw))
+        _track_usage(usage, message)
+        return JudgeScore.model_validate_json(message.content)
@@ -14,6 +14,8 @@ from langgraph.prebuilt import create_react_agent
 from langchain_openai import ChatOpenAI
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
+from orchestrai.memory import ConversationMemory
+
 # ---- Pretty step-by-step tracing via a LangChain callback -------------------
 try:
     from langchain_core.callbacks import BaseCallbackHandler
@@ -156,7 +158,7 @@ async def run_cli():
     It prints the final answer AND the step-by-step tool calls used.
     """
     agent, system = await build_agent()
-    history = []  # minimal in-memory conversation so the agent has context
+    memory = ConversationMemory.from_env()  # bounded: recent turns + background summary
     step_printer = StepPrinter()
 
 
@@ -184,8 +186,8 @@ async def run_cli():
             print("bye!")
             return
 
-        # Assemble messages (simple memory)
-        messages = [{"role": "system", "content": system}] + history + [{"role": "user", "content": q}]
+        # Assemble messages (bounded memory: summary + recent turns)
+        messages = [{"role": "system", "content": system}] + memory.messages() + [{"role": "user", "content": q}]
 
         t0 = time.time()
         result = await agent.ainvoke({"messages": messages}, config = {"callbacks":[step_printer]},
@@ -196,13 +198,8 @@ async def run_cli():
         answer = result["messages"][-1].content
         print(f"\n[Final Answer] {answer}\n(took {ms:.0f} ms)\n")
 
-        # Save turn to history
-        history.extend(
-            [
-                {"role": "user", "content": q},
-                {"role": "assistant", "content": answer},
-            ]
-        )
+        # Save turn; older turns are summarized in the background
+        memory.add_turn(q, answer)
 
 if __name__ == "__main__":
     asyncio.run(run_cli())
\ No newline at end of file
@@ -1,29 +1,50 @@
 from __future__ import annotations
 import os
+from dataclasses import dataclass
 from crewai import Agent
 from langchain_openai import ChatOpenAI
-from typing import List, Any
+from typing import List, Any, Optional
 
 from .mcp_tools import filter_tools
 
-def _llm() -> ChatOpenAI:
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+# Per-stage model overrides; the planner tries a small model first and escalates
+# to ORCHESTRAI_PLANNER_ESCALATION_MODEL when its plan is invalid or low-confidence
+STAGE_MODEL_DEFAULTS = {
+    "planner": "gpt-4o-mini",
+    "judge": "gpt-4o-mini",
+}
+
+
+def stage_model(stage: str) -> str:
+    """ORCHESTRAI_<STAGE>_MODEL, else the stage default, else OPENAI_MODEL"""
+    default = STAGE_MODEL_DEFAULTS.get(stage) or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    return os.getenv(f"ORCHESTRAI_{stage.upper()}_MODEL") or default
+
+
+def planner_escalation_model() -> Optional[str]:
+    """Larger planner model, or None when it is the same as the fast one"""
+    model = os.getenv("ORCHESTRAI_PLANNER_ESCALATION_MODEL") or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+    return None if model == stage_model("planner") else model
+
+
+def _llm(model: Optional[str] = None) -> ChatOpenAI:
+    model = model or os.getenv("OPENAI_MODEL", "gpt-4o-mini")
     return ChatOpenAI(model=model, temperature=0)
 
 
-def build_research_agent(all_tools: List[Any]) -> Agent:
+def build_research_agent(all_tools: List[Any], llm: Optional[Any] = None) -> Agent:
     return Agent(
         role="Research Coordinator",
         goal="Gather accurate, relevant information using search and browsing tools.",
         backstory="You are careful, skeptical, and cite sources in your own scratch notes.",
-        llm=_llm(),
+        llm=llm or _llm(),
         allow_delegation=False,
         verbose=False,
         tools=[]
     )
 
 
-def build_planner_agent(all_tools: List[Any]) -> Agent:
+def build_planner_agent(all_tools: List[Any], llm: Optional[Any] = None, model: Optional[str] = None) -> Agent:
     tools = []
     return Agent(
         role="Task Planner",
@@ -35,14 +56,14 @@ def build_planner_agent(all_tools: List[Any]) -> Agent:
             "- For weather: Use 'get_weather'\n"
             "- Keep plans simple - prefer single-step solutions"
         ),
-        llm=_llm(),
+        llm=llm or _llm(model or stage_model("planner")),
         allow_delegation=False,
         verbose=True,
         tools=[],
     )
 
 
-def build_executor_agent(all_tools: List[Any]) -> Agent:
+def build_executor_agent(all_tools: List[Any], llm: Optional[Any] = None) -> Agent:
     tools = filter_tools(all_tools, allow=["weather"])
     return Agent(
         role="Action Executor",
@@ -56,8 +77,43 @@ def build_executor_agent(all_tools: List[Any]) -> Agent:
             "- Output ONLY the final user-facing answer"
         ),
         backstory="You are practical and focus on completing tasks with tool calls.",
-        llm=_llm(),
+        llm=llm or _llm(stage_model("executor")),
         allow_delegation=False,
         verbose=True,
         tools=[]
     )
+
+
+@dataclass
+class AgentSet:
+    """Agents built once and shared across orchestration runs"""
+    research: Agent
+    planner: Agent
+    executor: Agent
+    judge: Optional[Any] = None  # Chat model for eval.judge (None = default)
+    planner_escalation: Optional[Agent] = None  # Larger-model planner (None = no escalation)
+
+
+def build_agents(
+    all_tools: List[Any],
+    llm: Optional[Any] = None,
+    judge_llm: Optional[Any] = None,
+    escalation_llm: Optional[Any] = None,
+) -> AgentSet:
+    """
+    Build the agent set with per-stage models (see stage_model).
+    `llm`/`judge_llm`/`escalation_llm` override the OpenAI defaults (e.g. offline fakes).
+    """
+    escalation = None
+    if escalation_llm is not None:
+        escalation = build_planner_agent(all_tools, escalation_llm)
+    elif llm is None and planner_escalation_model():
+        escalation = build_planner_agent(all_tools, model=planner_escalation_model())
+
+    return AgentSet(
+        research=build_research_agent(all_tools, llm),
+        planner=build_planner_agent(all_tools, llm),
+        executor=build_executor_agent(all_tools, llm),
+        judge=judge_llm or _llm(stage_model("judge")),
+        planner_escalation=escalation,
+    )
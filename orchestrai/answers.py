@@ -0,0 +1,85 @@
+"""
+Deterministic answer rendering for single-tool runs.
+
+When a plan ran exactly one tool and its result is already user-ready (a
+weather line, a created issue, an issue list), formatting it locally is as
+good as an executor LLM rewording it, and a full LLM round trip cheaper.
+Anything a template does not recognise falls through to the executor.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+MAX_LISTED_ISSUES = 10
+
+_WEATHER = re.compile(r"^(?P<place>.+): (?P<temp>-?[\d.]+)°C, wind (?P<wind>[\d.]+) km/h\.?$")
+
+
+def _weather(result: str, user_goal: str) -> Optional[str]:
+    match = _WEATHER.match(result.strip())
+    if not match:
+        return None  # "Couldn't find ...", "No weather data ..." need the executor
+    return (
+        f"🌤️ Current weather in {match['place']}: {match['temp']}°C, "
+        f"wind {match['wind']} km/h."
+    )
+
+
+def _json(result: str) -> Any:
+    try:
+        return json.loads(result)
+    except (TypeError, ValueError):
+        return None  # truncated or not JSON
+
+
+def _created_issue(result: str, user_goal: str) -> Optional[str]:
+    issue = _json(result)
+    if not isinstance(issue, dict):
+        return None
+    url = issue.get("html_url") or issue.get("url")
+    if not url:
+        return None
+    number = f" #{issue['number']}" if issue.get("number") else ""
+    title = f": {issue['title']}" if issue.get("title") else ""
+    return f"✅ Created issue{number}{title}\n{url}"
+
+
+def _issue_list(result: str, user_goal: str) -> Optional[str]:
+    data = _json(result)
+    issues = data.get("issues") if isinstance(data, dict) else data
+    if not isinstance(issues, list):
+        return None
+    if not issues:
+        return "No issues found."
+
+    lines: List[str] = [f"Found {len(issues)} issue{'s' if len(issues) != 1 else ''}:"]
+    for issue in issues[:MAX_LISTED_ISSUES]:
+        if not isinstance(issue, dict) or "title" not in issue:
+            return None
+        state = f" ({issue['state']})" if issue.get("state") else ""
+        lines.append(f"- #{issue.get('number', '?')} {issue['title']}{state}")
+    if len(issues) > MAX_LISTED_ISSUES:
+        lines.append(f"... and {len(issues) - MAX_LISTED_ISSUES} more")
+    return "\n".join(lines)
+
+
+# tool name -> template(result, user_goal) returning the answer, or None to defer to the executor
+TEMPLATES: Dict[str, Callable[[str, str], Optional[str]]] = {
+    "get_weather": _weather,
+    "create_issue": _created_issue,
+    "list_issues": _issue_list,
+}
+
+
+def render_answer(tool_results: Dict[str, Any], user_goal: str) -> Optional[str]:
+    """Final answer for a single successful, templated tool result; None means run the executor"""
+    if len(tool_results) != 1:
+        return None  # multi-tool synthesis needs the executor
+    (tool_name, result), = tool_results.items()
+    result = str(result)
+    if result.startswith("Error:"):
+        return None
+    template = TEMPLATES.get(tool_name)
+    return template(result, user_goal) if template else None
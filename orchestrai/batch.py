@@ -0,0 +1,185 @@
+"""
+Batch goal runner.
+
+    python -m orchestrai.batch goals.jsonl results.jsonl --concurrency 8 --resume
+
+Each input line is either {"goal": "...", "id": "..."} or a bare JSON string.
+Each output line is {"offset": N, "id": ..., "result": {...}} or
+{"offset": N, "id": ..., "error": "..."}, written as soon as that goal finishes.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from orchestrai.cassette import RECORD, REPLAY, Cassette, use_cassette
+from orchestrai.profiling import SamplingProfiler
+from orchestrai.runtime import OrchestrationRuntime
+
+
+def iter_goals(path: Path, start_offset: int = 0) -> Iterator[Tuple[int, Any, str]]:
+    """Stream (offset, id, goal) from a JSONL file; offset is the 0-based line number"""
+    with open(path, "r", encoding="utf-8") as f:
+        for offset, line in enumerate(f):
+            if offset < start_offset or not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+                if isinstance(data, str):
+                    yield offset, None, data
+                else:
+                    yield offset, data.get("id"), data["goal"]
+            except (ValueError, KeyError, AttributeError) as e:
+                print(f"⚠️  Skipping malformed line {offset}: {e}")
+
+
+def completed_offsets(path: Path) -> Set[int]:
+    """Offsets already written to an output file (a torn last line is ignored)"""
+    done: Set[int] = set()
+    if not path.exists():
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["offset"])
+            except (ValueError, KeyError, TypeError):
+                continue
+    return done
+
+
+class BatchWriter:
+    """Append-only JSONL writer, flushed per record so a crash loses at most one line"""
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Terminate a torn line left behind by a previous crash
+        if path.exists() and path.stat().st_size:
+            with open(path, "rb") as f:
+                f.seek(-1, 2)
+                needs_newline = f.read(1) != b"\n"
+            if needs_newline:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("\n")
+        self._f = open(path, "a", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self._f.write(json.dumps(record, default=str) + "\n")
+        self._f.flush()
+
+    def close(self) -> None:
+        self._f.close()
+
+
+async def run_batch(
+    input_path: Path,
+    output_path: Path,
+    runtime: OrchestrationRuntime,
+    concurrency: int = 4,
+    start_offset: int = 0,
+    resume: bool = False,
+    timeout: Optional[float] = None,
+) -> Dict[str, int]:
+    """Run every goal in input_path through the shared runtime; returns counters"""
+    skip = completed_offsets(output_path) if resume else set()
+    writer = BatchWriter(output_path)
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    counts = {"ok": 0, "failed": 0, "skipped": 0}
+
+    async def producer() -> None:
+        for offset, goal_id, goal in iter_goals(input_path, start_offset):
+            if offset in skip:
+                counts["skipped"] += 1
+                continue
+            await queue.put((offset, goal_id, goal))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    async def worker() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            offset, goal_id, goal = item
+            record: Dict[str, Any] = {"offset": offset, "id": goal_id, "goal": goal}
+            try:
+                result = await asyncio.wait_for(runtime.run(goal), timeout=timeout)
+                record["result"] = result.model_dump(mode="json")
+                counts["ok"] += 1
+            except Exception as e:
+                record["error"] = str(e) or type(e).__name__
+                counts["failed"] += 1
+            writer.write(record)
+
+    start = time.time()
+    try:
+        await asyncio.gather(producer(), *(worker() for _ in range(concurrency)))
+    finally:
+        writer.close()
+
+    total = counts["ok"] + counts["failed"]
+    elapsed = time.time() - start
+    print(
+        f"\n📦 Batch done: {total} runs ({counts['ok']} ok, {counts['failed']} failed, "
+        f"{counts['skipped']} skipped) in {elapsed:.1f}s"
+    )
+    return counts
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Run goals from a JSONL file")
+    parser.add_argument("input", type=Path)
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--offset", type=int, default=0, help="Skip input lines before this offset")
+    parser.add_argument("--resume", action="store_true", help="Skip offsets already in the output file")
+    parser.add_argument("--timeout", type=float, default=None, help="Per-goal timeout in seconds")
+    cassette_group = parser.add_mutually_exclusive_group()
+    cassette_group.add_argument("--record", metavar="CASSETTE", help="Record tool/LLM exchanges to a cassette")
+    cassette_group.add_argument("--replay", metavar="CASSETTE", help="Serve tool/LLM exchanges from a cassette")
+    parser.add_argument("--zero-latency", action="store_true", help="Replay without recorded delays")
+    parser.add_argument("--profile", metavar="FOLDED", help="Profile the batch and write collapsed stacks here")
+    args = parser.parse_args()
+
+    cassette = Cassette.from_env()
+    if args.record:
+        cassette = Cassette(args.record, RECORD)
+    elif args.replay:
+        cassette = Cassette(args.replay, REPLAY, zero_latency=args.zero_latency)
+
+    async def _run():
+        print("\n⏳ Loading MCP servers...")
+        runtime = await OrchestrationRuntime.load()
+        await run_batch(
+            args.input,
+            args.output,
+            runtime,
+            concurrency=args.concurrency,
+            start_offset=args.offset,
+            resume=args.resume,
+            timeout=args.timeout,
+        )
+        await runtime.drain()
+
+    profiler = SamplingProfiler() if args.profile else None
+    with use_cassette(cassette):
+        if profiler:
+            profiler.start()
+        try:
+            asyncio.run(_run())
+        finally:
+            if profiler:
+                profiler.stop()
+                profiler.print_summary()
+                print(f"🔥 Flamegraph stacks: {profiler.write_folded(args.profile)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+# Dedicated pool for synchronous LLM work (CrewAI kickoff). Sized separately
+# from asyncio's default executor so slow LLM calls cannot starve it.
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_LOCK = threading.Lock()
+
+
+def llm_pool() -> ThreadPoolExecutor:
+    """Return the shared LLM thread pool (ORCHESTRAI_LLM_THREADS, default 16)"""
+    global _POOL
+    if _POOL is None:
+        with _POOL_LOCK:
+            if _POOL is None:
+                size = int(os.getenv("ORCHESTRAI_LLM_THREADS", "16"))
+                _POOL = ThreadPoolExecutor(max_workers=size, thread_name_prefix="orchestrai-llm")
+    return _POOL
+
+
+def shutdown_pool(wait: bool = False) -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown(wait=wait, cancel_futures=True)
+            _POOL = None
+
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking call on the LLM pool without stalling the event loop.
+    Context variables are propagated to the worker thread. On cancellation a
+    call that has not started yet is dropped; one already running finishes in
+    the background and its result is discarded.
+    """
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, fn, *args, **kwargs)
+    future = llm_pool().submit(call)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
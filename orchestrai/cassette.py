@@ -0,0 +1,188 @@
+"""
+Record/replay cassettes for MCP tool calls and LLM stage exchanges.
+
+Record a live run, then replay it offline with identical responses:
+
+    ORCHESTRAI_CASSETTE=runs/slow.cassette.gz ORCHESTRAI_CASSETTE_MODE=record python -m orchestrai.cli
+    ORCHESTRAI_CASSETTE=runs/slow.cassette.gz ORCHESTRAI_CASSETTE_MODE=replay python -m orchestrai.cli
+
+Entries are content-addressed: the key is a hash of (kind, name, request) and
+responses are stored once per distinct body, so repeated payloads cost nothing.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+RECORD = "record"
+REPLAY = "replay"
+
+
+class CassetteMiss(KeyError):
+    """Replay found no recorded response for this request"""
+
+
+class RecordedError(RuntimeError):
+    """Replays an exception that was raised while recording"""
+
+
+def _digest(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:20]
+
+
+class ReplayTool:
+    """Stand-in for a recorded MCP tool; calls are served by the cassette"""
+
+    def __init__(self, name: str, description: str = "", server: str = "unknown"):
+        self.name = name
+        self.description = description
+        self.metadata = {"mcp_server": server}
+
+    async def ainvoke(self, args: Dict[str, Any]) -> Any:
+        raise CassetteMiss(f"Tool '{self.name}' has no recorded response for {args}")
+
+
+class Cassette:
+    """Content-addressed store of request -> response exchanges"""
+
+    def __init__(self, path: str, mode: str = REPLAY, zero_latency: bool = False):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Cassette mode must be '{RECORD}' or '{REPLAY}', got '{mode}'")
+        self.path = Path(path)
+        self.mode = mode
+        self.zero_latency = zero_latency
+        self.entries: Dict[str, List[Dict[str, Any]]] = {}
+        self.blobs: Dict[str, Any] = {}
+        self.catalog: List[Dict[str, str]] = []
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        if mode == REPLAY or self.path.exists():
+            self.load()
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == RECORD
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == REPLAY
+
+    @staticmethod
+    def key(kind: str, name: str, request: Any) -> str:
+        return _digest([kind, name, request])
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        request: Any,
+        response: Any = None,
+        latency: float = 0.0,
+        error: Optional[str] = None,
+    ) -> None:
+        if not self.recording:
+            return
+        try:
+            json.dumps(response)
+        except (TypeError, ValueError):
+            response = str(response)
+        blob = _digest(response)
+        entry = {"name": name, "blob": blob, "latency": round(latency, 4)}
+        if error is not None:
+            entry["error"] = error
+        with self._lock:
+            self.blobs.setdefault(blob, response)
+            self.entries.setdefault(self.key(kind, name, request), []).append(entry)
+
+    def record_catalog(self, tools: List[Any]) -> None:
+        """Remember the loaded tool catalog so replay needs no MCP servers"""
+        if not self.recording:
+            return
+        self.catalog = [
+            {
+                "name": t.name,
+                "description": getattr(t, "description", "") or "",
+                "server": (getattr(t, "metadata", None) or {}).get("mcp_server", "unknown"),
+            }
+            for t in tools
+        ]
+
+    def replay_tools(self) -> List[ReplayTool]:
+        return [ReplayTool(t["name"], t["description"], t["server"]) for t in self.catalog]
+
+    def lookup(self, kind: str, name: str, request: Any) -> Dict[str, Any]:
+        """Next recorded exchange for this request (the last one repeats once exhausted)"""
+        key = self.key(kind, name, request)
+        with self._lock:
+            recorded = self.entries.get(key)
+            if not recorded:
+                raise CassetteMiss(f"No recorded {kind} exchange for '{name}' (key {key})")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            return recorded[min(index, len(recorded) - 1)]
+
+    async def replay(self, kind: str, name: str, request: Any) -> Any:
+        entry = self.lookup(kind, name, request)
+        if not self.zero_latency and entry["latency"]:
+            await asyncio.sleep(entry["latency"])
+        if "error" in entry:
+            raise RecordedError(entry["error"])
+        return self.blobs[entry["blob"]]
+
+    def load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+        self.entries = data.get("entries", {})
+        self.blobs = data.get("blobs", {})
+        self.catalog = data.get("catalog", [])
+
+    def save(self) -> None:
+        if not self.recording:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with self._lock:
+            data = {"version": 1, "catalog": self.catalog, "entries": self.entries, "blobs": self.blobs}
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    @classmethod
+    def from_env(cls) -> Optional["Cassette"]:
+        """Cassette configured by ORCHESTRAI_CASSETTE / _MODE / _ZERO_LATENCY, if any"""
+        path = os.getenv("ORCHESTRAI_CASSETTE")
+        if not path:
+            return None
+        return cls(
+            path,
+            mode=os.getenv("ORCHESTRAI_CASSETTE_MODE", REPLAY),
+            zero_latency=os.getenv("ORCHESTRAI_CASSETTE_ZERO_LATENCY", "").lower() in ("1", "true", "yes"),
+        )
+
+
+_active: contextvars.ContextVar[Optional[Cassette]] = contextvars.ContextVar("orchestrai_cassette", default=None)
+
+
+def current_cassette() -> Optional[Cassette]:
+    return _active.get()
+
+
+@contextmanager
+def use_cassette(cassette: Optional[Cassette]) -> Iterator[Optional[Cassette]]:
+    """Record or replay every tool call and LLM stage inside this block; saves on exit"""
+    token = _active.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _active.reset(token)
+        if cassette is not None:
+            cassette.save()
@@ -3,9 +3,16 @@ from __future__ import annotations
 import asyncio
 from datetime import datetime
 from dotenv import load_dotenv
+from orchestrai.cassette import Cassette, use_cassette
+from orchestrai.memory import ConversationMemory
 from orchestrai.metrics import MetricsTracker
+from orchestrai.profiling import SamplingProfiler
+from orchestrai.tool_index import index_for
+from orchestrai.tool_runner import ToolRunner
 from .mcp_tools import load_mcp_tools, get_tool_names
-from .workflow import run_orchestration
+from . import events, issue_mirror
+
+# CrewAI/LangChain are imported lazily (in repl) so `help` and `metrics` start instantly
 
 def print_banner():
     """Display startup banner"""
@@ -55,16 +62,76 @@ def print_help():
     print("Commands:")
     print("   metrics       - View performance metrics")
     print("   metrics 5     - View last 5 runs")
+    print("   profile <goal> - Run a goal under the profiler (hotspots + flamegraph stacks)")
+    print("   forget        - Clear conversation memory")
     print("   help          - Show this help message")
     print("   clear         - Clear screen")
     print("   exit          - Quit the application")
     print("\n" + "-" * 60)
 
+class EventRenderer:
+    """Print run events incrementally as they arrive"""
+
+    def __init__(self):
+        self.streamed_answer = False
+
+    def __call__(self, event: events.RunEvent) -> None:
+        data = event.data
+        if event.type == events.PLAN_READY:
+            steps = data["plan"]["steps"]
+            print(f"\n📋 Plan ready in {data['latency']:.1f}s ({len(steps)} steps)")
+            for step in steps:
+                tools = ", ".join(step.get("tools") or []) or "no tool"
+                print(f"   {step['step_id']}. {step['action']} [{tools}]")
+
+        elif event.type == events.TOOL_STARTED:
+            print(f"\n▶️  {data['tool']} started")
+
+        elif event.type == events.TOOL_FINISHED:
+            icon = "✅" if data["ok"] else "⚠️ "
+            print(f"{icon} {data['tool']} finished in {data['latency']:.2f}s")
+
+        elif event.type == events.TOKEN:
+            if not self.streamed_answer:
+                self.streamed_answer = True
+                print(f"\n{'─'*60}")
+                print("✅ FINAL ANSWER")
+                print(f"{'─'*60}")
+            print(data["text"], end="", flush=True)
+
+        elif event.type == events.ANSWER and self.streamed_answer:
+            print(f"\n{'─'*60}\n")
+
+
+def run_command(argv) -> bool:
+    """Handle one-shot `help` / `metrics [N]` subcommands without loading the agent stack"""
+    if not argv:
+        return False
+    cmd = argv[0].lower()
+    if cmd in ("help", "-h", "--help"):
+        print_banner()
+        print_help()
+        return True
+    if cmd == "metrics":
+        last_n = int(argv[1]) if len(argv) > 1 and argv[1].isdigit() else None
+        MetricsTracker().print_summary(last_n)
+        return True
+    return False
+
 async def main():
     load_dotenv()
     
+    # Optional record/replay of tool calls and LLM stages (see orchestrai.cassette)
+    with use_cassette(Cassette.from_env()) as cassette:
+        await repl(cassette)
+
+async def repl(cassette=None):
+    from .engines import EngineRouter
+    
     # Display banner
     print_banner()
+    if cassette:
+        print(f"\n📼 Cassette {cassette.mode}: {cassette.path}")
     
     # Load tools
     print("\n⏳ Loading MCP servers...")
@@ -77,8 +144,16 @@ async def main():
     # Display loaded tools
     print_tools_loaded(tools)
     
-    # Initialize metrics
+    # Initialize metrics and a shared tool runner (keeps circuit breaker state across goals)
     metrics = MetricsTracker()
+    runner = ToolRunner(tools)
+    index_for(tools)  # planner tool retrieval (see orchestrai.tool_index)
+    
+    # CrewAI pipeline or LangGraph ReAct per goal type, optional A/B shadow runs
+    router = EngineRouter.from_env(tools, metrics, runner)
+    
+    # Bounded conversation memory: recent turns verbatim, older ones summarized
+    memory = ConversationMemory.from_env()
     
     # Show help
     print_help()
@@ -111,26 +186,53 @@ async def main():
                 print_tools_loaded(tools)
                 continue
             
+            elif cmd == "forget":
+                memory.clear()
+                print("🧹 Conversation memory cleared")
+                continue
+            
             elif cmd.startswith("metrics"):
                 parts = user_input.split()
                 last_n = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
                 metrics.print_summary(last_n)
                 continue
             
+            # "profile <goal>": run the goal under the sampling profiler
+            profiler = None
+            if cmd.startswith("profile "):
+                user_input = user_input[len("profile "):].strip()
+                profiler = SamplingProfiler().start()
+            
             # Execute workflow
             print(f"\n{'='*60}")
             print(f"🤖 Processing: {user_input}")
             print(f"{'='*60}")
             
             try:
-                result = await run_orchestration(user_input, tools)
+                render = EventRenderer()
+                async for event in router.stream(user_input, context=memory.render()):
+                    if event.type == events.ERROR:
+                        raise RuntimeError(event.data["error"])
+                    if event.type != events.DONE:
+                        render(event)
+                        continue
+                    
+                    # Display result (unless it was already streamed token by token)
+                    if not render.streamed_answer:
+                        print(f"\n{'─'*60}")
+                        print("✅ FINAL ANSWER")
+                        print(f"{'─'*60}")
+                        print(event.data["result"].final_answer)
+                        print(f"{'─'*60}\n")
+                    memory.add_turn(user_input, event.data["result"].final_answer)
                 
-                # Display result
-                print(f"\n{'─'*60}")
-                print("✅ FINAL ANSWER")
-                print(f"{'─'*60}")
-                print(result.final_answer)
-                print(f"{'─'*60}\n")
+                # input() blocks the event loop, so finish any A/B shadow run / mirror backfill now
+                if router.shadows_pending:
+                    await router.drain()
+                await issue_mirror.drain()
+                
+                if cassette:
+                    cassette.save()
                 
             except KeyboardInterrupt:
                 print("\n\n⚠️  Task cancelled by user\n")
@@ -139,6 +241,13 @@ async def main():
             except Exception as e:
                 print(f"\n❌ Error: {str(e)}\n")
                 continue
+            
+            finally:
+                if profiler:
+                    profiler.stop()
+                    path = profiler.write_folded(f"data/profiles/{datetime.now():%Y%m%d-%H%M%S}.folded")
+                    profiler.print_summary()
+                    print(f"🔥 Flamegraph stacks: {path}")
         
         except KeyboardInterrupt:
             print("\n\n👋 Goodbye!\n")
@@ -148,4 +257,6 @@ async def main():
             break
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import sys
+    if not run_command(sys.argv[1:]):
+        asyncio.run(main())
@@ -0,0 +1,376 @@
+"""
+Pluggable orchestration engines over one set of MCP tools, runner and metrics.
+
+- "crewai": the planner -> tools -> executor -> judge pipeline (orchestrai.workflow)
+- "react":  a LangGraph ReAct agent (as in legacy_single_agent_client) whose tool
+            calls go through the shared ToolRunner, judged and logged the same way
+
+EngineRouter picks an engine per goal type (ORCHESTRAI_ENGINE_ROUTES, falling
+back to ORCHESTRAI_ENGINE) and, for a sampled fraction of read-only goals
+(ORCHESTRAI_AB_FRACTION), re-runs the goal on the other engine in the
+background, with write tools refusing and at most ORCHESTRAI_AB_MAX_SHADOWS
+shadow runs in flight (further samples are dropped). Both runs are logged with the same MetricEntry.ab_group, so
+latency, LLM calls and judge score can be compared per goal type
+(`python -m orchestrai.cli metrics`).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import random
+import re
+import time
+import uuid
+from abc import ABC, abstractmethod
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from eval.judge import ajudge_run
+from orchestrai import events, profiling, prompts
+from orchestrai.agents import AgentSet, stage_model
+from orchestrai.cassette import current_cassette
+from orchestrai.metrics import MetricEntry, MetricsTracker, infer_goal_type
+from orchestrai.schemas import ExecutionResult
+from orchestrai.tool_runner import ToolRunner, read_only_tools
+from orchestrai.workflow import run_orchestration
+
+ENGINES = ("crewai", "react")
+DEFAULT_ENGINE = os.getenv("ORCHESTRAI_ENGINE", "crewai")
+AB_FRACTION = float(os.getenv("ORCHESTRAI_AB_FRACTION", "0"))
+AB_MAX_SHADOWS = int(os.getenv("ORCHESTRAI_AB_MAX_SHADOWS", "2"))
+REACT_MAX_STEPS = int(os.getenv("ORCHESTRAI_REACT_MAX_STEPS", "8"))
+
+# Goals that may write (issues, files, ...) are never run twice; shadow runs are also read-only
+WRITE_GOAL = re.compile(
+    r"\b(create|update|delete|close|reopen|comment|merge|push|fork|assign|edit|write|add|open an?)\b",
+    re.IGNORECASE,
+)
+
+REACT_SYSTEM = (
+    "You are a tool-using assistant.\n"
+    "- Use 'tavily_search' for web searches and 'get_weather' for city weather.\n"
+    "- Use the GitHub tools for repositories, issues and files.\n"
+    "- Call each tool at most once unless it failed; do not invent tools.\n"
+    "Be concise and return a clear final answer."
+)
+
+
+def parse_routes(spec: str) -> Dict[str, str]:
+    """'weather=react,search=crewai' -> {goal_type: engine}"""
+    routes = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        goal_type, _, engine = part.partition("=")
+        engine = engine.strip().lower()
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine '{engine}' in route '{part}' (choose from {', '.join(ENGINES)})")
+        routes[goal_type.strip().lower()] = engine
+    return routes
+
+
+class Engine(ABC):
+    """Runs one goal end to end (tools, answer, judge, metrics) and returns an ExecutionResult"""
+    name = ""
+
+    @abstractmethod
+    async def run(self, user_goal: str, context: str = "", ab_group: str = "") -> ExecutionResult:
+        """Run user_goal; ab_group tags the metrics of an A/B pair"""
+
+
+class CrewEngine(Engine):
+    """The CrewAI planner/executor pipeline (orchestrai.workflow.run_orchestration)"""
+    name = "crewai"
+
+    def __init__(self, tools: List[Any], agents: Optional[AgentSet], metrics: MetricsTracker, runner: ToolRunner):
+        self.tools = tools
+        self.agents = agents
+        self.metrics = metrics
+        self.runner = runner
+
+    async def run(self, user_goal: str, context: str = "", ab_group: str = "") -> ExecutionResult:
+        return await run_orchestration(
+            user_goal,
+            self.tools,
+            agents=self.agents,
+            metrics=self.metrics,
+            runner=self.runner,
+            context=context,
+            ab_group=ab_group,
+        )
+
+
+# Per-run tool call log for ReactEngine; tool coroutines run in tasks that copy the context
+_react_calls: contextvars.ContextVar[Optional[Dict[str, Dict[str, Any]]]] = contextvars.ContextVar(
+    "orchestrai_react_calls", default=None
+)
+
+
+class ReactEngine(Engine):
+    """LangGraph create_react_agent over the shared MCP tools, routed through ToolRunner"""
+    name = "react"
+
+    def __init__(
+        self,
+        tools: List[Any],
+        metrics: MetricsTracker,
+        runner: ToolRunner,
+        judge_llm: Optional[Any] = None,
+        llm: Optional[Any] = None,
+        max_steps: int = REACT_MAX_STEPS,
+    ):
+        from langchain_core.tools import StructuredTool
+        from langgraph.prebuilt import create_react_agent
+
+        self.metrics = metrics
+        self.runner = runner
+        self.judge_llm = judge_llm
+        if llm is None:
+            from langchain_openai import ChatOpenAI
+            llm = ChatOpenAI(model=stage_model("react"), temperature=0)
+        self.model = str(getattr(llm, "model_name", None) or getattr(llm, "model", None) or "unknown")
+        self.max_steps = max_steps
+
+        # Same names, descriptions and schemas as the MCP tools; the call goes through the runner
+        # (timeouts, breakers, rate limits, cassettes) instead of the raw MCP session
+        wrapped = [
+            StructuredTool(
+                name=tool.name,
+                description=tool.description or tool.name,
+                args_schema=tool.args_schema,
+                coroutine=self._tool_coroutine(tool.name),
+            )
+            for tool in tools
+        ]
+        self.agent = create_react_agent(llm, wrapped, prompt=REACT_SYSTEM)
+
+    def _tool_coroutine(self, tool_name: str):
+        async def call(**kwargs: Any) -> str:
+            return await self._call(tool_name, kwargs)
+        return call
+
+    async def _call(self, tool_name: str, args: Dict[str, Any]) -> str:
+        calls = _react_calls.get()
+        tool_start = time.time()
+        events.emit(events.TOOL_STARTED, tool=tool_name, step_id=len(calls) + 1 if calls is not None else 0)
+        print(f"\n🔧 Executing: {tool_name}")
+        try:
+            text = str(await self.runner.call(tool_name, args))
+            ok = True
+        except Exception as e:
+            text = f"Error: {str(e)}"
+            ok = False
+            print(f"⚠️  Failed: {text}")
+        if calls is not None:
+            calls[tool_name] = {
+                "server": self.runner.server_of.get(tool_name, ""),
+                "seconds": round(time.time() - tool_start, 4),
+                "ok": ok,
+            }
+        events.emit(events.TOOL_FINISHED, tool=tool_name, ok=ok, latency=time.time() - tool_start, preview=text[:150])
+        return prompts.clip_result(text)  # same cap as the executor's tool results
+
+    async def run(self, user_goal: str, context: str = "", ab_group: str = "") -> ExecutionResult:
+        from langchain_core.messages import AIMessage
+
+        start_time = time.time()
+        calls: Dict[str, Dict[str, Any]] = {}
+        messages = []
+        if context:
+            messages.append({"role": "system", "content": f"Conversation so far:\n{context}"})
+        messages.append({"role": "user", "content": user_goal})
+
+        profiling.mark_phase("react")
+        stage_start = time.perf_counter()
+        token = _react_calls.set(calls)
+        try:
+            output = await self.agent.ainvoke(
+                {"messages": messages}, config={"recursion_limit": 2 * self.max_steps + 1}
+            )
+            replies = [m for m in output["messages"] if isinstance(m, AIMessage)]
+            answer = str(replies[-1].content) if replies else ""
+            succeeded, errors = bool(answer), [] if answer else ["ReAct agent returned no answer"]
+        except Exception as e:
+            replies, answer, succeeded, errors = [], f"Execution failed: {str(e)}", False, [str(e)]
+        finally:
+            _react_calls.reset(token)
+        stage_latency = {"react": time.perf_counter() - stage_start}
+        events.emit(events.ANSWER, text=answer, ok=succeeded)
+
+        # The judge scores a plan; give it the tool calls the agent made, in order
+        steps = [
+            {"step_id": i + 1, "action": f"Call {call['name']}", "tools": [call["name"]]}
+            for i, call in enumerate(c for m in replies for c in (m.tool_calls or []))
+        ]
+        plan = {"goal": user_goal, "engine": self.name, "steps": steps}
+
+        token_usage: Dict[str, Dict[str, int]] = {}
+        usage = [m.usage_metadata for m in replies if m.usage_metadata]
+        if usage:
+            token_usage["react"] = {
+                "prompt_tokens": sum(u.get("input_tokens", 0) for u in usage),
+                "cached_prompt_tokens": sum((u.get("input_token_details") or {}).get("cache_read", 0) for u in usage),
+                "completion_tokens": sum(u.get("output_tokens", 0) for u in usage),
+            }
+
+        profiling.mark_phase("judge")
+        stage_start = time.perf_counter()
+        judge_usage: Dict[str, int] = {}
+        judge = await ajudge_run(
+            goal=user_goal, plan=plan, final_answer=answer, trace=None, llm=self.judge_llm, usage=judge_usage
+        )
+        if judge_usage:
+            token_usage["judge"] = judge_usage
+        stage_latency["judge"] = time.perf_counter() - stage_start
+        print(f"\n📊 Judge scores: Success={judge.success}/5, Plan={judge.plan_quality}/5, Reasoning={judge.reasoning_quality}/5")
+
+        execution_time = time.time() - start_time
+        profiling.mark_phase("metrics")
+        self.metrics.log(MetricEntry(
+            timestamp=datetime.now().isoformat(),
+            goal=user_goal,
+            goal_type=infer_goal_type(user_goal),
+            success_score=judge.success,
+            plan_score=judge.plan_quality,
+            reasoning_score=judge.reasoning_quality,
+            execution_time_seconds=execution_time,
+            completed=succeeded,
+            errors=errors,
+            tools_used=sorted(calls),
+            tool_calls=calls,
+            open_breakers=self.runner.open_breakers(),
+            rate_budget=self.runner.rate_budget(),
+            concurrency_limits=self.runner.concurrency_limits(),
+            token_usage=token_usage,
+            stage_latency={stage: round(sec, 3) for stage, sec in stage_latency.items()},
+            stage_models={
+                "react": self.model,
+                "judge": str(getattr(self.judge_llm, "model_name", None) or "default"),
+            },
+            engine=self.name,
+            llm_calls=len(replies),
+            ab_group=ab_group,
+        ))
+        print(f"⏱️  Execution time: {execution_time:.2f}s")
+
+        return ExecutionResult(
+            goal=user_goal,
+            completed=succeeded,
+            outputs={
+                "plan": plan,
+                "judge": judge.model_dump(),
+                "tool_results": {name: call["ok"] for name, call in calls.items()},
+                "execution_time": execution_time,
+            },
+            errors=errors,
+            final_answer=answer,
+        )
+
+
+# ============================================================================
+# ROUTING + A/B
+# ============================================================================
+
+class EngineRouter:
+    """Pick an engine per goal type; shadow a sampled fraction of goals on the other engine"""
+
+    def __init__(
+        self,
+        engines: Dict[str, Engine],
+        default: str = "crewai",
+        routes: Optional[Dict[str, str]] = None,
+        ab_fraction: float = 0.0,
+        seed: Optional[int] = None,
+        max_shadows: int = AB_MAX_SHADOWS,
+    ):
+        routes = routes or {}
+        for engine in (default, *routes.values()):
+            if engine not in engines:
+                raise ValueError(f"Engine '{engine}' is not configured (have {', '.join(engines)})")
+        self.engines = engines
+        self.default = default
+        self.routes = routes
+        self.ab_fraction = ab_fraction
+        self.max_shadows = max_shadows
+        self._random = random.Random(seed)
+        self._shadows: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(
+        cls,
+        tools: List[Any],
+        metrics: MetricsTracker,
+        runner: ToolRunner,
+        agents: Optional[AgentSet] = None,
+        react_llm: Optional[Any] = None,
+    ) -> "EngineRouter":
+        """Router configured by ORCHESTRAI_ENGINE / _ENGINE_ROUTES / _AB_FRACTION"""
+        default = DEFAULT_ENGINE.lower()
+        routes = parse_routes(os.getenv("ORCHESTRAI_ENGINE_ROUTES", ""))
+        engines: Dict[str, Engine] = {"crewai": CrewEngine(tools, agents, metrics, runner)}
+        # The ReAct agent is only built when something can reach it
+        if react_llm is not None or AB_FRACTION > 0 or "react" in (default, *routes.values()):
+            engines["react"] = ReactEngine(
+                tools, metrics, runner, judge_llm=agents.judge if agents else None, llm=react_llm
+            )
+        return cls(engines, default, routes, AB_FRACTION)
+
+    def pick(self, user_goal: str) -> Engine:
+        return self.engines[self.routes.get(infer_goal_type(user_goal), self.default)]
+
+    def _shadow_for(self, user_goal: str, primary: Engine) -> Optional[Engine]:
+        if self.ab_fraction <= 0 or len(self.engines) < 2:
+            return None
+        # Side effects must not run twice, and a cassette records/replays one engine's calls
+        if WRITE_GOAL.search(user_goal) or current_cassette() is not None:
+            return None
+        if self._random.random() >= self.ab_fraction:
+            return None
+        if len(self._shadows) >= self.max_shadows:
+            print(f"🔀 A/B: {len(self._shadows)} shadow run(s) in flight, not sampling this goal")
+            return None
+        return next(e for name, e in self.engines.items() if name != primary.name)
+
+    async def run(
+        self,
+        user_goal: str,
+        context: str = "",
+        on_event: Optional[events.EventSink] = None,
+    ) -> ExecutionResult:
+        """Run the goal on its routed engine; result.outputs["engine"] names it"""
+        engine = self.pick(user_goal)
+        shadow = self._shadow_for(user_goal, engine)
+        ab_group = uuid.uuid4().hex[:12] if shadow else ""
+
+        with events.event_sink(on_event) if on_event is not None else nullcontext():
+            result = await engine.run(user_goal, context, ab_group)
+        result.outputs["engine"] = engine.name
+
+        if shadow is not None:
+            # After the primary run, so the two don't compete and the caller doesn't wait
+            print(f"🔀 A/B: shadowing on {shadow.name} (group {ab_group})")
+            task = asyncio.create_task(self._shadow(shadow, user_goal, context, ab_group))
+            self._shadows.add(task)
+            task.add_done_callback(self._shadows.discard)
+        return result
+
+    async def _shadow(self, engine: Engine, user_goal: str, context: str, ab_group: str) -> None:
+        try:
+            # Keep shadow progress out of the caller's stream; a shadow must never write
+            with events.event_sink(None), read_only_tools():
+                await engine.run(user_goal, context, ab_group)
+        except Exception as e:
+            print(f"⚠️  A/B shadow run on {engine.name} failed: {e}")
+
+    def stream(self, user_goal: str, context: str = "") -> AsyncIterator[events.RunEvent]:
+        """Like workflow.stream_orchestration, through the router"""
+        return events.stream(lambda sink: self.run(user_goal, context, on_event=sink))
+
+    @property
+    def shadows_pending(self) -> int:
+        return len(self._shadows)
+
+    async def drain(self) -> None:
+        """Wait for background A/B shadow runs (before exit)"""
+        if self._shadows:
+            await asyncio.gather(*list(self._shadows), return_exceptions=True)
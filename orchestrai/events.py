@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, Optional
+
+# Event types emitted during a run, in the order a client normally sees them
+PLAN_READY = "plan_ready"
+TOOL_STARTED = "tool_started"
+TOOL_FINISHED = "tool_finished"
+TOKEN = "token"
+ANSWER = "answer"
+DONE = "done"
+ERROR = "error"
+
+
+@dataclass
+class RunEvent:
+    """Single progress event from run_orchestration"""
+    type: str
+    data: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+
+EventSink = Callable[[RunEvent], None]
+
+# The sink travels with the run's context, so emit() works from tool coroutines
+# and from LLM pool threads (run_blocking copies the context).
+_sink: contextvars.ContextVar[Optional[EventSink]] = contextvars.ContextVar("orchestrai_event_sink", default=None)
+
+
+def emit(event_type: str, **data: Any) -> None:
+    """Send an event to the current run's sink (no-op when nobody listens)"""
+    sink = _sink.get()
+    if sink is not None:
+        sink(RunEvent(event_type, data))
+
+
+def streaming_enabled() -> bool:
+    return _sink.get() is not None
+
+
+@contextmanager
+def event_sink(sink: Optional[EventSink]) -> Iterator[None]:
+    """Route emit() calls made inside this block (and its threads) to sink"""
+    token = _sink.set(sink)
+    try:
+        yield
+    finally:
+        _sink.reset(token)
+
+
+def queue_sink(queue: asyncio.Queue) -> EventSink:
+    """Thread-safe sink that feeds an asyncio.Queue owned by the current loop"""
+    loop = asyncio.get_running_loop()
+
+    def sink(event: RunEvent) -> None:
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            queue.put_nowait(event)
+        else:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    return sink
+
+
+async def stream(run: Callable[[EventSink], Awaitable[Any]]) -> AsyncIterator[RunEvent]:
+    """
+    Call run(sink) in a task and yield its events as they happen.
+    The last event is DONE (data["result"] is run's return value) or ERROR.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    sink = queue_sink(queue)
+
+    async def _run() -> None:
+        try:
+            result = await run(sink)
+            sink(RunEvent(DONE, {"result": result}))
+        except Exception as e:
+            sink(RunEvent(ERROR, {"error": str(e)}))
+
+    task = asyncio.create_task(_run())
+    try:
+        while True:
+            event = await queue.get()
+            yield event
+            if event.type in (DONE, ERROR):
+                break
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+# ============================================================================
+# CREWAI TOKEN STREAMING
+# ============================================================================
+
+_token_handler_installed = False
+
+# Raw chunk consumer for the current LLM call (e.g. the streaming plan parser);
+# when set, chunks go there instead of becoming TOKEN events
+_chunk_listener: contextvars.ContextVar[Optional[Callable[[str], None]]] = contextvars.ContextVar(
+    "orchestrai_chunk_listener", default=None
+)
+
+
+@contextmanager
+def chunk_listener(listener: Callable[[str], None]) -> Iterator[None]:
+    """Send LLM stream chunks produced inside this block (and its threads) to listener"""
+    token = _chunk_listener.set(listener)
+    try:
+        yield
+    finally:
+        _chunk_listener.reset(token)
+
+
+def install_token_handler() -> bool:
+    """
+    Forward CrewAI LLM stream chunks as TOKEN events.
+    CrewAI calls stream-chunk handlers synchronously in the LLM thread, so the
+    run's context (and therefore its sink) is visible to the handler.
+    """
+    global _token_handler_installed
+    if _token_handler_installed:
+        return True
+    try:
+        from crewai.events import crewai_event_bus
+        from crewai.events.types.llm_events import LLMStreamChunkEvent
+    except ImportError:
+        return False
+
+    @crewai_event_bus.on(LLMStreamChunkEvent)
+    def _forward_chunk(source, event):
+        if not event.chunk:
+            return
+        listener = _chunk_listener.get()
+        if listener is not None:
+            listener(event.chunk)
+        else:
+            emit(TOKEN, text=event.chunk)
+
+    _token_handler_installed = True
+    return True
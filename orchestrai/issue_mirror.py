@@ -0,0 +1,345 @@
+"""
+Local SQLite mirror of GitHub issues.
+
+list_issues reads are served from data/issues.db. A repo is synced through
+the GitHub MCP `list_issues` tool (so timeouts, breakers and cassettes still
+apply), and only for deltas: each sync asks for issues updated since the
+newest `updated_at` already mirrored, and at most once per TTL, stopping at
+the first short page. Until a repo's backfill has paged through to an empty
+page it is marked incomplete: reads are answered by the direct tool call while
+one background task per repo runs the backfill, storing pages as they arrive
+so a failed backfill resumes where it stopped. Writes go to GitHub as before
+and mark the repo stale so the next read picks them up.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from orchestrai.blocking import run_blocking
+
+DEFAULT_FIELDS = ("number", "title", "state", "labels", "user", "updated_at", "html_url")
+ALL_FIELDS = DEFAULT_FIELDS + ("body", "created_at", "comments", "is_pull_request")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS issues (
+    repo TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    title TEXT,
+    state TEXT,
+    body TEXT,
+    labels TEXT,
+    user TEXT,
+    html_url TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    comments INTEGER,
+    is_pull_request INTEGER,
+    PRIMARY KEY (repo, number)
+);
+CREATE INDEX IF NOT EXISTS issues_repo_updated ON issues (repo, updated_at);
+CREATE TABLE IF NOT EXISTS sync_state (
+    repo TEXT PRIMARY KEY,
+    last_updated_at TEXT,
+    synced_at REAL,
+    complete INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class MirrorUnavailable(RuntimeError):
+    """The repo cannot be served from the mirror (no data and sync failed or unparseable)"""
+
+
+def parse_issues(result: Any) -> List[Dict[str, Any]]:
+    """Issue dicts from a list_issues tool response (JSON list or {"issues": [...]})"""
+    try:
+        data = json.loads(result) if isinstance(result, str) else result
+    except ValueError:
+        raise MirrorUnavailable("list_issues response is not JSON")
+    if isinstance(data, dict):
+        data = data.get("issues")
+    if not isinstance(data, list) or not all(isinstance(i, dict) and "number" in i for i in data):
+        raise MirrorUnavailable("list_issues response is not an issue list")
+    return data
+
+
+def _row(repo: str, issue: Dict[str, Any]) -> tuple:
+    labels = [l.get("name") if isinstance(l, dict) else str(l) for l in issue.get("labels") or []]
+    user = issue.get("user")
+    return (
+        repo,
+        int(issue["number"]),
+        issue.get("title"),
+        issue.get("state"),
+        issue.get("body"),
+        json.dumps(labels),
+        user.get("login") if isinstance(user, dict) else user,
+        issue.get("html_url") or issue.get("url"),
+        issue.get("created_at"),
+        issue.get("updated_at"),
+        issue.get("comments") if isinstance(issue.get("comments"), int) else None,
+        int(bool(issue.get("pull_request"))),
+    )
+
+
+class IssueMirror:
+    """SQLite issue index with incremental, TTL-bounded sync per repo"""
+
+    def __init__(
+        self,
+        path: str = "data/issues.db",
+        ttl: float = 60.0,
+        page_size: int = 100,
+        max_pages: int = 50,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.page_size = page_size
+        self.max_pages = max_pages  # per sync; the backfill task runs syncs until complete
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._db_lock = threading.Lock()
+        self._repo_locks: Dict[str, asyncio.Lock] = {}
+        self._backfills: Dict[str, asyncio.Task] = {}
+        with self._db_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(sync_state)")}
+            if "complete" not in columns:
+                # Mirrors from before backfill tracking may have stopped early: re-check them
+                self._conn.execute("ALTER TABLE sync_state ADD COLUMN complete INTEGER NOT NULL DEFAULT 0")
+
+    @staticmethod
+    def repo_key(owner: str, repo: str) -> str:
+        return f"{owner}/{repo}".lower()
+
+    # ------------------------------------------------------------------
+    # Storage (blocking; called through run_blocking)
+    # ------------------------------------------------------------------
+
+    def _state(self, key: str) -> Optional[sqlite3.Row]:
+        with self._db_lock:
+            return self._conn.execute("SELECT * FROM sync_state WHERE repo = ?", (key,)).fetchone()
+
+    def _upsert(self, key: str, issues: List[Dict[str, Any]]) -> None:
+        """Store one page and advance the resume point; the repo stays incomplete until _finish"""
+        rows = [_row(key, issue) for issue in issues]
+        newest = max((r[9] for r in rows if r[9]), default=None)
+        with self._db_lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.execute(
+                "INSERT INTO sync_state (repo, last_updated_at, synced_at, complete) VALUES (?, ?, 0, 0) "
+                "ON CONFLICT(repo) DO UPDATE SET complete = 0, "
+                "last_updated_at = COALESCE(MAX(excluded.last_updated_at, sync_state.last_updated_at), "
+                "sync_state.last_updated_at)",
+                (key, newest),
+            )
+
+    def _finish(self, key: str) -> None:
+        """An empty page was reached: the mirror holds every issue up to now"""
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (repo, last_updated_at, synced_at, complete) VALUES (?, NULL, ?, 1) "
+                "ON CONFLICT(repo) DO UPDATE SET synced_at = excluded.synced_at, complete = 1",
+                (key, time.time()),
+            )
+
+    def query(
+        self,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        labels: Optional[Sequence[str]] = None,
+        text: Optional[str] = None,
+        limit: int = 100,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+    ) -> List[Dict[str, Any]]:
+        """Filtered, projected issues, newest first (same order as the API default)"""
+        unknown = set(fields) - set(ALL_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown issue fields: {sorted(unknown)}")
+
+        sql = "SELECT * FROM issues WHERE repo = ?"
+        params: List[Any] = [self.repo_key(owner, repo)]
+        if state in ("open", "closed"):
+            sql += " AND state = ?"
+            params.append(state)
+        if text:
+            sql += " AND (title LIKE ? OR body LIKE ?)"
+            params += [f"%{text}%", f"%{text}%"]
+        sql += " ORDER BY number DESC"
+
+        wanted = {l.lower() for l in labels or []}
+        out = []
+        with self._db_lock:
+            cursor = self._conn.execute(sql, params)
+            for row in cursor:
+                row_labels = json.loads(row["labels"] or "[]")
+                if wanted and not wanted.issubset(l.lower() for l in row_labels):
+                    continue
+                issue = {f: row[f] for f in fields}
+                if "labels" in issue:
+                    issue["labels"] = row_labels
+                if "is_pull_request" in issue:
+                    issue["is_pull_request"] = bool(issue["is_pull_request"])
+                out.append(issue)
+                if len(out) >= limit:
+                    break
+        return out
+
+    def invalidate(self, owner: str, repo: str) -> None:
+        """Force a delta sync on the next read (after a write)"""
+        with self._db_lock, self._conn:
+            self._conn.execute(
+                "UPDATE sync_state SET synced_at = 0 WHERE repo = ?", (self.repo_key(owner, repo),)
+            )
+
+    # ------------------------------------------------------------------
+    # Sync + reads
+    # ------------------------------------------------------------------
+
+    def complete(self, owner: str, repo: str) -> bool:
+        """True once a sync of this repo has paged through to an empty page"""
+        state = self._state(self.repo_key(owner, repo))
+        return state is not None and bool(state["complete"])
+
+    async def sync(self, runner: Any, owner: str, repo: str) -> int:
+        """
+        Fetch issues updated since the last sync (if older than ttl), at most
+        max_pages pages; returns the count fetched. A backfill ends at an empty
+        page, a delta of a complete repo at the first short page.
+        """
+        key = self.repo_key(owner, repo)
+        lock = self._repo_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            state = await run_blocking(self._state, key)
+            if state is not None and state["complete"] and time.time() - state["synced_at"] < self.ttl:
+                return 0
+
+            since = state["last_updated_at"] if state is not None else None
+            delta = state is not None and bool(state["complete"])
+            fetched = 0
+            for page in range(1, self.max_pages + 1):
+                args = {
+                    "owner": owner,
+                    "repo": repo,
+                    "state": "all",
+                    "sort": "updated",
+                    "direction": "asc",
+                    "per_page": self.page_size,
+                    "page": page,
+                }
+                if since:
+                    args["since"] = since
+                batch = parse_issues(await runner.call("list_issues", args))
+                if not batch:
+                    await run_blocking(self._finish, key)
+                    break
+                # Stored per page so a failed or budget-capped sync resumes from here
+                await run_blocking(self._upsert, key, batch)
+                fetched += len(batch)
+                if delta and len(batch) < self.page_size:
+                    await run_blocking(self._finish, key)
+                    break
+            else:
+                print(f"⏳ Issue mirror {key}: incomplete after {self.max_pages} page(s), continuing")
+
+            print(f"🗂️  Issue mirror {key}: {fetched} issue(s) {'updated' if since else 'indexed'}")
+            return fetched
+
+    async def list_issues(
+        self,
+        runner: Any,
+        owner: str,
+        repo: str,
+        state: str = "all",
+        per_page: int = 100,
+        labels: Optional[Sequence[str]] = None,
+        text: Optional[str] = None,
+        fields: Sequence[str] = DEFAULT_FIELDS,
+    ) -> str:
+        """
+        list_issues-compatible JSON served from the mirror (delta-synced first if stale).
+        Until the repo is fully mirrored this starts its background backfill and
+        raises MirrorUnavailable at once, so the caller makes the direct call.
+        """
+        key = self.repo_key(owner, repo)
+        if not await run_blocking(self.complete, owner, repo):
+            self.start_backfill(runner, owner, repo)
+            raise MirrorUnavailable(f"Issue mirror of {key} is still backfilling")
+        try:
+            await self.sync(runner, owner, repo)
+        except Exception as e:
+            print(f"⚠️  Issue mirror sync failed for {key}, serving cached issues: {e}")
+        if not await run_blocking(self.complete, owner, repo):
+            # The delta was longer than max_pages: finish it in the background
+            self.start_backfill(runner, owner, repo)
+            raise MirrorUnavailable(f"Issue mirror of {key} is catching up")
+
+        issues = await run_blocking(self.query, owner, repo, state, labels, text, per_page, fields)
+        return json.dumps(issues, ensure_ascii=False)
+
+    def start_backfill(self, runner: Any, owner: str, repo: str) -> asyncio.Task:
+        """Background sync of this repo until it is complete; at most one task per repo"""
+        key = self.repo_key(owner, repo)
+        task = self._backfills.get(key)
+        if task is None or task.done():
+            # Fresh context: the backfill outlives the request and must not report into its event stream
+            task = asyncio.get_running_loop().create_task(
+                self._backfill(runner, owner, repo), context=contextvars.Context()
+            )
+            self._backfills[key] = task
+        return task
+
+    async def _backfill(self, runner: Any, owner: str, repo: str) -> None:
+        key = self.repo_key(owner, repo)
+        try:
+            # Each sync is capped at max_pages; stop if one makes no progress (server ignoring paging)
+            while True:
+                before = await run_blocking(self._state, key)
+                if before is not None and before["complete"]:
+                    break
+                await self.sync(runner, owner, repo)
+                after = await run_blocking(self._state, key)
+                if not after["complete"] and before is not None and after["last_updated_at"] == before["last_updated_at"]:
+                    print(f"⚠️  Issue mirror backfill of {key} made no progress, stopping")
+                    break
+        except Exception as e:
+            print(f"⚠️  Issue mirror backfill of {key} failed, resuming on the next read: {e}")
+
+    async def drain(self) -> None:
+        """Wait for background backfills (before exit, or before the CLI blocks on input)"""
+        tasks = [t for t in self._backfills.values() if not t.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_default: Optional[IssueMirror] = None
+
+
+def default_mirror() -> Optional[IssueMirror]:
+    """Process-wide mirror at ORCHESTRAI_ISSUE_MIRROR (default data/issues.db); None if 'off'"""
+    global _default
+    path = os.getenv("ORCHESTRAI_ISSUE_MIRROR", "data/issues.db")
+    if path.lower() in ("", "off", "false", "0"):
+        return None
+    if _default is None or str(_default.path) != str(Path(path)):
+        _default = IssueMirror(path, ttl=float(os.getenv("ORCHESTRAI_ISSUE_MIRROR_TTL", "60")))
+    return _default
+
+
+async def drain() -> None:
+    """Wait for the default mirror's background backfills, if any"""
+    if _default is not None:
+        await _default.drain()
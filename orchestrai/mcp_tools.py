@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import os
 import sys
 import json
@@ -10,7 +11,8 @@ from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
 from dotenv import load_dotenv
-from langchain_mcp_adapters.client import MultiServerMCPClient
+
+from .cassette import current_cassette
 
 load_dotenv()
 
@@ -65,6 +67,11 @@ def ensure_weather_server() -> None:
     )
 
 async def load_mcp_tools() -> Tuple[List[Any], Dict[str, Any]]:
+    # Replaying a cassette: serve the recorded catalog, start no servers
+    cassette = current_cassette()
+    if cassette is not None and cassette.replaying:
+        return cassette.replay_tools(), {}
+
     ensure_weather_server()
     
     connections: Dict[str, Any] = {
@@ -101,9 +108,18 @@ async def load_mcp_tools() -> Tuple[List[Any], Dict[str, Any]]:
             if replaced_env:
                 connections[name]["env"] = replaced_env
 
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+
     client = MultiServerMCPClient(connections)
     try:
-        tools = await client.get_tools()
+        # Load per server so each tool knows which MCP server backs it
+        names = list(connections)
+        per_server = await asyncio.gather(*(client.get_tools(server_name=n) for n in names))
+        tools = []
+        for name, server_tools in zip(names, per_server):
+            for tool in server_tools:
+                tool.metadata = {**(tool.metadata or {}), "mcp_server": name}
+                tools.append(tool)
         
     except Exception as e:
         raise RuntimeError(
@@ -116,6 +132,8 @@ async def load_mcp_tools() -> Tuple[List[Any], Dict[str, Any]]:
             f"Original error:\n{e}"
         )
 
+    if cassette is not None:
+        cassette.record_catalog(tools)
     return tools, connections
 
 def filter_tools(tools: List[Any], allow: List[str]) -> List[Any]:
@@ -127,4 +145,10 @@ def filter_tools(tools: List[Any], allow: List[str]) -> List[Any]:
     return allowed
 
 def get_tool_names(tools):
-    return sorted({tool.name for tool in tools})
\ No newline at end of file
+    return sorted({tool.name for tool in tools})
+
+
+def tool_server(tool: Any) -> str:
+    """Name of the MCP server a tool was loaded from"""
+    metadata = getattr(tool, "metadata", None) or {}
+    return metadata.get("mcp_server", "unknown")
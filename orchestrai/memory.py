@@ -0,0 +1,210 @@
+"""
+Bounded conversation memory for the interactive clients.
+
+Recent turns are kept verbatim in a sliding window capped at a token budget;
+turns that fall out of the window are folded into a running summary by a
+small model in a background task. Reads never wait for the summarizer, so the
+context sent with each turn (summary + window, plus any evicted turns not yet
+folded) stays bounded and per-turn latency stays flat however long the
+session runs. Without a summarizer, or if it fails, evicted turns are simply
+dropped.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Deque, Dict, List, Optional
+
+DEFAULT_BUDGET = int(os.getenv("ORCHESTRAI_MEMORY_TOKENS", "2000"))
+DEFAULT_SUMMARY_TOKENS = int(os.getenv("ORCHESTRAI_MEMORY_SUMMARY_TOKENS", "400"))
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); good enough for budgeting"""
+    return (len(text) + 3) // 4
+
+
+def clip(text: str, tokens: int) -> str:
+    limit = tokens * 4
+    return text if len(text) <= limit else text[: limit - 15].rstrip() + " ...[truncated]"
+
+
+@dataclass
+class Turn:
+    user: str
+    assistant: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.user) + estimate_tokens(self.assistant)
+
+    def render(self) -> str:
+        return f"User: {self.user}\nAssistant: {self.assistant}"
+
+
+# (previous summary, turns to fold in) -> new summary
+Summarizer = Callable[[str, List[Turn]], Awaitable[str]]
+
+
+def summary_prompt(summary: str, turns: List[Turn], max_tokens: int) -> str:
+    parts = [
+        "Update the running summary of a conversation between a user and a tool-using assistant.\n"
+        f"Keep it under {max_tokens * 3 // 4} words. Keep names, repos, issue numbers, cities, "
+        "URLs and decisions the user may refer back to; drop pleasantries and raw tool output.\n\n",
+        f"Current summary:\n{summary or '(empty)'}\n\n",
+        "New turns:\n",
+    ]
+    parts.extend(f"{turn.render()}\n\n" for turn in turns)
+    parts.append("Return only the updated summary.")
+    return "".join(parts)
+
+
+def llm_summarizer(model: Optional[str] = None, max_tokens: int = DEFAULT_SUMMARY_TOKENS) -> Summarizer:
+    """Summarizer backed by a small chat model (ORCHESTRAI_MEMORY_MODEL, default gpt-4o-mini)"""
+    from langchain_openai import ChatOpenAI
+
+    llm = ChatOpenAI(
+        model=model or os.getenv("ORCHESTRAI_MEMORY_MODEL", "gpt-4o-mini"),
+        temperature=0,
+        max_tokens=max_tokens,
+    )
+
+    async def summarize(summary: str, turns: List[Turn]) -> str:
+        reply = await llm.ainvoke(summary_prompt(summary, turns, max_tokens))
+        return str(reply.content).strip()
+
+    return summarize
+
+
+class ConversationMemory:
+    """Token-budgeted sliding window of turns plus an incrementally updated summary"""
+
+    def __init__(
+        self,
+        summarizer: Optional[Summarizer] = None,
+        budget_tokens: int = DEFAULT_BUDGET,
+        summary_tokens: int = DEFAULT_SUMMARY_TOKENS,
+    ):
+        self.summarizer = summarizer
+        self.budget_tokens = budget_tokens
+        self.summary_tokens = summary_tokens
+        self.summary = ""
+        self.window: Deque[Turn] = deque()
+        self.pending: Deque[Turn] = deque()  # evicted, not yet folded into the summary
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "ConversationMemory":
+        """Memory with the LLM summarizer unless ORCHESTRAI_MEMORY_MODEL is 'off'"""
+        model = os.getenv("ORCHESTRAI_MEMORY_MODEL", "gpt-4o-mini")
+        summarizer = None
+        if model.lower() not in ("", "off", "false", "0"):
+            try:
+                summarizer = llm_summarizer(model)
+            except Exception as e:
+                print(f"⚠️  Memory summarizer unavailable, old turns will be dropped: {e}")
+        return cls(summarizer)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_turn(self, user: str, assistant: str) -> None:
+        """Record a turn; evicts the oldest turns past the budget and folds them in the background"""
+        if self.budget_tokens <= 0:
+            return
+        # A single huge answer (e.g. a raw issue list) must not flush the whole window
+        per_message = max(self.budget_tokens // 4, 1)
+        self.window.append(Turn(clip(user, per_message), clip(assistant, per_message)))
+
+        used = sum(turn.tokens for turn in self.window)
+        while len(self.window) > 1 and used > self.budget_tokens:
+            turn = self.window.popleft()
+            used -= turn.tokens
+            self.pending.append(turn)
+
+        # If summarizing falls behind, older unsummarized turns are dropped (bounded context)
+        backlog = sum(turn.tokens for turn in self.pending)
+        while self.pending and backlog > self.budget_tokens:
+            backlog -= self.pending.popleft().tokens
+            self.dropped += 1
+
+        if self.pending:
+            self._schedule()
+
+    def _schedule(self) -> None:
+        if self._task is not None and not self._task.done():
+            return  # the running fold picks up new pending turns when it finishes
+        if self.summarizer is None:
+            self.dropped += len(self.pending)
+            self.pending.clear()
+            return
+        try:
+            self._task = asyncio.get_running_loop().create_task(self._fold())
+        except RuntimeError:
+            pass  # no event loop: turns stay pending until the next add_turn from async code
+
+    async def _fold(self) -> None:
+        while self.pending:
+            turns = list(self.pending)
+            try:
+                summary = await self.summarizer(self.summary, turns)
+            except Exception as e:
+                print(f"⚠️  Memory summarization failed, dropping {len(turns)} old turn(s): {e}")
+                summary = None
+            # Turns may have been dropped while we were waiting; remove only those we folded
+            for turn in turns:
+                if self.pending and self.pending[0] is turn:
+                    self.pending.popleft()
+            if summary is None:
+                self.dropped += len(turns)
+            else:
+                self.summary = clip(summary, self.summary_tokens)
+
+    async def drain(self) -> None:
+        """Wait for any background summarization (tests, shutdown)"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    def clear(self) -> None:
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+        self._task = None
+        self.summary = ""
+        self.window.clear()
+        self.pending.clear()
+        self.dropped = 0
+
+    # ------------------------------------------------------------------
+    # Reads (never wait for the summarizer)
+    # ------------------------------------------------------------------
+
+    def _turns(self) -> List[Turn]:
+        return list(self.pending) + list(self.window)
+
+    def messages(self) -> List[Dict[str, str]]:
+        """Chat messages for LangGraph: summary as a system message, then recent turns"""
+        out = []
+        if self.summary:
+            out.append({"role": "system", "content": f"Summary of the earlier conversation:\n{self.summary}"})
+        for turn in self._turns():
+            out.append({"role": "user", "content": turn.user})
+            out.append({"role": "assistant", "content": turn.assistant})
+        return out
+
+    def render(self) -> str:
+        """Plain-text context for prompt templates ('' when there is no history)"""
+        parts = []
+        if self.summary:
+            parts.append(f"Summary of the earlier conversation:\n{self.summary}")
+        parts.extend(turn.render() for turn in self._turns())
+        return "\n\n".join(parts)
+
+    def tokens(self) -> int:
+        return estimate_tokens(self.summary) + sum(turn.tokens for turn in self._turns())
+
+    def __len__(self) -> int:
+        return len(self.window) + len(self.pending)
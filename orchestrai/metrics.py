@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Dict, Any, List
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from statistics import mean
 
+from orchestrai import metrics_store
+
 
 @dataclass
 class MetricEntry:
@@ -20,6 +21,25 @@ class MetricEntry:
     completed: bool
     errors: List[str]
     tools_used: List[str]
+    # Per tool call: {"server": str, "seconds": float, "ok": bool}
+    tool_calls: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    open_breakers: List[str] = field(default_factory=list)  # MCP servers failing fast
+    # Per LLM stage (planner/executor/judge): prompt_tokens, cached_prompt_tokens, completion_tokens
+    token_usage: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    prefetch_hits: List[str] = field(default_factory=list)  # speculative tool calls the plan used
+    prefetch_wasted: List[str] = field(default_factory=list)  # ... and ones it discarded
+    plan_repairs: List[str] = field(default_factory=list)  # fixes applied to planner output
+    plan_repair_seconds: float = 0.0
+    stage_latency: Dict[str, float] = field(default_factory=dict)  # seconds per stage
+    stage_models: Dict[str, str] = field(default_factory=dict)  # model used per LLM stage
+    planner_escalated: bool = False  # fast planner's plan was redone on the larger model
+    executor_skipped: bool = False  # answer rendered from a template, no executor LLM call
+    rate_budget: Dict[str, float] = field(default_factory=dict)  # calls left per server at run end
+    concurrency_limits: Dict[str, int] = field(default_factory=dict)  # adaptive in-flight limit per server
+    planner_tools: int = 0  # tools offered to the planner after retrieval (see orchestrai.tool_index)
+    engine: str = "crewai"  # "crewai" pipeline or "react" (see orchestrai.engines)
+    llm_calls: int = 0  # engine LLM calls, judge excluded
+    ab_group: str = ""  # shared by the two runs of an A/B pair
 
 
 class MetricsTracker:
@@ -28,24 +48,20 @@ class MetricsTracker:
     def __init__(self, storage_path: str = "data/metrics.jsonl"):
         self.storage_path = Path(storage_path)
         self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self.writer = metrics_store.writer_for(self.storage_path)
     
     def log(self, entry: MetricEntry) -> None:
-        """Append metric entry to storage"""
-        with open(self.storage_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(asdict(entry)) + "\n")
+        """Queue metric entry for the background writer (see metrics_store)"""
+        self.writer.write(entry)
+    
+    def load_records(self) -> List[Dict[str, Any]]:
+        """All stored runs as plain dicts, oldest first (cheaper than MetricEntry for analytics)"""
+        self.writer.flush()
+        return metrics_store.read_records(self.storage_path)
     
     def load_all(self) -> List[MetricEntry]:
-        """Load all metrics from storage"""
-        if not self.storage_path.exists():
-            return []
-        
-        entries = []
-        with open(self.storage_path, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    data = json.loads(line)
-                    entries.append(MetricEntry(**data))
-        return entries
+        """Load all metrics from storage, across shards and compacted segments"""
+        return [MetricEntry(**data) for data in self.load_records()]
     
     def get_stats(self, last_n: int = None) -> Dict[str, Any]:
         """Calculate statistics from metrics"""
@@ -60,6 +76,7 @@ class MetricsTracker:
         plan_scores = [e.plan_score for e in entries]
         reasoning_scores = [e.reasoning_score for e in entries]
         exec_times = [e.execution_time_seconds for e in entries]
+        planner_tools = [e.planner_tools for e in entries if e.planner_tools]
         
         return {
             "total_runs": len(entries),
@@ -69,6 +86,21 @@ class MetricsTracker:
             "avg_reasoning_score": mean(reasoning_scores),
             "avg_execution_time": mean(exec_times),
             "goal_type_breakdown": self._goal_type_breakdown(entries),
+            "open_breaker_runs": self._open_breaker_breakdown(entries),
+            "prompt_cache": self._prompt_cache_breakdown(entries),
+            "plan_repairs": self._plan_repair_stats(entries),
+            "stage_latency": self._stage_latency(entries),
+            "rate_budget": self._rate_budget(entries),
+            "concurrency_limits": self._concurrency_limits(entries),
+            "engines": self._engine_breakdown(entries),
+            "ab_pairs": self._ab_pairs(entries),
+            "avg_planner_tools": mean(planner_tools) if planner_tools else 0.0,
+            "escalation_rate": sum(e.planner_escalated for e in entries) / len(entries) * 100,
+            "executor_skip_rate": sum(e.executor_skipped for e in entries) / len(entries) * 100,
+            "prefetch": {
+                "hits": sum(len(e.prefetch_hits) for e in entries),
+                "wasted": sum(len(e.prefetch_wasted) for e in entries),
+            },
             "recent_trend": self._calculate_trend(entries, window=5),
         }
     
@@ -79,6 +111,104 @@ class MetricsTracker:
             breakdown[e.goal_type] = breakdown.get(e.goal_type, 0) + 1
         return breakdown
     
+    def _open_breaker_breakdown(self, entries: List[MetricEntry]) -> Dict[str, int]:
+        """Count runs that finished with each server's circuit breaker open"""
+        breakdown = {}
+        for e in entries:
+            for server in e.open_breakers:
+                breakdown[server] = breakdown.get(server, 0) + 1
+        return breakdown
+    
+    def _stage_latency(self, entries: List[MetricEntry]) -> Dict[str, float]:
+        """Average seconds per pipeline stage"""
+        per_stage: Dict[str, List[float]] = {}
+        for e in entries:
+            for stage, seconds in e.stage_latency.items():
+                per_stage.setdefault(stage, []).append(seconds)
+        return {stage: mean(values) for stage, values in per_stage.items()}
+    
+    def _rate_budget(self, entries: List[MetricEntry]) -> Dict[str, Dict[str, float]]:
+        """Per server: rate budget left after the latest run, and the lowest seen"""
+        budget: Dict[str, Dict[str, float]] = {}
+        for e in entries:
+            for server, left in e.rate_budget.items():
+                b = budget.setdefault(server, {"last": left, "min": left})
+                b["last"] = left
+                b["min"] = min(b["min"], left)
+        return budget
+    
+    def _concurrency_limits(self, entries: List[MetricEntry]) -> Dict[str, Dict[str, int]]:
+        """Per server: adaptive concurrency limit after the latest run, and its range"""
+        limits: Dict[str, Dict[str, int]] = {}
+        for e in entries:
+            for server, limit in e.concurrency_limits.items():
+                l = limits.setdefault(server, {"last": limit, "min": limit, "max": limit})
+                l["last"] = limit
+                l["min"] = min(l["min"], limit)
+                l["max"] = max(l["max"], limit)
+        return limits
+    
+    def _engine_breakdown(self, entries: List[MetricEntry]) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Per goal type and engine: runs, avg seconds, avg engine LLM calls, avg judge score"""
+        groups: Dict[tuple, List[MetricEntry]] = {}
+        for e in entries:
+            groups.setdefault((e.goal_type, e.engine), []).append(e)
+        breakdown: Dict[str, Dict[str, Dict[str, float]]] = {}
+        for (goal_type, engine), runs in sorted(groups.items()):
+            breakdown.setdefault(goal_type, {})[engine] = {
+                "runs": len(runs),
+                "seconds": mean(e.execution_time_seconds for e in runs),
+                "llm_calls": mean(e.llm_calls for e in runs),
+                "success_score": mean(e.success_score for e in runs),
+            }
+        return breakdown
+    
+    def _ab_pairs(self, entries: List[MetricEntry]) -> Dict[str, Dict[str, Any]]:
+        """Per goal type: A/B pairs (same goal on both engines) and how often each engine was faster / scored higher"""
+        pairs: Dict[str, Dict[str, MetricEntry]] = {}
+        for e in entries:
+            if e.ab_group:
+                pairs.setdefault(e.ab_group, {})[e.engine] = e
+        out: Dict[str, Dict[str, Any]] = {}
+        for runs in pairs.values():
+            if len(runs) != 2:
+                continue  # shadow still running or failed
+            (a, ea), (b, eb) = sorted(runs.items())
+            stats = out.setdefault(ea.goal_type, {"pairs": 0, "faster": {a: 0, b: 0}, "better": {a: 0, b: 0}})
+            stats["pairs"] += 1
+            faster = a if ea.execution_time_seconds <= eb.execution_time_seconds else b
+            stats["faster"][faster] += 1
+            if ea.success_score != eb.success_score:
+                stats["better"][a if ea.success_score > eb.success_score else b] += 1
+        return out
+    
+    def _plan_repair_stats(self, entries: List[MetricEntry]) -> Dict[str, Any]:
+        """How often plans needed repair, which fixes, and what repair cost"""
+        repaired = [e for e in entries if e.plan_repairs]
+        fixes: Dict[str, int] = {}
+        for e in repaired:
+            for fix in e.plan_repairs:
+                kind = fix.split(":")[0]
+                fixes[kind] = fixes.get(kind, 0) + 1
+        return {
+            "repaired_runs": len(repaired),
+            "reprompts": fixes.get("reprompt", 0),
+            "fixes": fixes,
+            "avg_repair_seconds": mean(e.plan_repair_seconds for e in repaired) if repaired else 0.0,
+        }
+    
+    def _prompt_cache_breakdown(self, entries: List[MetricEntry]) -> Dict[str, Dict[str, float]]:
+        """Per stage: prompt tokens, cached prompt tokens and the cached ratio"""
+        totals: Dict[str, Dict[str, float]] = {}
+        for e in entries:
+            for stage, usage in e.token_usage.items():
+                t = totals.setdefault(stage, {"prompt_tokens": 0, "cached_prompt_tokens": 0})
+                t["prompt_tokens"] += usage.get("prompt_tokens", 0)
+                t["cached_prompt_tokens"] += usage.get("cached_prompt_tokens", 0)
+        for t in totals.values():
+            t["cached_ratio"] = t["cached_prompt_tokens"] / t["prompt_tokens"] if t["prompt_tokens"] else 0.0
+        return totals
+    
     def _calculate_trend(self, entries: List[MetricEntry], window: int = 5) -> str:
         """Calculate if performance is improving/declining"""
         if len(entries) < window * 2:
@@ -119,6 +249,51 @@ class MetricsTracker:
         print("\nGoal Type Breakdown:")
         for goal_type, count in stats['goal_type_breakdown'].items():
             print(f"  - {goal_type}: {count}")
+        if stats['open_breaker_runs']:
+            print("\nRuns With Open Circuit Breakers:")
+            for server, count in stats['open_breaker_runs'].items():
+                print(f"  - {server}: {count}")
+        if stats['stage_latency']:
+            print("\nAvg Stage Latency:")
+            for stage, seconds in stats['stage_latency'].items():
+                print(f"  - {stage}: {seconds:.2f}s")
+            print(f"Planner Escalation:  {stats['escalation_rate']:.1f}% of runs")
+            print(f"Executor Skipped:    {stats['executor_skip_rate']:.1f}% of runs (template answers)")
+            if stats['avg_planner_tools']:
+                print(f"Planner Catalog:     {stats['avg_planner_tools']:.1f} tools on average")
+        if stats['rate_budget']:
+            print("\nRate Budget (calls left):")
+            for server, b in stats['rate_budget'].items():
+                print(f"  - {server}: {b['last']:g} now, {b['min']:g} lowest")
+        if stats['concurrency_limits']:
+            print("\nConcurrency Limits (in-flight calls):")
+            for server, l in stats['concurrency_limits'].items():
+                print(f"  - {server}: {l['last']} now (range {l['min']}-{l['max']})")
+        if len({engine for by_engine in stats['engines'].values() for engine in by_engine}) > 1:
+            print("\nEngines (runs, avg time, LLM calls, score):")
+            for goal_type, by_engine in stats['engines'].items():
+                for engine, s in by_engine.items():
+                    print(f"  - {goal_type}/{engine}: {s['runs']} runs, {s['seconds']:.2f}s, "
+                          f"{s['llm_calls']:.1f} calls, {s['success_score']:.2f}/5")
+        if stats['ab_pairs']:
+            print("\nA/B Pairs (faster / higher score):")
+            for goal_type, p in stats['ab_pairs'].items():
+                faster = ", ".join(f"{engine} {n}" for engine, n in p['faster'].items())
+                better = ", ".join(f"{engine} {n}" for engine, n in p['better'].items())
+                print(f"  - {goal_type}: {p['pairs']} pairs | faster: {faster} | higher score: {better}")
+        repairs = stats['plan_repairs']
+        if repairs['repaired_runs']:
+            print(f"\nPlan Repairs:        {repairs['repaired_runs']} runs, "
+                  f"{repairs['reprompts']} re-prompts, avg {repairs['avg_repair_seconds']:.2f}s")
+            for kind, count in repairs['fixes'].items():
+                print(f"  - {kind}: {count}")
+        prefetch = stats['prefetch']
+        if prefetch['hits'] or prefetch['wasted']:
+            print(f"\nSpeculative Prefetch: {prefetch['hits']} used, {prefetch['wasted']} discarded")
+        if stats['prompt_cache']:
+            print("\nPrompt Cache Hits:")
+            for stage, t in stats['prompt_cache'].items():
+                print(f"  - {stage}: {t['cached_ratio'] * 100:.1f}% of {int(t['prompt_tokens']):,} prompt tokens cached")
         print("="*60 + "\n")
 
 
@@ -0,0 +1,484 @@
+"""
+Metrics storage: per-process shards, a buffered background writer, and
+compaction into time-ordered segments.
+
+MetricsTracker.log() only appends the entry to an in-memory buffer. A daemon
+thread frames buffered entries (checksum + JSON per line) and appends each
+batch with a single O_APPEND write to this process's own shard,
+data/metrics.shards/<host>-<pid>.jsonl, so concurrent CLI, batch and service
+processes never interleave writes, and a torn tail after a crash is detected
+and skipped rather than misread.
+
+A shard is sealed (renamed with a timestamp) when it exceeds `max_bytes`, was
+last written on an earlier day, or its process exits. Compaction, run from the
+writer thread under a lock file, merges sealed shards (and shards left by dead
+processes) into the newest gzipped, time-ordered segment,
+data/metrics-<timestamp>.jsonl.gz, and starts a new segment only once that one
+reaches `max_bytes` or the day changes. History is deleted only by age
+(ORCHESTRAI_METRICS_RETENTION_DAYS) or total size
+(ORCHESTRAI_METRICS_MAX_TOTAL_BYTES), both off by default. A legacy unsharded
+metrics.jsonl is imported once into data/metrics.legacy.jsonl.gz, which is
+never pruned.
+
+read_records() merges the legacy import, compacted segments and shards into
+one time-ordered list.
+"""
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+import zlib
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+BUFFERED = os.getenv("ORCHESTRAI_METRICS_BUFFERED", "true").lower() in ("1", "true", "yes")
+FLUSH_SECONDS = float(os.getenv("ORCHESTRAI_METRICS_FLUSH_SECONDS", "1.0"))
+BATCH_SIZE = int(os.getenv("ORCHESTRAI_METRICS_BATCH", "64"))
+FSYNC = os.getenv("ORCHESTRAI_METRICS_FSYNC", "false").lower() in ("1", "true", "yes")
+ROTATE_BYTES = int(os.getenv("ORCHESTRAI_METRICS_ROTATE_BYTES", str(10 * 1024 * 1024)))
+ROTATE_DAILY = os.getenv("ORCHESTRAI_METRICS_ROTATE_DAILY", "true").lower() in ("1", "true", "yes")
+RETENTION_DAYS = float(os.getenv("ORCHESTRAI_METRICS_RETENTION_DAYS", "0"))  # 0 = keep forever
+MAX_TOTAL_BYTES = int(os.getenv("ORCHESTRAI_METRICS_MAX_TOTAL_BYTES", "0"))  # 0 = no size cap
+COMPACT_SECONDS = float(os.getenv("ORCHESTRAI_METRICS_COMPACT_SECONDS", "300"))
+
+# Active shards on other hosts untouched this long are assumed abandoned
+STALE_SHARD_SECONDS = 2 * 24 * 3600
+# A compaction lock older than this is assumed left by a crashed compactor
+STALE_LOCK_SECONDS = 600
+
+_HOST = re.sub(r"[^A-Za-z0-9_]+", "_", socket.gethostname()) or "host"
+
+
+# ============================================================================
+# FILES
+# ============================================================================
+
+_STAMP = re.compile(r"(\d{8}-\d{12})(?:\.(\d+))?\.")
+_SHARD = re.compile(r"^(?P<host>[^.]+)-(?P<pid>\d+)(?:\.(?P<stamp>\d{8}-\d{12}(?:\.\d+)?))?\.jsonl$")
+
+
+def _stamp_order(segment: Path) -> tuple:
+    match = _STAMP.search(segment.name)
+    return (match.group(1), int(match.group(2) or 0)) if match else ("", 0)
+
+
+def _stamp(when: datetime) -> str:
+    return when.strftime("%Y%m%d-%H%M%S%f")
+
+
+def _unique(directory: Path, base: str, tail: str) -> Path:
+    """directory/<base><tail>, or <base>.1<tail>, <base>.2<tail> ... if taken"""
+    candidate, n = directory / f"{base}{tail}", 1
+    while candidate.exists():
+        candidate = directory / f"{base}.{n}{tail}"
+        n += 1
+    return candidate
+
+
+def shard_dir(path: Path) -> Path:
+    return path.parent / f"{path.stem}.shards"
+
+
+def compacted_segments(path: Path) -> List[Path]:
+    """Compacted segments of `path`, oldest first (the legacy import is not one of them)"""
+    return sorted(path.parent.glob(f"{path.stem}-*{path.suffix}.gz"), key=_stamp_order)
+
+
+def legacy_segment(path: Path) -> Path:
+    """Where a pre-shard metrics.jsonl is imported by compaction"""
+    return path.parent / f"{path.stem}.legacy{path.suffix}.gz"
+
+
+def shards(path: Path) -> List[Path]:
+    """Active and sealed shard files"""
+    directory = shard_dir(path)
+    if not directory.exists():
+        return []
+    return sorted(p for p in directory.iterdir() if _SHARD.match(p.name))
+
+
+def segments(path: Path) -> List[Path]:
+    """Everything read_records() merges: legacy import and log, compacted segments, shards"""
+    legacy = [p for p in (legacy_segment(path), path) if p.exists()]
+    return legacy + compacted_segments(path) + shards(path)
+
+
+# ============================================================================
+# FRAMING
+# ============================================================================
+
+def frame(record: Any) -> str:
+    """One record per line, prefixed with the CRC32 of its JSON"""
+    payload = json.dumps(asdict(record) if is_dataclass(record) else record)
+    return f"{zlib.crc32(payload.encode('utf-8')):08x} {payload}\n"
+
+
+def parse_line(line: str) -> Optional[Dict[str, Any]]:
+    """Record from a framed or plain JSON line; None for a torn or corrupt line"""
+    if not line.endswith("\n"):
+        return None  # unterminated tail: a write in progress or cut off by a crash
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        payload = line  # unframed (compacted segments and pre-shard logs)
+    else:
+        checksum, _, payload = line.partition(" ")
+        if f"{zlib.crc32(payload.encode('utf-8')):08x}" != checksum:
+            return None
+    try:
+        return json.loads(payload)
+    except ValueError:
+        return None
+
+
+def _read_file(path: Path) -> List[Dict[str, Any]]:
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [r for r in map(parse_line, f) if r is not None]
+
+
+def read_records(path: Path, attempts: int = 5) -> List[Dict[str, Any]]:
+    """Every record across all segments and shards, ordered by timestamp"""
+    records: List[Dict[str, Any]] = []
+    for _ in range(attempts):
+        listed = segments(path)
+        records = []
+        try:
+            for segment in listed:
+                records.extend(_read_file(segment))
+        except FileNotFoundError:
+            continue
+        if segments(path) == listed:
+            break  # no seal or compaction raced the read: the view is consistent
+    records.sort(key=lambda r: r.get("timestamp", ""))
+    return records
+
+
+# ============================================================================
+# COMPACTION
+# ============================================================================
+
+def _owner_gone(host: str, pid: int, modified: float, stale_after: float = STALE_SHARD_SECONDS) -> bool:
+    """Whether the process that owns a shard or lock has exited (by age when we can't tell)"""
+    if host != _HOST or os.name != "posix":
+        return time.time() - modified > stale_after
+    if pid == os.getpid():
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def _lock(path: Path) -> bool:
+    """Cross-process lock file holding "<host> <pid>"; taken over if its holder is gone"""
+    try:
+        fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        try:
+            host, _, pid = path.read_text().partition(" ")
+            if not _owner_gone(host, int(pid or 0), path.stat().st_mtime, STALE_LOCK_SECONDS):
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except ValueError:
+            return False  # holder is still writing its pid
+        return _lock(path)
+    os.write(fd, f"{_HOST} {os.getpid()}".encode())
+    os.close(fd)
+    return True
+
+
+def _write_segment(target: Path, records: List[Dict[str, Any]], tmp_dir: Path) -> None:
+    """Atomically (re)write a gzipped segment"""
+    tmp = tmp_dir / f".{target.name}"
+    with gzip.open(tmp, "wt", encoding="utf-8") as f:
+        f.writelines(json.dumps(r) + "\n" for r in records)
+    os.replace(tmp, target)
+
+
+def _import_legacy(path: Path, directory: Path) -> None:
+    """Move a pre-shard metrics.jsonl into the (never pruned) legacy segment"""
+    if not path.exists():
+        return
+    target = legacy_segment(path)
+    records = (_read_file(target) if target.exists() else []) + _read_file(path)
+    records.sort(key=lambda r: r.get("timestamp", ""))
+    _write_segment(target, records, directory)
+    path.unlink(missing_ok=True)
+
+
+def prune(
+    path: Path,
+    retention_days: float = RETENTION_DAYS,
+    max_total_bytes: int = MAX_TOTAL_BYTES,
+) -> List[Path]:
+    """Delete compacted segments older than retention_days or beyond max_total_bytes (oldest first)"""
+    old = compacted_segments(path)[:-1]  # never the newest segment
+    removed = []
+    if retention_days > 0:
+        cutoff = time.time() - retention_days * 86400
+        for segment in list(old):
+            if segment.stat().st_mtime < cutoff:
+                segment.unlink(missing_ok=True)
+                removed.append(segment)
+                old.remove(segment)
+    if max_total_bytes > 0:
+        total = sum(p.stat().st_size for p in compacted_segments(path))
+        for segment in old:
+            if total <= max_total_bytes:
+                break
+            total -= segment.stat().st_size
+            segment.unlink(missing_ok=True)
+            removed.append(segment)
+    return removed
+
+
+def compact(
+    path: Path,
+    max_bytes: int = ROTATE_BYTES,
+    daily: bool = ROTATE_DAILY,
+    retention_days: float = RETENTION_DAYS,
+    max_total_bytes: int = MAX_TOTAL_BYTES,
+) -> int:
+    """
+    Merge sealed and abandoned shards into the newest segment (a new one once
+    it is `max_bytes` compressed or, with `daily`, from an earlier day); returns
+    records merged.
+    """
+    path = Path(path)
+    directory = shard_dir(path)
+    if not directory.exists():
+        return 0
+    lock = directory / ".compact.lock"
+    if not _lock(lock):
+        return 0  # another process is compacting
+    try:
+        _import_legacy(path, directory)
+        inputs = []
+        for shard in shards(path):
+            match = _SHARD.match(shard.name)
+            try:
+                modified = shard.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if match["stamp"] or _owner_gone(match["host"], int(match["pid"]), modified):
+                inputs.append(shard)
+        if not inputs:
+            return 0
+
+        records = [r for p in inputs for r in _read_file(p)]
+        merged = len(records)
+        existing = compacted_segments(path)
+        newest = existing[-1] if existing else None
+        if newest is not None:
+            stamp = _stamp_order(newest)[0]
+            started = datetime.strptime(stamp[:8], "%Y%m%d").date() if stamp else None
+            if newest.stat().st_size < max_bytes and not (daily and started != date.today()):
+                records = _read_file(newest) + records
+            else:
+                newest = None
+        target = newest or _unique(path.parent, f"{path.stem}-{_stamp(datetime.now())}", f"{path.suffix}.gz")
+        records.sort(key=lambda r: r.get("timestamp", ""))
+        _write_segment(target, records, directory)
+        for p in inputs:
+            p.unlink(missing_ok=True)
+
+        prune(path, retention_days, max_total_bytes)
+        return merged
+    finally:
+        lock.unlink(missing_ok=True)
+
+
+# ============================================================================
+# WRITER
+# ============================================================================
+
+class MetricsWriter:
+    """Buffers records and appends them to this process's shard from a daemon thread"""
+
+    def __init__(
+        self,
+        path: Path,
+        buffered: bool = BUFFERED,
+        flush_interval: float = FLUSH_SECONDS,
+        batch_size: int = BATCH_SIZE,
+        fsync: bool = FSYNC,
+        max_bytes: int = ROTATE_BYTES,
+        daily: bool = ROTATE_DAILY,
+        compact_interval: float = COMPACT_SECONDS,
+    ):
+        self.path = Path(path)
+        self.buffered = buffered
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.daily = daily
+        self.compact_interval = compact_interval
+        self._pending: List[Any] = []
+        self._lock = threading.Lock()  # guards _pending
+        self._io_lock = threading.Lock()  # serialises appends, sealing and compaction
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._fd: Optional[int] = None
+        self._pid = os.getpid()
+
+    @property
+    def shard(self) -> Path:
+        return shard_dir(self.path) / f"{_HOST}-{os.getpid()}{self.path.suffix}"
+
+    def write(self, record: Any) -> None:
+        """Queue a record (a dataclass or dict); serialisation happens off the hot path"""
+        with self._lock:
+            self._pending.append(record)
+            pending = len(self._pending)
+        if not self.buffered:
+            self.flush()
+            return
+        if self._thread is None or self._pid != os.getpid():
+            self._start()
+        if pending >= self.batch_size:
+            self._wake.set()
+
+    def flush(self) -> None:
+        """Write everything buffered so far (called by readers and at exit)"""
+        with self._io_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            self._maybe_seal()
+            self._append("".join(frame(record) for record in batch).encode("utf-8"))
+
+    def close(self) -> None:
+        """Flush and seal this process's shard so compaction can pick it up"""
+        self.flush()
+        with self._io_lock:
+            self._seal()
+
+    def _append(self, data: bytes) -> None:
+        fd = self._open()
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        if self.fsync:
+            os.fsync(fd)
+
+    def _open(self) -> int:
+        if self._fd is not None and self._pid == os.getpid():
+            if os.fstat(self._fd).st_nlink > 0:
+                return self._fd
+            os.close(self._fd)  # compacted away as abandoned: start a new shard file
+        self._pid = os.getpid()  # after fork the child gets its own shard
+        self.shard.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(self.shard, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def _maybe_seal(self) -> None:
+        try:
+            stat = self.shard.stat()
+        except FileNotFoundError:
+            return
+        stale = self.daily and datetime.fromtimestamp(stat.st_mtime).date() != date.today()
+        if stat.st_size >= self.max_bytes or stale:
+            self._seal()
+
+    def _seal(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        shard = self.shard
+        try:
+            modified = datetime.fromtimestamp(shard.stat().st_mtime)
+        except FileNotFoundError:
+            return
+        os.replace(shard, _unique(shard.parent, f"{shard.stem}.{_stamp(modified)}", shard.suffix))
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self._thread.start()
+        _flush_in_worker()
+
+    def _after_fork(self) -> None:
+        # The child must not rewrite the parent's buffer, share its fd or inherit held locks
+        self._pending = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._fd = None
+
+    def _run(self) -> None:
+        next_compaction = time.monotonic()
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+                if time.monotonic() >= next_compaction:
+                    next_compaction = time.monotonic() + self.compact_interval
+                    with self._io_lock:
+                        compact(self.path, self.max_bytes, self.daily)
+            except Exception as e:
+                print(f"⚠️  Metrics flush failed: {e}")
+
+
+_writers: Dict[Path, MetricsWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def writer_for(path: Path) -> MetricsWriter:
+    """One writer per file per process, so trackers sharing a path share a buffer"""
+    key = Path(path).resolve()
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = MetricsWriter(key)
+        return _writers[key]
+
+
+@atexit.register
+def _close_all() -> None:
+    for writer in list(_writers.values()):
+        try:
+            writer.close()
+        except Exception as e:
+            print(f"⚠️  Metrics flush failed: {e}")
+
+
+def _flush_in_worker() -> None:
+    # Forked multiprocessing workers leave through os._exit, which skips atexit
+    mp = sys.modules.get("multiprocessing")
+    if mp is not None and mp.parent_process() is not None:
+        from multiprocessing.util import Finalize
+        Finalize(None, _close_all, exitpriority=0)
+
+
+def _reset_after_fork() -> None:
+    global _writers_lock
+    _writers_lock = threading.Lock()
+    for writer in _writers.values():
+        writer._after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,218 @@
+"""
+Cheap repairs for planner output that fails validation.
+
+parse_plan() applies deterministic fixes first (strip prose and code fences,
+coerce loosely-shaped fields, fuzzy-match tool names against the catalog).
+Only if the plan is still invalid does the caller spend an LLM call, using
+repair_prompt(), which carries just the validation error and the bad output.
+"""
+from __future__ import annotations
+
+import difflib
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from orchestrai.schemas import TaskPlan
+
+
+class PlanInvalid(ValueError):
+    """Planner output that deterministic repair could not turn into a valid TaskPlan"""
+
+
+@dataclass
+class RepairLog:
+    """Repairs applied while producing one plan, and the latency they cost"""
+    fixes: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    escalated: bool = False  # re-planned on the larger planner model
+    model: str = ""  # planner model that produced the final plan
+
+
+# ============================================================================
+# DETERMINISTIC FIXES
+# ============================================================================
+
+def extract_json(text: str) -> Optional[str]:
+    """First balanced {...} object in text, ignoring prose and code fences around it"""
+    start = text.find("{")
+    while start != -1:
+        depth, in_string, escape = 0, False, False
+        for i in range(start, len(text)):
+            ch = text[i]
+            if in_string:
+                if escape:
+                    escape = False
+                elif ch == "\\":
+                    escape = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch == "{":
+                depth += 1
+            elif ch == "}":
+                depth -= 1
+                if depth == 0:
+                    candidate = text[start:i + 1]
+                    if '"steps"' in candidate:
+                        return candidate
+                    break
+        start = text.find("{", start + 1)
+    return None
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [value]
+
+
+def coerce_plan(data: Dict[str, Any], user_goal: str) -> List[str]:
+    """Fix common shape mistakes in place; returns the names of the fixes applied"""
+    fixes = []
+    if not data.get("goal"):
+        data["goal"] = user_goal
+        fixes.append("coerce:goal")
+
+    for key in ("assumptions", "risks"):
+        if key in data and not isinstance(data[key], list):
+            data[key] = [str(v) for v in _as_list(data[key])]
+            fixes.append(f"coerce:{key}")
+
+    steps = data.get("steps")
+    if isinstance(steps, dict):
+        steps = [steps]
+        fixes.append("coerce:steps")
+    if not isinstance(steps, list):
+        return fixes
+
+    coerced = []
+    for i, step in enumerate(steps):
+        if isinstance(step, str):
+            step = {"action": step}
+            fixes.append("coerce:step")
+        if not isinstance(step, dict):
+            coerced.append(step)
+            continue
+        if "tools" not in step and "tool" in step:
+            step["tools"] = step.pop("tool")
+            fixes.append("coerce:tool_key")
+        if not isinstance(step.get("tools", []), list):
+            step["tools"] = _as_list(step["tools"])
+            fixes.append("coerce:tools")
+        try:
+            step["step_id"] = int(step["step_id"])
+        except (KeyError, TypeError, ValueError):
+            step["step_id"] = i + 1
+            fixes.append("coerce:step_id")
+        if not step.get("action"):
+            step["action"] = f"Step {i + 1}"
+            fixes.append("coerce:action")
+        if not step.get("success_criteria"):
+            step["success_criteria"] = f"{step['action']} completed"
+            fixes.append("coerce:success_criteria")
+        coerced.append(step)
+    data["steps"] = coerced
+    return fixes
+
+
+# Leading verbs of MCP tool names; a repaired name must keep its verb
+VERBS = frozenset({
+    "add", "close", "create", "delete", "edit", "fork", "get", "list", "merge",
+    "push", "remove", "search", "update",
+})
+
+# Tools a fuzzy match may land on: reads only, so a guess can never write
+READ_ONLY_PREFIXES = ("get_", "list_", "search_", "tavily_search", "tavily_extract")
+
+
+def match_tool(name: str, catalog: Tuple[str, ...]) -> Optional[str]:
+    """
+    Closest catalog tool for a misspelled or paraphrased tool name, if unambiguous.
+    Case/separator differences map onto any tool; anything fuzzier only onto a
+    read-only tool with the same leading verb, so an unknown write (e.g.
+    delete_issue) is re-prompted instead of becoming a different action.
+    """
+    norm = re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
+    if norm in catalog:
+        return norm
+    verb = norm.split("_")[0]
+    candidates = [
+        t for t in catalog
+        if t.startswith(READ_ONLY_PREFIXES) and (verb not in VERBS or t.startswith(verb + "_"))
+    ]
+    close = difflib.get_close_matches(norm, candidates, n=1, cutoff=0.75)
+    if close:
+        return close[0]
+    containing = [t for t in candidates if norm and (norm in t or t in norm)]
+    return containing[0] if len(containing) == 1 else None
+
+
+def parse_plan(raw: str, user_goal: str, catalog: Tuple[str, ...]) -> Tuple[TaskPlan, List[str]]:
+    """Validate planner output, applying deterministic fixes; raises PlanInvalid"""
+    text = raw.strip()
+    try:
+        return _check_tools(TaskPlan.model_validate_json(text), catalog, [])
+    except ValidationError:
+        pass
+
+    fixes = []
+    candidate = extract_json(text)
+    if candidate is None:
+        raise PlanInvalid("No JSON object with a \"steps\" field found in the output")
+    if candidate != text:
+        fixes.append("strip_prose")
+
+    try:
+        data = json.loads(candidate)
+    except json.JSONDecodeError as e:
+        raise PlanInvalid(f"Invalid JSON: {e}")
+    if not isinstance(data, dict):
+        raise PlanInvalid("Top-level JSON value must be an object")
+
+    fixes.extend(coerce_plan(data, user_goal))
+    try:
+        plan = TaskPlan.model_validate(data)
+    except ValidationError as e:
+        raise PlanInvalid(str(e))
+    return _check_tools(plan, catalog, fixes)
+
+
+def _check_tools(plan: TaskPlan, catalog: Tuple[str, ...], fixes: List[str]) -> Tuple[TaskPlan, List[str]]:
+    for step in plan.steps:
+        tools = []
+        for tool in step.tools:
+            if tool in catalog:
+                tools.append(tool)
+                continue
+            match = match_tool(tool, catalog)
+            if match is None:
+                raise PlanInvalid(
+                    f"Step {step.step_id} uses unknown tool '{tool}'. "
+                    f"Allowed tools: {', '.join(catalog)}"
+                )
+            fixes.append(f"tool:{tool}->{match}")
+            tools.append(match)
+        step.tools = tools
+    return plan, fixes
+
+
+# ============================================================================
+# TARGETED RE-PROMPT
+# ============================================================================
+
+def repair_prompt(error: str, raw: str, user_goal: str) -> str:
+    """Small follow-up prompt: only the error and the output to fix, not the full instructions"""
+    return (
+        "You are the Task Planner. Your previous plan failed validation.\n\n"
+        f"Validation error:\n{error}\n\n"
+        f"Previous output:\n{raw[:4000]}\n\n"
+        "Return ONLY the corrected JSON plan. No markdown, no prose.\n\n"
+        f"Goal: {user_goal}"
+    )
@@ -0,0 +1,99 @@
+"""
+Incremental parser for streamed planner output.
+
+The planner streams something like
+
+    Thought: ...
+    Final Answer: ```json
+    {"goal": "...", "steps": [{...}, {...}], ...}
+
+PlanStreamParser is fed chunks as they arrive and calls on_step with each
+PlanStep as soon as its object inside "steps" is closed, long before the
+whole plan (and the CrewAI round-trip) has finished. The full response is
+still validated as a TaskPlan afterwards; this only lets work start early.
+"""
+from __future__ import annotations
+
+from typing import Callable, List, Optional
+
+from pydantic import ValidationError
+
+from orchestrai.schemas import PlanStep
+
+
+class PlanStreamParser:
+    """Tracks JSON nesting over streamed text and emits completed plan steps"""
+
+    def __init__(self, on_step: Callable[[PlanStep], None]):
+        self.on_step = on_step
+        self.steps: List[PlanStep] = []
+        self._buf: List[str] = []
+        self._started = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._in_steps = False
+        self._saw_steps = False
+        self._step_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> None:
+        for ch in chunk:
+            self._consume(ch)
+
+    def _consume(self, ch: str) -> None:
+        if self._done:
+            return
+        if not self._started:
+            # Skip "Thought: ... Final Answer:" and code fences up to the plan object
+            if ch != "{":
+                return
+            self._started = True
+
+        pos = len(self._buf)
+        self._buf.append(ch)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                self._last_string = "".join(self._buf[self._string_start:pos])
+            return
+
+        if ch == '"':
+            self._in_string = True
+            self._string_start = pos + 1
+        elif ch == ":" and self._depth == 1:
+            self._key = self._last_string
+        elif ch in "{[":
+            if ch == "[" and self._depth == 1 and self._key == "steps":
+                self._in_steps = self._saw_steps = True
+            elif ch == "{" and self._depth == 2 and self._in_steps:
+                self._step_start = pos
+            self._depth += 1
+        elif ch in "}]":
+            self._depth -= 1
+            if ch == "}" and self._depth == 2 and self._step_start is not None:
+                self._emit("".join(self._buf[self._step_start:pos + 1]))
+                self._step_start = None
+            elif ch == "]" and self._depth == 1:
+                self._in_steps = False
+            elif self._depth == 0:
+                # A brace pair in the preamble is not the plan: keep scanning
+                self._done = self._saw_steps
+                self._started = self._done
+                self._key = None
+
+    def _emit(self, text: str) -> None:
+        try:
+            step = PlanStep.model_validate_json(text)
+        except ValidationError:
+            return  # the final TaskPlan validation reports it
+        self.steps.append(step)
+        self.on_step(step)
@@ -0,0 +1,197 @@
+"""
+Built-in sampling profiler.
+
+Samples every thread's Python stack at a fixed interval and tags each sample
+with the pipeline phase it belongs to (planner, tools, executor, ...). On an
+event loop thread the phase is that of the asyncio task running at sample
+time, so concurrent runs (service, batch) don't overwrite each other's phase;
+worker threads carry the phase of the work handed to them.
+Writes collapsed stacks ("phase;frame;frame count") that flamegraph.pl,
+speedscope or inferno read directly, and prints the top hotspots per phase.
+Samples are wall-clock; threads parked in select/locks/socket reads are
+dropped so the numbers reflect Python work, not network waits.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Pipeline phase per thread id (threads without an event loop), read by the sampler thread
+_thread_phase: Dict[int, str] = {}
+
+# Pipeline phase of the current asyncio task (inherited by tasks it creates)
+_task_phase: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("orchestrai_phase", default=None)
+
+# Event loop per thread that has marked a phase, to find the task running on it
+_thread_loop: Dict[int, asyncio.AbstractEventLoop] = {}
+
+# Leaf frames that mean "waiting", not "working"
+IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("thread.py", "_worker"),
+    ("queue.py", "get"),
+    ("socket.py", "readinto"),
+    ("ssl.py", "read"),
+    ("ssl.py", "recv_into"),
+}
+
+
+def mark_phase(name: Optional[str]) -> None:
+    """Tag the current asyncio task's (or, outside a loop, thread's) subsequent samples with a phase"""
+    ident = threading.get_ident()
+    try:
+        _thread_loop[ident] = asyncio.get_running_loop()
+    except RuntimeError:
+        if name is None:
+            _thread_phase.pop(ident, None)
+        else:
+            _thread_phase[ident] = name
+        return
+    _task_phase.set(name)
+
+
+def _phase_of(ident: int) -> str:
+    loop = _thread_loop.get(ident)
+    if loop is not None:
+        # Private, but the only way to see another thread's running task
+        task = getattr(asyncio.tasks, "_current_tasks", {}).get(loop)
+        if task is not None:
+            phase = task.get_context().get(_task_phase)
+            if phase is not None:
+                return phase
+    return _thread_phase.get(ident, "other")
+
+
+def in_phase(name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap fn so it runs tagged with `name` (for work handed to pool threads)"""
+
+    @wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        previous = _thread_phase.get(threading.get_ident())
+        mark_phase(name)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            mark_phase(previous)
+
+    return wrapper
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Background-thread stack sampler; use as a context manager around a run"""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128):
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_at = 0.0
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="orchestrai-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> "SamplingProfiler":
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.duration += time.perf_counter() - self._started_at
+        return self
+
+    def __enter__(self) -> "SamplingProfiler":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                leaf = frame.f_code
+                if (os.path.basename(leaf.co_filename), leaf.co_name) in IDLE_LEAVES:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < self.max_depth:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.reverse()
+                self.samples[(_phase_of(ident), tuple(stack))] += 1
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    def write_folded(self, path: str) -> Path:
+        """Write collapsed stacks (phase as the root frame) for flamegraph tools"""
+        out = Path(path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            for (phase, stack), count in self.samples.most_common():
+                frames = ";".join(s.replace(";", ":") for s in stack)
+                f.write(f"{phase};{frames} {count}\n")
+        return out
+
+    def phase_totals(self) -> Dict[str, int]:
+        totals: Counter = Counter()
+        for (phase, _), count in self.samples.items():
+            totals[phase] += count
+        return dict(totals.most_common())
+
+    def hotspots(self, top: int = 10) -> Dict[str, List[Tuple[str, int, int]]]:
+        """Per phase: (function, self samples, inclusive samples), by self samples"""
+        self_counts: Dict[str, Counter] = {}
+        incl_counts: Dict[str, Counter] = {}
+        for (phase, stack), count in self.samples.items():
+            if not stack:
+                continue
+            self_counts.setdefault(phase, Counter())[stack[-1]] += count
+            incl = incl_counts.setdefault(phase, Counter())
+            for label in set(stack):
+                incl[label] += count
+
+        return {
+            phase: [(label, n, incl_counts[phase][label]) for label, n in counts.most_common(top)]
+            for phase, counts in self_counts.items()
+        }
+
+    def print_summary(self, top: int = 10) -> None:
+        total = sum(self.samples.values())
+        print("\n" + "=" * 60)
+        print("🔥 PROFILE SUMMARY")
+        print("=" * 60)
+        print(f"Duration: {self.duration:.2f}s | Samples: {total} | Interval: {self.interval * 1000:.1f}ms")
+        if not total:
+            print("No busy samples collected.")
+            print("=" * 60 + "\n")
+            return
+
+        hotspots = self.hotspots(top)
+        for phase, count in self.phase_totals().items():
+            print(f"\n[{phase}] {count} samples ({count / total * 100:.1f}%), ~{count * self.interval:.2f}s")
+            for label, self_n, incl_n in hotspots.get(phase, []):
+                print(f"  {self_n / count * 100:5.1f}% self {incl_n / count * 100:5.1f}% incl  {label}")
+        print("=" * 60 + "\n")
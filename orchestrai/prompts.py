@@ -0,0 +1,131 @@
+"""
+Prompt templates for the planner and executor.
+
+Static sections (instructions, JSON schema, tool list) are rendered once per
+tool-catalog version and cached, so every run reuses the same prefix string:
+no per-run schema generation, and the bytes sent to the provider stay
+identical across runs (which is what provider-side prefix caching keys on).
+
+Layout is static-first: instructions, then the tool catalog, then per-request
+data (conversation, plan, tool results, goal) last, so the cacheable prefix is as long as
+possible.
+
+Trade-off: with tool retrieval on (orchestrai.tool_index, ORCHESTRAI_TOOL_TOP_K > 0)
+the planner catalog is chosen per goal, so only planner_instructions() (~1.9k
+characters, ~485 tokens) is identical across goals. That is below the 1024-token
+minimum providers need before they cache a prefix, so planner prompts are in
+practice not cached; retrieval keeps them short instead. TOP_K=0 restores the
+full, stable catalog (cacheable once instructions + catalog pass 1024 tokens).
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Tuple, Type
+
+from pydantic import BaseModel
+
+from orchestrai.mcp_tools import get_tool_names
+from orchestrai.schemas import TaskPlan
+
+
+@lru_cache(maxsize=None)
+def schema_text(model_cls: Type[BaseModel]) -> str:
+    """model_json_schema() rendered once per model class"""
+    return str(model_cls.model_json_schema())
+
+
+def catalog_key(tools: Iterable[Any]) -> Tuple[str, ...]:
+    """Hashable tool-catalog version: the sorted tool names"""
+    return tuple(get_tool_names(tools))
+
+
+# ============================================================================
+# PLANNER
+# ============================================================================
+
+@lru_cache(maxsize=1)
+def planner_instructions() -> str:
+    """Catalog-independent planner rules and schema: the outermost cached prefix"""
+    return (
+        "You are the Task Planner.\n\n"
+        "Create a task plan for the goal given at the end of this message.\n\n"
+        "CRITICAL RULES (VIOLATION = FAILURE):\n"
+        "1. Return ONLY valid JSON\n"
+        "2. JSON MUST match this schema exactly:\n"
+        f"{schema_text(TaskPlan)}\n\n"
+        "3. You may ONLY use tool names from the AVAILABLE TOOLS list below\n\n"
+        "TOOL SELECTION RULES:\n"
+        "- For web searches: Use 'tavily_search' (reliable, fast)\n"
+        "- For weather: Use 'get_weather'\n"
+        "- For GitHub: Use 'create_issue', 'list_issues', 'create_or_update_file'\n"
+        "- Prefer simple, single-step solutions\n\n"
+        "**MULTI-TOOL RULES:**\n"
+        "- Each step should have EXACTLY ONE tool\n"
+        "- If you need data from Tool A to use in Tool B, create TWO steps:\n"
+        "  Step 1: Use Tool A to gather data\n"
+        "  Step 2: Use Tool B with the data from Step 1\n"
+        "- NEVER combine tools that depend on each other in the same step\n"
+        "- Example: 'search then create issue' = 2 steps, NOT 1 step\n\n"
+        "DO NOT invent tools.\n"
+        "DO NOT use generic terms like 'browser', 'internet', or 'API'.\n"
+        "If no tool is needed for a step, omit the tools field.\n\n"
+    )
+
+
+@lru_cache(maxsize=32)
+def planner_prefix(catalog: Tuple[str, ...]) -> str:
+    """Static instructions, then the tool catalog (per goal when retrieval is on): everything except the goal"""
+    return f"{planner_instructions()}AVAILABLE TOOLS:\n{', '.join(catalog)}\n\n"
+
+
+def context_block(context: str) -> str:
+    """Earlier conversation (see orchestrai.memory), placed after the cached prefix"""
+    if not context:
+        return ""
+    return (
+        "Conversation so far (use it to resolve references like 'that repo' or 'it'; "
+        f"the goal below is the current request):\n{context}\n\n"
+    )
+
+
+def planner_prompt(catalog: Tuple[str, ...], user_goal: str, context: str = "") -> str:
+    return f"{planner_prefix(catalog)}{context_block(context)}Goal: {user_goal}"
+
+
+# ============================================================================
+# EXECUTOR
+# ============================================================================
+
+# Characters of each tool result shown to the executor (templates see the full result)
+TOOL_RESULT_CHARS = 2000
+
+
+def clip_result(result: Any) -> str:
+    text = str(result)
+    return text[:TOOL_RESULT_CHARS] if len(text) > TOOL_RESULT_CHARS else text
+
+
+# Static instructions come first; the plan, tool results and goal follow
+EXECUTOR_INSTRUCTIONS = (
+    "You are the Action Executor.\n\n"
+    "You MUST use the tool results given below to complete the user's goal.\n\n"
+    "**CRITICAL INSTRUCTIONS:**\n"
+    "1. Synthesize ALL tool results below into a coherent answer\n"
+    "2. If multiple steps were executed, combine the results logically\n"
+    "3. For example, if you searched for repos AND created an issue:\n"
+    "   - Extract repo names/URLs from search results\n"
+    "   - Format them into a summary\n"
+    "   - Confirm the issue was created with that summary\n"
+    "4. DO NOT just say 'task completed' - provide specific details\n"
+    "5. Show what data was found and what action was taken\n\n"
+)
+
+
+def executor_prompt(plan_json: str, tool_results: Dict[str, Any], user_goal: str, context: str = "") -> str:
+    parts = [EXECUTOR_INSTRUCTIONS, context_block(context), f"Task Plan:\n{plan_json}\n\n"]
+    if tool_results:
+        parts.append("**Tool Execution Results:**\n")
+        parts.extend(f"\n{name}:\n{clip_result(result)}\n" for name, result in tool_results.items())
+        parts.append("\n")
+    parts.append(f"Original user goal: {user_goal}")
+    return "".join(parts)
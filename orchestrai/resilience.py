@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class ToolTimeoutError(TimeoutError):
+    """A tool call exceeded its timeout budget"""
+
+
+class CircuitOpenError(RuntimeError):
+    """The MCP server's circuit breaker is open; the call was not attempted"""
+
+
+class RateLimitedError(RuntimeError):
+    """The server's rate budget would not free up before the call's queue deadline"""
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    Per-server breaker: opens after `failure_threshold` consecutive failures,
+    fails fast for `reset_timeout` seconds, then lets one probe call through
+    (half-open). A successful probe closes it again.
+    """
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    failures: int = 0
+    opened_at: Optional[float] = None
+    probing: bool = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half_open" and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probing = False
+
+
+@dataclass
+class TokenBucket:
+    """
+    Per-server request budget: up to `capacity` calls, refilled at `rate` per
+    second. Upstream hints (remaining calls, seconds until reset, retry-after)
+    can lower the budget or pause it until the upstream limit resets.
+    """
+    capacity: float
+    rate: float
+    tokens: float = -1.0  # negative = start full
+    updated: float = field(default_factory=time.monotonic)
+    paused_until: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.tokens < 0:
+            self.tokens = self.capacity
+
+    def _refill(self, now: float) -> None:
+        start = max(self.updated, self.paused_until)
+        if now > start:
+            self.tokens = min(self.capacity, self.tokens + (now - start) * self.rate)
+        self.updated = max(self.updated, now)
+
+    @property
+    def level(self) -> float:
+        """Calls currently available"""
+        self._refill(time.monotonic())
+        return self.tokens
+
+    def wait_time(self) -> float:
+        """Seconds until one call is available"""
+        now = time.monotonic()
+        self._refill(now)
+        pause = max(0.0, self.paused_until - now)
+        if self.tokens >= 1:
+            return pause
+        return pause + (1 - self.tokens) / self.rate
+
+    def try_take(self) -> bool:
+        now = time.monotonic()
+        self._refill(now)
+        if now < self.paused_until or self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def observe(self, remaining: Optional[int] = None, reset_in: Optional[float] = None) -> None:
+        """Apply upstream limit hints: never allow more than the server says is left"""
+        self._refill(time.monotonic())
+        if remaining is not None:
+            self.tokens = min(self.tokens, float(remaining))
+        if reset_in is not None and remaining is not None and remaining <= 0:
+            self.tokens = min(self.tokens, 0.0)
+            self.paused_until = max(self.paused_until, time.monotonic() + reset_in)
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit for one server. Each success without congestion
+    adds 1/limit (about +1 per round of calls); an error, timeout or latency
+    above `tolerance` x the recent minimum for the same tool cuts the limit by
+    `backoff`, at most once per round (calls started before the last cut don't
+    cut again). Baselines are per tool so a slow tool isn't judged against a
+    fast one on the same server.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        backoff: float = 0.7,
+        tolerance: float = 2.0,
+        window: int = 100,
+    ):
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.tolerance = tolerance
+        self.in_flight = 0
+        self.window = window
+        self._latencies: Dict[str, deque] = {}  # tool -> recent successful latencies
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    @property
+    def current(self) -> int:
+        return max(self.min_limit, int(self.limit))
+
+    async def acquire(self) -> float:
+        """Wait for a slot; returns the start time to pass to release()"""
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.current)
+            self.in_flight += 1
+        return time.monotonic()
+
+    async def release(self, started: float, ok: Optional[bool], tool: str = "") -> None:
+        """ok=None (cancelled) frees the slot without adjusting the limit"""
+        # Update state before awaiting the lock so a second cancellation can't leak the slot
+        self.in_flight -= 1
+        if ok is not None:
+            self._adjust(started, time.monotonic() - started, ok, tool)
+        async with self._cond:
+            self._cond.notify_all()
+
+    def _adjust(self, started: float, latency: float, ok: bool, tool: str = "") -> None:
+        latencies = self._latencies.setdefault(tool, deque(maxlen=self.window))
+        baseline = min(latencies) if latencies else latency
+        if ok:
+            latencies.append(latency)
+        congested = not ok or latency > self.tolerance * baseline
+        if not congested:
+            self.limit = min(float(self.max_limit), self.limit + 1 / self.limit)
+        elif started >= self._last_decrease:
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            self._last_decrease = time.monotonic()
+
+
+async def hedged(call: Callable[[], Awaitable[Any]], hedge_after: float) -> Any:
+    """
+    Start `call`; if it has not finished after `hedge_after` seconds, start a
+    second identical call and return whichever succeeds first. Only safe for
+    idempotent reads.
+    """
+    tasks = [asyncio.ensure_future(call())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=hedge_after)
+        if not done:
+            tasks.append(asyncio.ensure_future(call()))
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, List
+
+from orchestrai import issue_mirror
+from orchestrai.agents import AgentSet, build_agents
+from orchestrai.engines import EngineRouter
+from orchestrai.mcp_tools import load_mcp_tools
+from orchestrai.metrics import MetricsTracker
+from orchestrai.schemas import ExecutionResult
+from orchestrai.tool_index import index_for
+from orchestrai.tool_runner import ToolRunner
+
+
+@dataclass
+class OrchestrationRuntime:
+    """Warm MCP tools, agents, metrics and engines shared by every run in a process"""
+    tools: List[Any]
+    agents: AgentSet
+    metrics: MetricsTracker
+    runner: ToolRunner
+    router: EngineRouter
+
+    @classmethod
+    def from_tools(
+        cls,
+        tools: List[Any],
+        metrics: MetricsTracker = None,
+        agents: AgentSet = None,
+        react_llm: Any = None,
+    ) -> "OrchestrationRuntime":
+        agents = agents or build_agents(tools)
+        metrics = metrics or MetricsTracker()
+        runner = ToolRunner(tools)
+        index_for(tools)  # build the planner's tool retrieval index once, not on the first goal
+        return cls(
+            tools=tools,
+            agents=agents,
+            metrics=metrics,
+            runner=runner,
+            router=EngineRouter.from_env(tools, metrics, runner, agents, react_llm),
+        )
+
+    @classmethod
+    async def load(cls, metrics: MetricsTracker = None) -> "OrchestrationRuntime":
+        """Connect to all MCP servers once and build the shared agent set"""
+        tools, _ = await load_mcp_tools()
+        return cls.from_tools(tools, metrics)
+
+    async def run(self, user_goal: str) -> ExecutionResult:
+        """Run on the goal type's engine (see orchestrai.engines)"""
+        return await self.router.run(user_goal)
+
+    async def drain(self) -> None:
+        """Finish background A/B shadow runs and issue mirror backfills"""
+        await self.router.drain()
+        await issue_mirror.drain()
@@ -0,0 +1,240 @@
+"""
+Headless HTTP/JSON service mode.
+
+    python -m orchestrai.service --port 8080 --workers 8 --queue-size 64
+
+POST /run {"goal": "..."}  -> ExecutionResult JSON
+GET  /health               -> worker / queue gauges
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from dotenv import load_dotenv
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from orchestrai.profiling import SamplingProfiler
+from orchestrai.runtime import OrchestrationRuntime
+from orchestrai.schemas import ExecutionResult
+
+
+class ServiceBusy(RuntimeError):
+    """Raised when the request queue is full (mapped to HTTP 429)"""
+
+
+@dataclass
+class _Job:
+    goal: str
+    deadline: float
+    future: asyncio.Future = field(repr=False)
+
+
+class OrchestrationService:
+    """
+    Bounded worker pool in front of a shared OrchestrationRuntime.
+    Requests wait in a fixed-size queue; when it is full, submit() fails fast
+    with ServiceBusy instead of piling up unbounded work.
+    """
+
+    def __init__(
+        self,
+        runtime: OrchestrationRuntime,
+        workers: int = 4,
+        queue_size: int = 32,
+        request_timeout: float = 120.0,
+    ):
+        self.runtime = runtime
+        self.workers = workers
+        self.request_timeout = request_timeout
+        self.queue: asyncio.Queue[_Job] = asyncio.Queue(maxsize=queue_size)
+        self.in_flight = 0
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        for i in range(self.workers):
+            self._tasks.append(asyncio.create_task(self._worker(), name=f"orchestrai-worker-{i}"))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self.runtime.drain()
+
+    async def submit(self, goal: str, timeout: Optional[float] = None) -> ExecutionResult:
+        """Queue a goal and wait for its result (raises ServiceBusy / asyncio.TimeoutError)"""
+        timeout = timeout or self.request_timeout
+        job = _Job(
+            goal=goal,
+            deadline=time.monotonic() + timeout,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        try:
+            self.queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise ServiceBusy(f"Queue full ({self.queue.maxsize} pending requests)")
+
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            # Client went away: let the worker drop or abort the job
+            job.future.cancel()
+            raise
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self.queue.get()
+            try:
+                if job.future.done():
+                    continue  # Cancelled while queued
+
+                remaining = job.deadline - time.monotonic()
+                if remaining <= 0:
+                    job.future.set_exception(asyncio.TimeoutError("Request timed out while queued"))
+                    continue
+
+                self.in_flight += 1
+                run = asyncio.create_task(self.runtime.run(job.goal))
+                job.future.add_done_callback(lambda f, run=run: run.cancel() if f.cancelled() else None)
+                try:
+                    result = await asyncio.wait_for(run, timeout=remaining)
+                    if not job.future.done():
+                        job.future.set_result(result)
+                except asyncio.TimeoutError:
+                    if not job.future.done():
+                        job.future.set_exception(asyncio.TimeoutError("Request timed out"))
+                except asyncio.CancelledError:
+                    if run.cancelled() and not self._stopping():
+                        continue  # Only this job was cancelled; keep serving
+                    raise
+                except Exception as e:
+                    if not job.future.done():
+                        job.future.set_exception(e)
+                finally:
+                    self.in_flight -= 1
+            finally:
+                self.queue.task_done()
+
+    def _stopping(self) -> bool:
+        task = asyncio.current_task()
+        return task is not None and task.cancelling() > 0
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "in_flight": self.in_flight,
+            "queued": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "tools": len(self.runtime.tools),
+        }
+
+
+# ============================================================================
+# HTTP APP
+# ============================================================================
+
+def build_app(
+    workers: int = 4,
+    queue_size: int = 32,
+    request_timeout: float = 120.0,
+    runtime: Optional[OrchestrationRuntime] = None,
+    profile_path: Optional[str] = None,
+) -> Starlette:
+    """
+    Create the Starlette app; MCP tools and agents are loaded once at startup.
+    With profile_path, the whole server lifetime is sampled and the collapsed
+    stacks are written on shutdown.
+    """
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        profiler = SamplingProfiler().start() if profile_path else None
+        rt = runtime
+        if rt is None:
+            print("\n⏳ Loading MCP servers...")
+            rt = await OrchestrationRuntime.load()
+        service = OrchestrationService(rt, workers, queue_size, request_timeout)
+        await service.start()
+        app.state.service = service
+        print(f"✅ Service ready: {len(rt.tools)} tools, {workers} workers, queue {queue_size}")
+        try:
+            yield
+        finally:
+            await service.stop()
+            if profiler:
+                profiler.stop()
+                profiler.print_summary()
+                print(f"🔥 Flamegraph stacks: {profiler.write_folded(profile_path)}")
+
+    async def run(request: Request) -> JSONResponse:
+        service: OrchestrationService = request.app.state.service
+        try:
+            body = await request.json()
+        except Exception:
+            return JSONResponse({"error": "Request body must be JSON"}, status_code=400)
+
+        goal = (body.get("goal") or "").strip() if isinstance(body, dict) else ""
+        if not goal:
+            return JSONResponse({"error": "Missing 'goal'"}, status_code=400)
+
+        timeout = body.get("timeout")
+        if timeout is not None:
+            try:
+                timeout = None if isinstance(timeout, bool) else float(timeout)
+            except (TypeError, ValueError):
+                timeout = None
+            if timeout is None or not 0 < timeout < float("inf"):
+                return JSONResponse({"error": "'timeout' must be a positive number of seconds"}, status_code=400)
+
+        try:
+            result = await service.submit(goal, timeout)
+        except ServiceBusy as e:
+            return JSONResponse({"error": str(e)}, status_code=429, headers={"Retry-After": "1"})
+        except asyncio.TimeoutError as e:
+            return JSONResponse({"error": str(e) or "Request timed out"}, status_code=504)
+        except Exception as e:
+            return JSONResponse({"error": str(e)}, status_code=500)
+
+        return JSONResponse(result.model_dump(mode="json"))
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", **request.app.state.service.stats()})
+
+    return Starlette(
+        routes=[
+            Route("/run", run, methods=["POST"]),
+            Route("/health", health, methods=["GET"]),
+        ],
+        lifespan=lifespan,
+    )
+
+
+def main():
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="MCP Navigator HTTP service")
+    parser.add_argument("--host", default=os.getenv("ORCHESTRAI_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("ORCHESTRAI_PORT", "8080")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("ORCHESTRAI_WORKERS", "4")))
+    parser.add_argument("--queue-size", type=int, default=int(os.getenv("ORCHESTRAI_QUEUE_SIZE", "32")))
+    parser.add_argument("--timeout", type=float, default=float(os.getenv("ORCHESTRAI_REQUEST_TIMEOUT", "120")))
+    parser.add_argument("--profile", metavar="FOLDED", help="Profile until shutdown and write collapsed stacks here")
+    args = parser.parse_args()
+
+    import uvicorn
+
+    app = build_app(args.workers, args.queue_size, args.timeout, profile_path=args.profile)
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Lexical (BM25) retrieval over the MCP tool catalog.
+
+The planner used to see every tool from every server. ToolIndex is built once
+per catalog version (tool names + descriptions) and selects the top-k tools
+for a goal, so the planner prompt and the plan's tool allow-list stay roughly
+the same size however many MCP servers are connected. Catalogs no larger than
+k, and goals that match no tool, get the full catalog. Because the selection
+differs per goal, the planner prompt's cacheable prefix ends before the
+catalog (see orchestrai.prompts).
+"""
+from __future__ import annotations
+
+import math
+import os
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from orchestrai.prompts import catalog_key
+
+TOP_K = int(os.getenv("ORCHESTRAI_TOOL_TOP_K", "8"))
+# Always offered when present: the planner's fallback for goals no tool matches well
+PINNED = tuple(t for t in os.getenv("ORCHESTRAI_TOOL_PINNED", "tavily_search").split(",") if t)
+
+NAME_BOOST = 3  # a tool's name counts this many times in its document
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from get give how i in is it me my of on or please "
+    "show tell than that the then this to what whats with you your".split()
+)
+
+# Words users type vs words tool names/descriptions use
+_ALIASES = {
+    "repo": "repository",
+    "pr": "pull",
+    "forecast": "weather",
+    "temperature": "weather",
+    "bug": "issue",
+    "ticket": "issue",
+    "web": "search",
+    "news": "search",
+    "latest": "search",
+    "find": "search",
+    "look": "search",
+}
+
+
+def _stem(word: str) -> str:
+    if len(word) > 4 and word.endswith("ies"):
+        word = word[:-3] + "y"
+    elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return _ALIASES.get(word, word)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased, lightly stemmed terms; snake_case and camelCase are split"""
+    text = re.sub(r"([a-z])([A-Z])", r"\1 \2", text)
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return [_stem(w) for w in words if w not in _STOPWORDS]
+
+
+class ToolIndex:
+    """BM25 index over tool name + description; one document per tool"""
+
+    def __init__(self, docs: Dict[str, str], k1: float = 1.5, b: float = 0.75):
+        self.names = tuple(sorted(docs))
+        self.k1 = k1
+        self.b = b
+        self.lengths: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}  # term -> {tool: term frequency}
+        for name in self.names:
+            terms = tokenize(name) * NAME_BOOST + tokenize(docs[name])
+            self.lengths[name] = len(terms)
+            for term in terms:
+                tf = self.postings.setdefault(term, {})
+                tf[name] = tf.get(name, 0) + 1
+        n = len(self.names)
+        self.avg_length = sum(self.lengths.values()) / n if n else 0.0
+        self.idf = {
+            term: math.log(1 + (n - len(tf) + 0.5) / (len(tf) + 0.5))
+            for term, tf in self.postings.items()
+        }
+
+    @classmethod
+    def from_tools(cls, tools: Iterable[Any]) -> "ToolIndex":
+        return cls({t.name: getattr(t, "description", "") or "" for t in tools if getattr(t, "name", None)})
+
+    def scores(self, query: str) -> Dict[str, float]:
+        """BM25 score per tool that shares at least one term with the query"""
+        out: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            tf = self.postings.get(term)
+            if not tf:
+                continue
+            idf = self.idf[term]
+            for name, freq in tf.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[name] / self.avg_length)
+                out[name] = out.get(name, 0.0) + idf * freq * (self.k1 + 1) / (freq + norm)
+        return out
+
+    def select(self, query: str, k: int = TOP_K, pinned: Tuple[str, ...] = PINNED) -> Tuple[str, ...]:
+        """
+        Sorted catalog of the top-k tools for query (plus pinned ones); all tools
+        if k <= 0 or k >= size, or if no tool matches the query at all
+        """
+        if k <= 0 or k >= len(self.names):
+            return self.names
+        scores = {name: score for name, score in self.scores(query).items() if score > 0}
+        if not scores:
+            return self.names  # nothing to rank by: let the planner see everything
+        ranked = sorted(scores, key=lambda name: (-scores[name], name))
+        chosen = set(ranked[:k])
+        chosen.update(t for t in pinned if t in self.lengths)
+        return tuple(sorted(chosen))
+
+
+_indexes: Dict[Tuple[str, ...], ToolIndex] = {}
+
+
+def index_for(tools: List[Any]) -> ToolIndex:
+    """ToolIndex for this tool catalog, built on first use per catalog version"""
+    key = catalog_key(tools)
+    index: Optional[ToolIndex] = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = ToolIndex.from_tools(tools)
+    return index
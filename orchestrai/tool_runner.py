@@ -1,25 +1,237 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+import asyncio
+import contextvars
+import os
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .cassette import current_cassette
+from .mcp_tools import tool_server
+from .resilience import (
+    AdaptiveLimit,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitedError,
+    TokenBucket,
+    ToolTimeoutError,
+    hedged,
+)
+
+# Timeout budgets in seconds: tool overrides server, server overrides default
+DEFAULT_TIMEOUT = float(os.getenv("ORCHESTRAI_TOOL_TIMEOUT", "30"))
+SERVER_TIMEOUTS: Dict[str, float] = {
+    "weather": 15.0,
+    "tavily": 30.0,
+    "github": 30.0,
+}
+TOOL_TIMEOUTS: Dict[str, float] = {
+    "get_weather": 15.0,
+    "tavily_search": 20.0,
+}
+
+# Upstream quotas as (calls, per seconds); a server without an entry is not rate limited
+SERVER_RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    "github": (5000, 3600.0),  # authenticated REST quota
+    "tavily": (100, 60.0),
+    "weather": (600, 60.0),  # Open-Meteo per-minute limit
+}
+
+# How long a call may queue for rate budget before it fails with RateLimitedError
+MAX_QUEUE_WAIT = float(os.getenv("ORCHESTRAI_RATE_MAX_WAIT", "10"))
+
+_REMAINING = re.compile(r"x-ratelimit-remaining[\"'\s:=]+(\d+)", re.IGNORECASE)
+_RESET = re.compile(r"x-ratelimit-reset[\"'\s:=]+(\d+)", re.IGNORECASE)
+_RETRY_AFTER = re.compile(r"retry[-_ ]after[\"'\s:=]+(\d+)", re.IGNORECASE)
+# Only a real 429 status, its reason phrase, GitHub's quota message or a retry-after header; a bare
+# "429" in an error may just be an issue number
+_RATE_LIMITED = re.compile(
+    r"status(?:[ _]?code)?[\"'\s:=]+429\b|\b429 too many requests|too many requests|"
+    r"rate[- ]limit(?:ed| exceeded)|retry[-_ ]after[\"'\s:=]+\d",
+    re.IGNORECASE,
+)
+
+# Errors that say the server (or the link to it) is unhealthy, as opposed to a bad request
+_SERVER_ERROR = re.compile(
+    r"status(?:[ _]?code)?[\"'\s:=]+5\d\d\b|\b5\d\d (?:internal server error|bad gateway|service unavailable|"
+    r"gateway time-?out)|internal server error|bad gateway|service unavailable|gateway time-?out|"
+    r"connection (?:closed|reset|refused|aborted)",
+    re.IGNORECASE,
+)
+# Transport failures from the MCP client stack (anyio streams, httpx), matched by name to avoid imports
+_TRANSPORT_ERRORS = {
+    "ClosedResourceError", "BrokenResourceError", "EndOfStream", "ConnectError", "ReadError",
+    "WriteError", "RemoteProtocolError", "ReadTimeout", "ConnectTimeout",
+}
+
+
+def is_server_fault(error: BaseException) -> bool:
+    """
+    True for transport/connection errors, 5xx and rate-limit responses; False for
+    caller errors (404 for a wrong repo, invalid arguments, validation errors),
+    which say nothing about the server's health
+    """
+    if isinstance(error, (OSError, EOFError)):
+        return True
+    if any(cls.__name__ in _TRANSPORT_ERRORS for cls in type(error).__mro__):
+        return True
+    text = str(error)[:4000]
+    return bool(_SERVER_ERROR.search(text) or _RATE_LIMITED.search(text))
+
+
+def parse_rate_limits(spec: str) -> Dict[str, Tuple[int, float]]:
+    """ORCHESTRAI_RATE_LIMITS format: "github=5000/3600,tavily=100/60" ("off" disables the defaults)"""
+    limits = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        server, _, rate = item.partition("=")
+        calls, _, seconds = rate.partition("/")
+        limits[server.strip()] = (int(calls), float(seconds or 1))
+    return limits
+
+
+def rate_hints(text: str, failed: bool = False) -> Tuple[Optional[int], Optional[float]]:
+    """(remaining calls, seconds until reset) reported in a tool result or error, if any"""
+    remaining = _REMAINING.search(text)
+    reset = _RESET.search(text)
+    retry = _RETRY_AFTER.search(text)
+    reset_in = None
+    if retry:
+        reset_in = float(retry.group(1))
+    elif reset:
+        reset_in = max(0.0, float(reset.group(1)) - time.time())
+    if failed and _RATE_LIMITED.search(text):
+        return 0, reset_in if reset_in is not None else 60.0
+    return (int(remaining.group(1)) if remaining else None), reset_in
+
+
+# AIMD in-flight call limits per server (see AdaptiveLimit)
+ADAPTIVE_CONCURRENCY = os.getenv("ORCHESTRAI_ADAPTIVE_CONCURRENCY", "true").lower() in ("1", "true", "yes")
+INITIAL_CONCURRENCY = int(os.getenv("ORCHESTRAI_INITIAL_CONCURRENCY", "4"))
+MAX_CONCURRENCY = int(os.getenv("ORCHESTRAI_MAX_CONCURRENCY", "32"))
+
+# Reads that are safe to send twice (hedging)
+IDEMPOTENT_PREFIXES = ("get_", "list_", "search_", "tavily_search", "tavily_extract")
+
+
+class ReadOnlyError(PermissionError):
+    """A tool that may write was called inside read_only_tools()"""
+
+
+_read_only: contextvars.ContextVar[bool] = contextvars.ContextVar("orchestrai_read_only", default=False)
+
+
+@contextmanager
+def read_only_tools() -> Iterator[None]:
+    """Inside this block (and tasks it starts) only IDEMPOTENT_PREFIXES tools run; others raise ReadOnlyError"""
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
 
 
 class ToolRunner:
-    def __init__(self, tools: List[Any]):
+    def __init__(
+        self,
+        tools: List[Any],
+        server_timeouts: Optional[Dict[str, float]] = None,
+        tool_timeouts: Optional[Dict[str, float]] = None,
+        hedge_after: Optional[float] = None,
+        breaker_threshold: int = 5,
+        breaker_reset: float = 30.0,
+        rate_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        max_queue_wait: float = MAX_QUEUE_WAIT,
+        adaptive_concurrency: bool = ADAPTIVE_CONCURRENCY,
+    ):
         self.tools = tools
         self.by_name = {}
+        self.server_of: Dict[str, str] = {}
         for t in tools:
             name = getattr(t, "name", None)
             if name:
                 self.by_name[name] = t
+                self.server_of[name] = tool_server(t)
+
+        self.server_timeouts = {**SERVER_TIMEOUTS, **(server_timeouts or {})}
+        self.tool_timeouts = {**TOOL_TIMEOUTS, **(tool_timeouts or {})}
+        if hedge_after is None and os.getenv("ORCHESTRAI_HEDGE_AFTER"):
+            hedge_after = float(os.getenv("ORCHESTRAI_HEDGE_AFTER"))
+        self.hedge_after = hedge_after
+        self.breakers: Dict[str, CircuitBreaker] = {
+            server: CircuitBreaker(breaker_threshold, breaker_reset)
+            for server in set(self.server_of.values())
+        }
+
+        spec = os.getenv("ORCHESTRAI_RATE_LIMITS", "")
+        if spec.lower() == "off":
+            limits = dict(rate_limits or {})
+        else:
+            limits = {**SERVER_RATE_LIMITS, **parse_rate_limits(spec), **(rate_limits or {})}
+        self.buckets: Dict[str, TokenBucket] = {
+            server: TokenBucket(capacity=calls, rate=calls / seconds)
+            for server, (calls, seconds) in limits.items()
+            if server in self.breakers
+        }
+        self._admission = {server: asyncio.Lock() for server in self.buckets}
+        self.max_queue_wait = max_queue_wait
+        self.limits: Dict[str, AdaptiveLimit] = {
+            server: AdaptiveLimit(INITIAL_CONCURRENCY, max_limit=MAX_CONCURRENCY)
+            for server in self.breakers
+        } if adaptive_concurrency else {}
 
     def list_tools(self) -> List[str]:
         return sorted(self.by_name.keys())
 
+    def timeout_for(self, tool_name: str) -> float:
+        if tool_name in self.tool_timeouts:
+            return self.tool_timeouts[tool_name]
+        return self.server_timeouts.get(self.server_of.get(tool_name, ""), DEFAULT_TIMEOUT)
+
+    def open_breakers(self) -> List[str]:
+        """Servers whose breaker is currently open or probing"""
+        return sorted(s for s, b in self.breakers.items() if b.state != "closed")
+
+    def concurrency_limits(self) -> Dict[str, int]:
+        """Current adaptive in-flight limit per server"""
+        return {server: limit.current for server, limit in sorted(self.limits.items())}
+
+    def rate_budget(self) -> Dict[str, float]:
+        """Calls left in each rate-limited server's budget right now"""
+        return {server: round(bucket.level, 1) for server, bucket in sorted(self.buckets.items())}
+
+    async def _admit(self, server: str, tool_name: str) -> None:
+        """Wait (FIFO per server) for rate budget, up to max_queue_wait"""
+        bucket = self.buckets.get(server)
+        if bucket is None:
+            return
+        deadline = time.monotonic() + self.max_queue_wait
+        async with self._admission[server]:
+            while not bucket.try_take():
+                wait = bucket.wait_time()
+                if time.monotonic() + wait > deadline:
+                    raise RateLimitedError(
+                        f"Rate budget for MCP server '{server}' exhausted; '{tool_name}' would wait "
+                        f"{wait:.1f}s (max {self.max_queue_wait:g}s)"
+                    )
+                await asyncio.sleep(wait)
+
+    def _observe(self, server: str, text: str, failed: bool = False) -> None:
+        bucket = self.buckets.get(server)
+        if bucket is None:
+            return
+        remaining, reset_in = rate_hints(text[:4000], failed)
+        if remaining is not None or reset_in is not None:
+            bucket.observe(remaining, reset_in)
+
     async def call(self, tool_name: str, args: Dict[str, Any]) -> Any:
         if tool_name not in self.by_name:
             raise KeyError(f"Tool '{tool_name}' not found. Available: {self.list_tools()}")
-        
+
         tool = self.by_name[tool_name]
-        
+        if _read_only.get() and not tool_name.startswith(IDEMPOTENT_PREFIXES):
+            raise ReadOnlyError(f"'{tool_name}' may write and is disabled in this read-only run")
+
         # SPECIAL HANDLING: Weather tool requires "location" not "city"
         if tool_name == "get_weather" and "city" in args:
             # Transform to correct schema
@@ -32,6 +244,67 @@ class ToolRunner:
                 }
             }
 
+        cassette = current_cassette()
+        if cassette is not None and cassette.replaying:
+            return await cassette.replay("tool", tool_name, args)
+
+        server = self.server_of[tool_name]
+        # Breaker first: a call to a server that is down must not spend rate budget
+        breaker = self.breakers[server]
+        if not breaker.allow():
+            raise CircuitOpenError(f"MCP server '{server}' is unavailable (circuit open), skipped '{tool_name}'")
+
+        limit = self.limits.get(server)
+        try:
+            await self._admit(server, tool_name)
+            slot = await limit.acquire() if limit is not None else 0.0
+        except (asyncio.CancelledError, RateLimitedError):
+            breaker.probing = False  # The probe never reached the server
+            raise
+        ok: Optional[bool] = None
+
+        timeout = self.timeout_for(tool_name)
+        start = time.perf_counter()
+        try:
+            if self.hedge_after and tool_name.startswith(IDEMPOTENT_PREFIXES):
+                invoke = hedged(lambda: self._invoke(tool_name, tool, args), self.hedge_after)
+            else:
+                invoke = self._invoke(tool_name, tool, args)
+            result = await asyncio.wait_for(invoke, timeout=timeout)
+            ok = True
+        except asyncio.CancelledError:
+            breaker.probing = False  # A cancelled probe says nothing about the server
+            raise
+        except asyncio.TimeoutError:
+            ok = False
+            breaker.record_failure()
+            error = ToolTimeoutError(f"Tool '{tool_name}' timed out after {timeout:g}s")
+            if cassette is not None:
+                cassette.record("tool", tool_name, args, latency=time.perf_counter() - start, error=str(error))
+            raise error
+        except Exception as e:
+            if is_server_fault(e):
+                ok = False
+                breaker.record_failure()
+                self._observe(server, str(e), failed=True)
+            else:
+                ok = True  # The server answered; the request was wrong
+                breaker.record_success()
+            if cassette is not None:
+                cassette.record("tool", tool_name, args, latency=time.perf_counter() - start, error=str(e))
+            raise
+        finally:
+            if limit is not None:
+                await limit.release(slot, ok, tool_name)
+
+        breaker.record_success()
+        if isinstance(result, str):
+            self._observe(server, result)
+        if cassette is not None:
+            cassette.record("tool", tool_name, args, result, latency=time.perf_counter() - start)
+        return result
+
+    async def _invoke(self, tool_name: str, tool: Any, args: Dict[str, Any]) -> Any:
         # LangChain tools support ainvoke for async calls
         if hasattr(tool, "ainvoke"):
             return await tool.ainvoke(args)
@@ -1,17 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import re
 import time
 from datetime import datetime
-from typing import Dict, Any
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
 from crewai import Task, Crew, Process
-from pydantic import ValidationError
 
-from orchestrai.schemas import ResearchPacket, TaskPlan, ExecutionResult
-from orchestrai.agents import build_research_agent, build_planner_agent, build_executor_agent
+from orchestrai.schemas import ResearchPacket, PlanStep, TaskPlan, ExecutionResult
+from orchestrai.plan_stream import PlanStreamParser
+from orchestrai.agents import AgentSet, build_agents
 from orchestrai.tool_runner import ToolRunner
-from orchestrai.mcp_tools import get_tool_names
-from eval.judge import judge_run
+from orchestrai.blocking import run_blocking
+from orchestrai import answers, events, issue_mirror, plan_repair, profiling, prompts, tool_index
+from orchestrai.cassette import current_cassette
+from eval.judge import JudgeScore, ajudge_run
 from orchestrai.metrics import MetricsTracker, MetricEntry, infer_goal_type
 
 # ============================================================================
@@ -48,15 +52,148 @@ def extract_city(text: str) -> str:
     
     return "New York"
 
+# ============================================================================
+# SPECULATIVE PREFETCH
+# ============================================================================
+
+# Goal types whose read-only tool is predictable enough to start before the plan exists
+SPECULATIVE_TOOLS = {"weather": "get_weather", "search": "tavily_search"}
+
+SPECULATE = os.getenv("ORCHESTRAI_SPECULATE", "true").lower() in ("1", "true", "yes")
+
+# Stream planner output and dispatch each step's read tools as soon as the step is parsed
+STREAM_PLANNER = os.getenv("ORCHESTRAI_STREAM_PLANNER", "true").lower() in ("1", "true", "yes")
+
+# Render single-tool answers from templates instead of calling the executor LLM
+TEMPLATE_ANSWERS = os.getenv("ORCHESTRAI_TEMPLATE_ANSWERS", "true").lower() in ("1", "true", "yes")
+
+# Targeted re-prompts allowed when deterministic plan repair is not enough
+PLAN_REPROMPTS = int(os.getenv("ORCHESTRAI_PLAN_REPROMPTS", "1"))
+
+
+# Idempotent reads whose arguments come from the goal alone (safe to start before the plan is final)
+READ_TOOLS = ("tavily_search", "get_weather", "list_issues", "get_file_contents")
+
+
+def _goal_repo(user_goal: str) -> Tuple[str, str]:
+    match = re.search(
+        r'(?:in|for|from)\s+(?:repo\s+)?([a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+)',
+        user_goal
+    )
+    repo_full = match.group(1) if match else "deepmehta27/mcp-navigator-test"
+    owner, repo = repo_full.split('/')
+    return owner, repo
+
+
+def read_tool_args(tool_name: str, user_goal: str) -> Dict[str, Any]:
+    """Arguments for READ_TOOLS; shared by prefetch, early dispatch and execute_plan_tools"""
+    if tool_name == "tavily_search":
+        return {"query": user_goal, "max_results": 10}
+    if tool_name == "get_weather":
+        return {"city": extract_city(user_goal)}
+    if tool_name == "list_issues":
+        owner, repo = _goal_repo(user_goal)
+        # Request multiple issues per page
+        return {"owner": owner, "repo": repo, "per_page": 100, "state": "all"}
+    if tool_name == "get_file_contents":
+        owner, repo = _goal_repo(user_goal)
+        path_match = re.search(r'(?:file|path)\s+([^\s]+)', user_goal)
+        return {"owner": owner, "repo": repo, "path": path_match.group(1) if path_match else "README.md"}
+    raise ValueError(f"No read arguments for tool '{tool_name}'")
+
+
+def _retrieve(task: asyncio.Task) -> None:
+    # Mark a discarded prefetch's exception as retrieved so asyncio doesn't warn
+    if not task.cancelled():
+        task.exception()
+
+
+def start_prefetch(user_goal: str, runner: ToolRunner, catalog: Tuple[str, ...]) -> Dict[str, asyncio.Task]:
+    """Start the tool a confidently-typed goal will almost certainly need"""
+    if not SPECULATE:
+        return {}
+    tool_name = SPECULATIVE_TOOLS.get(infer_goal_type(user_goal))
+    if tool_name is None or tool_name not in catalog:
+        return {}
+
+    print(f"⚡ Prefetching {tool_name} while the planner runs")
+    return {tool_name: start_read(tool_name, user_goal, runner)}
+
+
+# Columns returned for issue reads served from the mirror
+ISSUE_FIELDS = ("number", "title", "state", "labels", "user", "updated_at")
+
+
+def _mirror() -> Optional[issue_mirror.IssueMirror]:
+    # Recorded runs replay raw tool responses, so they bypass the mirror
+    return None if current_cassette() is not None else issue_mirror.default_mirror()
+
+
+async def call_read(tool_name: str, user_goal: str, runner: ToolRunner) -> Any:
+    """Run a READ_TOOLS call, serving list_issues from the local issue mirror when enabled"""
+    args = read_tool_args(tool_name, user_goal)
+    mirror = _mirror() if tool_name == "list_issues" else None
+    if mirror is None:
+        return await runner.call(tool_name, args)
+    try:
+        return await mirror.list_issues(
+            runner, args["owner"], args["repo"], state=args["state"],
+            per_page=args["per_page"], fields=ISSUE_FIELDS,
+        )
+    except issue_mirror.MirrorUnavailable as e:
+        print(f"⚠️  {e}; calling list_issues directly")
+        return await runner.call(tool_name, args)
+
+
+def _search_text(user_goal: str) -> Optional[str]:
+    """Text to match for issue searches: quoted text, or what follows 'about'/'mentioning'"""
+    quoted = re.search(r'["\']([^"\']+)["\']', user_goal)
+    if quoted:
+        return quoted.group(1)
+    match = re.search(
+        r'\b(?:about|mentioning|containing)\s+(.+?)(?:\s+(?:in|for|from)\s+(?:repo\s+)?[\w-]+/[\w-]+|$)',
+        user_goal,
+        re.IGNORECASE,
+    )
+    return match.group(1).strip() if match else None
+
+
+def start_read(tool_name: str, user_goal: str, runner: ToolRunner) -> asyncio.Task:
+    """Start a READ_TOOLS call in the background"""
+    task = asyncio.create_task(call_read(tool_name, user_goal, runner))
+    task.add_done_callback(_retrieve)
+    return task
+
+
+def discard_prefetch(prefetched: Dict[str, asyncio.Task]) -> List[str]:
+    """Cancel prefetches the plan did not use; returns their tool names"""
+    wasted = list(prefetched)
+    for task in prefetched.values():
+        task.cancel()
+    prefetched.clear()
+    return wasted
+
 # ============================================================================
 # GENERIC TOOL EXECUTION ENGINE (NEW)
 # ============================================================================
 
-async def execute_plan_tools(plan: TaskPlan, runner: ToolRunner, user_goal: str) -> Dict[str, Any]:
+async def execute_plan_tools(
+    plan: TaskPlan,
+    runner: ToolRunner,
+    user_goal: str,
+    prefetched: Optional[Dict[str, asyncio.Task]] = None,
+    calls: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, Any]:
     """
     Execute all tools in the plan by extracting parameters from user_goal.
-    Returns a dict of {tool_name: result}
+    Tools in `prefetched` (see start_prefetch) are awaited instead of called again;
+    used entries are removed from the dict.
+    If `calls` is given it is filled with {tool_name: {"server", "seconds", "ok"}}.
+    Returns a dict of {tool_name: result}; results are not truncated (answer templates
+    parse them whole, the executor prompt clips them)
     """
+    calls = calls if calls is not None else {}
+    prefetched = prefetched if prefetched is not None else {}
     results = {}
     
     for step in plan.steps:
@@ -67,21 +204,25 @@ async def execute_plan_tools(plan: TaskPlan, runner: ToolRunner, user_goal: str)
             if tool_name in results:
                 continue  # Already executed
             
+            tool_start = time.time()
+            events.emit(events.TOOL_STARTED, tool=tool_name, step_id=step.step_id)
             try:
                 print(f"\n🔧 Executing: {tool_name}")
                 
+                # ===== SPECULATIVE PREFETCH (started while the planner ran) =====
+                if tool_name in prefetched:
+                    print("Using prefetched result")
+                    result = await prefetched.pop(tool_name)
+                
                 # ===== TAVILY SEARCH (NEW!) =====
-                if tool_name == "tavily_search":
-                    result = await runner.call(tool_name, {
-                        "query": user_goal,
-                        "max_results": 10
-                    })
+                elif tool_name == "tavily_search":
+                    result = await call_read(tool_name, user_goal, runner)
                 
                 # ===== WEATHER =====
                 elif tool_name == "get_weather":
-                    city = extract_city(user_goal)
-                    print(f"City: {city}")
-                    result = await runner.call(tool_name, {"city": city})
+                    args = read_tool_args(tool_name, user_goal)
+                    print(f"City: {args['city']}")
+                    result = await runner.call(tool_name, args)
                 
                 # ===== GITHUB =====
                 elif tool_name == "create_issue":
@@ -142,43 +283,28 @@ async def execute_plan_tools(plan: TaskPlan, runner: ToolRunner, user_goal: str)
                         "title": title if title else user_goal,
                         "body": body
                     })
-
-
-                elif tool_name == "list_issues":
-                    match = re.search(
-                        r'(?:in|for|from)\s+(?:repo\s+)?([a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+)',
-                        user_goal
-                    )
-                    repo_full = match.group(1) if match else "deepmehta27/mcp-navigator-test"
-                    owner, repo = repo_full.split('/')
-                    print(f"Owner: {owner}, Repo: {repo}")
-                    
-                    # Request multiple issues per page
-                    result = await runner.call(tool_name, {
-                        "owner": owner,
-                        "repo": repo,
-                        "perPage": 100,
-                        "state": "all"   
-                    })
-
-                elif tool_name == "get_file_contents":
-                    match = re.search(
-                        r'(?:in|for|from)\s+(?:repo\s+)?([a-zA-Z0-9_-]+/[a-zA-Z0-9_-]+)',
-                        user_goal
-                    )
-                    repo_full = match.group(1) if match else "deepmehta27/mcp-navigator-test"
-                    owner, repo = repo_full.split('/')
-                    
-                    # Extract file path
-                    path_match = re.search(r'(?:file|path)\s+([^\s]+)', user_goal)
-                    path = path_match.group(1) if path_match else "README.md"
-                    
-                    print(f"Owner: {owner}, Repo: {repo}, Path: {path}")
-                    result = await runner.call(tool_name, {
-                        "owner": owner,
-                        "repo": repo,
-                        "path": path
-                    })
+                    mirror = _mirror()
+                    if mirror is not None:
+                        await run_blocking(mirror.invalidate, owner, repo)
+
+
+                elif tool_name in ("list_issues", "get_file_contents"):
+                    args = read_tool_args(tool_name, user_goal)
+                    print(", ".join(f"{k.title()}: {args[k]}" for k in ("owner", "repo", "path") if k in args))
+                    result = await call_read(tool_name, user_goal, runner)
+
+                # ===== ISSUE SEARCH (served from the mirror when there is text to match) =====
+                elif tool_name == "search_issues" and _mirror() is not None and _search_text(user_goal):
+                    owner, repo = _goal_repo(user_goal)
+                    text = _search_text(user_goal)
+                    print(f"Searching mirrored issues in {owner}/{repo} for: {text}")
+                    try:
+                        result = await _mirror().list_issues(
+                            runner, owner, repo, text=text, fields=ISSUE_FIELDS
+                        )
+                    except issue_mirror.MirrorUnavailable as e:
+                        print(f"⚠️  {e}; calling search_issues directly")
+                        result = await runner.call(tool_name, {"query": f"repo:{owner}/{repo} is:issue {text}"})
 
                 elif tool_name == "create_or_update_file":
                     match = re.search(
@@ -224,13 +350,37 @@ async def execute_plan_tools(plan: TaskPlan, runner: ToolRunner, user_goal: str)
                 
                 # Store result
                 result_str = str(result)
-                results[tool_name] = result_str[:2000] if len(result_str) > 2000 else result_str
+                results[tool_name] = result_str
                 print(f"Preview: {result_str[:150]}...")
+                calls[tool_name] = {
+                    "server": runner.server_of.get(tool_name, ""),
+                    "seconds": round(time.time() - tool_start, 4),
+                    "ok": True,
+                }
+                events.emit(
+                    events.TOOL_FINISHED,
+                    tool=tool_name,
+                    ok=True,
+                    latency=time.time() - tool_start,
+                    preview=result_str[:150],
+                )
                 
             except Exception as e:
                 error_msg = f"Error: {str(e)}"
                 print(f"⚠️  Failed: {error_msg}")
                 results[tool_name] = error_msg
+                calls[tool_name] = {
+                    "server": runner.server_of.get(tool_name, ""),
+                    "seconds": round(time.time() - tool_start, 4),
+                    "ok": False,
+                }
+                events.emit(
+                    events.TOOL_FINISHED,
+                    tool=tool_name,
+                    ok=False,
+                    latency=time.time() - tool_start,
+                    preview=error_msg[:150],
+                )
     
     return results
 
@@ -239,119 +389,393 @@ def _parse(model_cls, text: str):
     return model_cls.model_validate_json(text)
 
 
+def _stage_usage(token_usage: Any) -> Dict[str, int]:
+    """Prompt / cached / completion token counts from a CrewOutput's UsageMetrics"""
+    return {
+        "prompt_tokens": getattr(token_usage, "prompt_tokens", 0) or 0,
+        "cached_prompt_tokens": getattr(token_usage, "cached_prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(token_usage, "completion_tokens", 0) or 0,
+    }
+
+
+def _fresh_token_usage(agent: Any) -> None:
+    """Agent.copy() shallow-copies the LLM, so copies share one usage counter; give this run its own"""
+    counter = getattr(agent.llm, "_token_usage", None)
+    if isinstance(counter, dict):
+        agent.llm._token_usage = dict.fromkeys(counter, 0)
+
+
+async def _kickoff(
+    stage: str,
+    crew: Crew,
+    prompt: str,
+    usage: Optional[Dict[str, Dict[str, int]]] = None,
+) -> str:
+    """
+    Run a crew off the event loop, recording/replaying through the active cassette.
+    If usage is given, the stage's token counts are stored under usage[stage].
+    """
+    cassette = current_cassette()
+    if cassette is not None and cassette.replaying:
+        return await cassette.replay("llm", stage, prompt)
+
+    start = time.perf_counter()
+    try:
+        output = await run_blocking(profiling.in_phase(stage, crew.kickoff))
+    except Exception as e:
+        if cassette is not None:
+            cassette.record("llm", stage, prompt, latency=time.perf_counter() - start, error=str(e))
+        raise
+
+    if usage is not None and getattr(output, "token_usage", None) is not None:
+        usage[stage] = _stage_usage(output.token_usage)
+
+    raw = output if isinstance(output, str) else str(output)
+    if cassette is not None:
+        cassette.record("llm", stage, prompt, raw, latency=time.perf_counter() - start)
+    return raw
+
+
+async def _repair_call(llm: Any, prompt: str) -> str:
+    """Direct planner-LLM call for a repair prompt (no crew), with cassette record/replay"""
+    cassette = current_cassette()
+    if cassette is not None and cassette.replaying:
+        return await cassette.replay("llm", "planner_repair", prompt)
+
+    def call() -> str:
+        # Keep a streaming planner LLM's chunks out of the answer stream
+        with events.chunk_listener(lambda chunk: None):
+            return str(llm.call(prompt))
+
+    start = time.perf_counter()
+    raw = await run_blocking(profiling.in_phase("validate", call))
+    if cassette is not None:
+        cassette.record("llm", "planner_repair", prompt, raw, latency=time.perf_counter() - start)
+    return raw
+
+
+async def _judge(
+    user_goal: str,
+    plan: Dict[str, Any],
+    final_answer: str,
+    llm: Any,
+    usage: Optional[Dict[str, Dict[str, int]]] = None,
+) -> JudgeScore:
+    """ajudge_run with cassette record/replay"""
+    cassette = current_cassette()
+    request = {"goal": user_goal, "plan": plan, "final_answer": final_answer}
+    if cassette is not None and cassette.replaying:
+        return JudgeScore.model_validate(await cassette.replay("llm", "judge", request))
+
+    start = time.perf_counter()
+    judge_usage: Dict[str, int] = {}
+    judge = await ajudge_run(
+        goal=user_goal, plan=plan, final_answer=final_answer, trace=None, llm=llm, usage=judge_usage
+    )
+    if usage is not None and judge_usage:
+        usage["judge"] = judge_usage
+    if cassette is not None:
+        cassette.record("llm", "judge", request, judge.model_dump(), latency=time.perf_counter() - start)
+    return judge
+
+
+def _early_dispatcher(
+    user_goal: str,
+    runner: ToolRunner,
+    catalog: Tuple[str, ...],
+    prefetched: Dict[str, asyncio.Task],
+) -> Callable[[PlanStep], None]:
+    """on_step callback: start a streamed step's read tools before the plan is complete"""
+    started = time.time()
+
+    def on_step(step: PlanStep) -> None:
+        for tool_name in step.tools:
+            if tool_name in catalog and tool_name in READ_TOOLS and tool_name not in prefetched:
+                print(f"⚡ Step {step.step_id} streamed after {time.time() - started:.2f}s, dispatching {tool_name}")
+                prefetched[tool_name] = start_read(tool_name, user_goal, runner)
+
+    return on_step
+
+
+async def _kickoff_planner(
+    stage: str,
+    user_goal: str,
+    planner_agent: Any,
+    catalog: Tuple[str, ...],
+    token_usage: Dict[str, Dict[str, int]],
+    runner: ToolRunner,
+    prefetched: Dict[str, asyncio.Task],
+    context: str = "",
+) -> str:
+    """Run the planner crew once and return its raw output"""
+    plan_task = Task(
+        description=prompts.planner_prompt(catalog, user_goal, context),
+        expected_output="Valid JSON matching TaskPlan schema",
+        agent=planner_agent,
+    )
+
+    planner_crew = Crew(
+        agents=[planner_agent],
+        tasks=[plan_task],
+        process=Process.sequential,
+        verbose=True,
+    )
+
+    if not (STREAM_PLANNER and events.install_token_handler()):
+        return await _kickoff(stage, planner_crew, plan_task.description, token_usage)
+
+    planner_agent.llm.stream = True
+    loop = asyncio.get_running_loop()
+    parser = PlanStreamParser(_early_dispatcher(user_goal, runner, catalog, prefetched))
+    # Chunks arrive on the LLM pool thread; parse them on the event loop
+    with events.chunk_listener(lambda chunk: loop.call_soon_threadsafe(parser.feed, chunk)):
+        return await _kickoff(stage, planner_crew, plan_task.description, token_usage)
+
+
+def _low_confidence(plan: TaskPlan, fixes: List[str], user_goal: str) -> Optional[str]:
+    """Reason to distrust a valid small-model plan, or None"""
+    guessed = [f for f in fixes if f.startswith("tool:")]
+    if guessed:
+        return f"tool names had to be guessed ({', '.join(guessed)})"
+    if infer_goal_type(user_goal) != "other" and not any(step.tools for step in plan.steps):
+        return "no tools planned for a tool-shaped goal"
+    return None
+
+
+def _model_name(agent: Any) -> str:
+    return str(getattr(agent.llm, "model", None) or getattr(agent.llm, "model_name", "unknown"))
+
+
+async def _plan(
+    user_goal: str,
+    planner_agent: Any,
+    catalog: Tuple[str, ...],
+    token_usage: Dict[str, Dict[str, int]],
+    runner: ToolRunner,
+    prefetched: Dict[str, asyncio.Task],
+    repair: plan_repair.RepairLog,
+    escalation_agent: Optional[Any] = None,
+    context: str = "",
+) -> TaskPlan:
+    """
+    Run the planner and validate its output (schema + tool names) into a TaskPlan.
+    Invalid or low-confidence output from the fast planner is re-planned once
+    on a copy of escalation_agent (larger model) when one is configured; invalid output
+    is then repaired (see orchestrai.plan_repair) before giving up.
+    Repairs, escalation and their latency are recorded in `repair`.
+    With streaming, each PlanStep is parsed as soon as it is complete and its
+    read tools are dispatched into `prefetched` while the planner keeps writing.
+    context is the earlier conversation (see orchestrai.memory), if any.
+    """
+    agent = planner_agent
+    repair.model = _model_name(agent)
+    raw_plan = await _kickoff_planner(
+        "planner", user_goal, agent, catalog, token_usage, runner, prefetched, context
+    )
+
+    # ----------------------------
+    # 2. VALIDATE PLAN (ESCALATE / REPAIR, THEN HARD GATE)
+    # ----------------------------
+    profiling.mark_phase("validate")
+    repair_start = time.perf_counter()
+    reprompts = 0
+    while True:
+        try:
+            task_plan, fixes = plan_repair.parse_plan(raw_plan, user_goal, catalog)
+        except plan_repair.PlanInvalid as e:
+            task_plan, fixes, problem = None, [], str(e)
+        else:
+            can_escalate = escalation_agent is not None and not repair.escalated
+            problem = _low_confidence(task_plan, fixes, user_goal) if can_escalate else None
+            if problem is None:
+                repair.fixes.extend(fixes)
+                break
+
+        if escalation_agent is not None and not repair.escalated:
+            agent = escalation_agent.copy()
+            _fresh_token_usage(agent)
+            repair.escalated = True
+            repair.model = _model_name(agent)
+            repair.fixes.append("escalate")
+            print(f"⬆️  Escalating planner to {repair.model}: {problem.splitlines()[0]}")
+            raw_plan = await _kickoff_planner(
+                "planner_escalated", user_goal, agent, catalog, token_usage, runner, prefetched, context
+            )
+            profiling.mark_phase("validate")
+            continue
+
+        if reprompts >= PLAN_REPROMPTS:
+            raise RuntimeError(
+                f"Planner produced invalid TaskPlan.\n\n"
+                f"Validation error:\n{problem}\n\n"
+                f"Raw output:\n{raw_plan}"
+            )
+        reprompts += 1
+        print(f"🩹 Plan invalid ({problem.splitlines()[0]}), re-prompting planner")
+        repair.fixes.append("reprompt")
+        raw_plan = await _repair_call(agent.llm, plan_repair.repair_prompt(problem, raw_plan, user_goal))
+    
+    if repair.fixes:
+        repair.seconds = time.perf_counter() - repair_start
+        print(f"🩹 Plan repaired ({', '.join(repair.fixes)}) in {repair.seconds:.2f}s")
+    
+    print(f"✅ Plan validated: {len(task_plan.steps)} steps, all tools valid\n")
+    return task_plan
+
+
+async def _run_executor(
+    executor_agent: Any,
+    task_plan: TaskPlan,
+    tool_results: Dict[str, Any],
+    user_goal: str,
+    token_usage: Dict[str, Dict[str, int]],
+    context: str = "",
+) -> Tuple[str, bool, List[str]]:
+    """Synthesize the final answer with the executor LLM: (answer, succeeded, errors)"""
+    exec_description = prompts.executor_prompt(
+        task_plan.model_dump_json(indent=2), tool_results, user_goal, context
+    )
+    
+    exec_task = Task(
+        description=exec_description,
+        expected_output="Final answer for the user",
+        agent=executor_agent,
+    )
+
+    executor_crew = Crew(
+        agents=[executor_agent],
+        tasks=[exec_task],
+        process=Process.sequential,
+        verbose=False,
+    )
+
+    # Stream executor tokens when someone is listening
+    if events.streaming_enabled() and events.install_token_handler():
+        executor_agent.llm.stream = True
+
+    # Execute with error handling
+    try:
+        raw_exec = await _kickoff("executor", executor_crew, exec_description, token_usage)
+        return raw_exec, True, []
+    except Exception as e:
+        return f"Execution failed: {str(e)}", False, [str(e)]
+
+
 # ============================================================================
 # MAIN ORCHESTRATION (UPDATED)
 # ============================================================================
 
-async def run_orchestration(user_goal: str, tools) -> ExecutionResult:
+def stream_orchestration(user_goal: str, tools, **kwargs) -> AsyncIterator[events.RunEvent]:
+    """
+    Run an orchestration and yield progress events as they happen.
+    The last event is DONE (data["result"] is the ExecutionResult) or ERROR.
+    """
+    return events.stream(lambda sink: run_orchestration(user_goal, tools, on_event=sink, **kwargs))
+
+
+async def run_orchestration(
+    user_goal: str,
+    tools,
+    agents: Optional[AgentSet] = None,
+    metrics: Optional[MetricsTracker] = None,
+    runner: Optional[ToolRunner] = None,
+    on_event: Optional[events.EventSink] = None,
+    context: str = "",
+    ab_group: str = "",
+) -> ExecutionResult:
+    """
+    Plan, execute and judge a single user goal.
+    Long-running callers (service, batch) pass warm agents/metrics/runner
+    so they are shared across runs instead of rebuilt per goal.
+    on_event receives progress events (see orchestrai.events).
+    context is the earlier conversation for interactive clients (see orchestrai.memory);
+    ab_group tags the metrics of an A/B pair (see orchestrai.engines).
+    """
+    try:
+        if on_event is None:
+            return await _run_orchestration(user_goal, tools, agents, metrics, runner, context, ab_group)
+        with events.event_sink(on_event):
+            return await _run_orchestration(user_goal, tools, agents, metrics, runner, context, ab_group)
+    finally:
+        profiling.mark_phase(None)
+
+
+async def _run_orchestration(
+    user_goal: str,
+    tools,
+    agents: Optional[AgentSet],
+    metrics: Optional[MetricsTracker],
+    runner: Optional[ToolRunner],
+    context: str = "",
+    ab_group: str = "",
+) -> ExecutionResult:
     # Start timing
     start_time = time.time()
     
     # Initialize metrics tracker
-    metrics = MetricsTracker()
+    metrics = metrics or MetricsTracker()
     
     # ----------------------------
     # 0. SETUP
     # ----------------------------
-    research_agent = build_research_agent(tools)
-    planner_agent = build_planner_agent(tools)
-    executor_agent = build_executor_agent(tools)
-    runner = ToolRunner(tools)
+    profiling.mark_phase("setup")
+    # Per-run copies: the shared agents are templates (LLM config, prompts);
+    # copying keeps CrewAI's per-execution state isolated between threads.
+    agents = agents or build_agents(tools)
+    research_agent = agents.research
+    planner_agent = agents.planner.copy()
+    executor_agent = agents.executor.copy()
+    _fresh_token_usage(planner_agent)
+    _fresh_token_usage(executor_agent)
+    runner = runner or ToolRunner(tools)
+    token_usage: Dict[str, Dict[str, int]] = {}
     
     print("Available MCP tools:", runner.list_tools())
     
-    allowed_tools = ", ".join(get_tool_names(tools))
+    # Only the tools relevant to this goal go into the planner prompt and the allow-list
+    catalog = tool_index.index_for(tools).select(user_goal)
+    if len(catalog) < len(runner.by_name):
+        print(f"🔎 Planner catalog: {len(catalog)} of {len(runner.by_name)} tools: {', '.join(catalog)}")
 
     # ----------------------------
     # 1. CREATE PLAN
     # ----------------------------
-    plan_task = Task(
-    description=(
-        "You are the Task Planner.\n\n"
-        "Create a task plan for the following goal.\n\n"
-        "CRITICAL RULES (VIOLATION = FAILURE):\n"
-        "1. Return ONLY valid JSON\n"
-        "2. JSON MUST match this schema exactly:\n"
-        f"{TaskPlan.model_json_schema()}\n\n"
-        "3. You may ONLY use tool names from this list:\n"
-        f"{allowed_tools}\n\n"
-        "TOOL SELECTION RULES:\n"
-        "- For web searches: Use 'tavily_search' (reliable, fast)\n"
-        "- For weather: Use 'get_weather'\n"
-        "- For GitHub: Use 'create_issue', 'list_issues', 'create_or_update_file'\n"
-        "- Prefer simple, single-step solutions\n\n"
-        "**MULTI-TOOL RULES:**\n"
-        "- Each step should have EXACTLY ONE tool\n"
-        "- If you need data from Tool A to use in Tool B, create TWO steps:\n"
-        "  Step 1: Use Tool A to gather data\n"
-        "  Step 2: Use Tool B with the data from Step 1\n"
-        "- NEVER combine tools that depend on each other in the same step\n"
-        "- Example: 'search then create issue' = 2 steps, NOT 1 step\n\n"
-        "DO NOT invent tools.\n"
-        "DO NOT use generic terms like 'browser', 'internet', or 'API'.\n"
-        "If no tool is needed for a step, omit the tools field.\n\n"
-        f"Goal: {user_goal}"
-    ),
-    expected_output="Valid JSON matching TaskPlan schema",
-    agent=planner_agent,
-)
-
-    planner_crew = Crew(
-        agents=[planner_agent],
-        tasks=[plan_task],
-        process=Process.sequential,
-        verbose=True,
-    )
-
-    raw_plan = planner_crew.kickoff()
-    if not isinstance(raw_plan, str):
-        raw_plan = str(raw_plan)
-
-    # ----------------------------
-    # SANITIZE PLANNER OUTPUT
-    # ----------------------------
-    raw_plan = raw_plan.strip()
-
-    if raw_plan.startswith("```"):
-        raw_plan = raw_plan.strip("`").strip()
-        if raw_plan.lower().startswith("json"):
-            raw_plan = raw_plan[4:].strip()
-
-    # ----------------------------
-    # 2. VALIDATE PLAN (HARD GATE)
-    # ----------------------------
+    profiling.mark_phase("planner")
+    
+    # Start predictable read-only tools now so they overlap with the planner
+    prefetched = start_prefetch(user_goal, runner, catalog)
+    repair = plan_repair.RepairLog()
+    stage_start = time.perf_counter()
     try:
-        task_plan = TaskPlan.model_validate_json(raw_plan)
-    except ValidationError as e:
-        raise RuntimeError(
-            f"Planner produced invalid TaskPlan.\n\n"
-            f"Validation error:\n{e}\n\n"
-            f"Raw output:\n{raw_plan}"
+        task_plan = await _plan(
+            user_goal, planner_agent, catalog, token_usage, runner, prefetched, repair,
+            escalation_agent=agents.planner_escalation, context=context,
         )
+    except BaseException:
+        discard_prefetch(prefetched)
+        raise
+    stage_latency = {"planner": time.perf_counter() - stage_start}
     
-    # Validate tool names
-    allowed = set(get_tool_names(tools))
-    print(f"\n✅ Allowed tools: {sorted(allowed)}")
-    
-    for step in task_plan.steps:
-        for tool in step.tools or []:
-            if tool not in allowed:
-                raise RuntimeError(
-                    f"\nVALIDATION FAILED: Planner used invalid tool '{tool}' in step {step.step_id}.\n"
-                    f"Allowed tools: {sorted(allowed)}\n\n"
-                    f"Full plan:\n{task_plan.model_dump_json(indent=2)}"
-                )
-    
-    print(f"✅ Plan validated: {len(task_plan.steps)} steps, all tools valid\n")
+    events.emit(events.PLAN_READY, plan=task_plan.model_dump(), latency=time.time() - start_time)
 
     # ----------------------------
     # 3. EXECUTE ALL TOOLS IN PLAN
     # ----------------------------
+    profiling.mark_phase("tools")
     print("\n" + "="*60)
     print("🔧 EXECUTING TOOLS FROM PLAN")
     print("="*60)
 
-    tool_results = await execute_plan_tools(task_plan, runner, user_goal)
+    prefetch_started = list(prefetched)
+    tool_calls: Dict[str, Dict[str, Any]] = {}
+    stage_start = time.perf_counter()
+    try:
+        tool_results = await execute_plan_tools(task_plan, runner, user_goal, prefetched, tool_calls)
+    finally:
+        prefetch_wasted = discard_prefetch(prefetched)
+    stage_latency["tools"] = time.perf_counter() - stage_start
+    if prefetch_wasted:
+        print(f"🗑️  Discarded prefetch not in plan: {', '.join(prefetch_wasted)}")
 
     # DEBUG: Show what we got
     print(f"\n📦 Tool results collected: {len(tool_results)} tools")
@@ -370,65 +794,27 @@ async def run_orchestration(user_goal: str, tools) -> ExecutionResult:
     # ----------------------------
     # 5. RUN EXECUTOR (WITH TOOL RESULTS)
     # ----------------------------
-    exec_description = (
-    "You are the Action Executor.\n\n"
-    "You MUST use the tool results below to complete the user's goal.\n\n"
-    f"Task Plan:\n{task_plan.model_dump_json(indent=2)}\n\n"
-)
-
-    if tool_results:
-        exec_description += "\n**Tool Execution Results:**\n"
-        for tool_name, result in tool_results.items():
-            exec_description += f"\n{tool_name}:\n{result}\n"
-        
-    exec_description += (
-            "\n**CRITICAL INSTRUCTIONS:**\n"
-            "1. Synthesize ALL tool results above into a coherent answer\n"
-            "2. If multiple steps were executed, combine the results logically\n"
-            "3. For example, if you searched for repos AND created an issue:\n"
-            "   - Extract repo names/URLs from search results\n"
-            "   - Format them into a summary\n"
-            "   - Confirm the issue was created with that summary\n"
-            "4. DO NOT just say 'task completed' - provide specific details\n"
-            "5. Show what data was found and what action was taken\n\n"
-            f"Original user goal: {user_goal}"
+    profiling.mark_phase("executor")
+    stage_start = time.perf_counter()
+    rendered = answers.render_answer(tool_results, user_goal) if TEMPLATE_ANSWERS else None
+    if rendered is not None:
+        print("📝 Single tool result rendered from template (executor skipped)")
+        raw_exec, execution_succeeded, execution_errors = rendered, True, []
+    else:
+        raw_exec, execution_succeeded, execution_errors = await _run_executor(
+            executor_agent, task_plan, tool_results, user_goal, token_usage, context
         )
-    
-    exec_task = Task(
-        description=exec_description,
-        expected_output="Final answer for the user",
-        agent=executor_agent,
-    )
+    stage_latency["executor"] = time.perf_counter() - stage_start
 
-    executor_crew = Crew(
-        agents=[executor_agent],
-        tasks=[exec_task],
-        process=Process.sequential,
-        verbose=False,
-    )
-
-    # Execute with error handling
-    try:
-        raw_exec = executor_crew.kickoff()
-        if not isinstance(raw_exec, str):
-            raw_exec = str(raw_exec)
-        execution_succeeded = True
-        execution_errors = []
-        
-    except Exception as e:
-        raw_exec = f"Execution failed: {str(e)}"
-        execution_succeeded = False
-        execution_errors = [str(e)]
+    events.emit(events.ANSWER, text=raw_exec, ok=execution_succeeded)
 
     # ----------------------------
     # 6. EVALUATE WITH JUDGE
     # ----------------------------
-    judge = judge_run(
-        goal=user_goal,
-        plan=task_plan.model_dump(),
-        final_answer=raw_exec,
-        trace=None,
-    )
+    profiling.mark_phase("judge")
+    stage_start = time.perf_counter()
+    judge = await _judge(user_goal, task_plan.model_dump(), raw_exec, agents.judge, token_usage)
+    stage_latency["judge"] = time.perf_counter() - stage_start
 
     print(f"\n📊 Judge scores: Success={judge.success}/5, Plan={judge.plan_quality}/5, Reasoning={judge.reasoning_quality}/5")
     print(f"Notes: {judge.notes}\n")
@@ -444,6 +830,7 @@ async def run_orchestration(user_goal: str, tools) -> ExecutionResult:
     tools_used = list(set(tools_used))  # Deduplicate
     
     # Log metrics
+    profiling.mark_phase("metrics")
     metric_entry = MetricEntry(
         timestamp=datetime.now().isoformat(),
         goal=user_goal,
@@ -455,6 +842,26 @@ async def run_orchestration(user_goal: str, tools) -> ExecutionResult:
         completed=execution_succeeded,
         errors=execution_errors,
         tools_used=tools_used,
+        tool_calls=tool_calls,
+        open_breakers=runner.open_breakers(),
+        rate_budget=runner.rate_budget(),
+        concurrency_limits=runner.concurrency_limits(),
+        token_usage=token_usage,
+        prefetch_hits=[t for t in prefetch_started if t not in prefetch_wasted],
+        prefetch_wasted=prefetch_wasted,
+        plan_repairs=repair.fixes,
+        plan_repair_seconds=repair.seconds,
+        stage_latency={stage: round(sec, 3) for stage, sec in stage_latency.items()},
+        stage_models={
+            "planner": repair.model,
+            "executor": _model_name(executor_agent),
+            "judge": str(getattr(agents.judge, "model_name", None) or "default"),
+        },
+        planner_escalated=repair.escalated,
+        executor_skipped=rendered is not None,
+        planner_tools=len(catalog),
+        llm_calls=1 + sum(f in ("escalate", "reprompt") for f in repair.fixes) + (rendered is None),
+        ab_group=ab_group,
     )
     metrics.log(metric_entry)
     
@@ -468,7 +875,7 @@ async def run_orchestration(user_goal: str, tools) -> ExecutionResult:
             "plan": task_plan.model_dump(),
             "research": research_output,
             "judge": judge.model_dump(),
-            "tool_results": tool_results,  
+            "tool_results": {name: prompts.clip_result(result) for name, result in tool_results.items()},
             "execution_time": execution_time,
         },
         errors=execution_errors,
@@ -1,30 +1,23 @@
 """
 Standalone metrics viewer - run anytime to see stats
+
+    python scripts/view_metrics.py [last_n_runs]
+    python scripts/view_metrics.py --analytics [--window 50] [--recent 100] [--baseline N]
 """
 from orchestrai.metrics import MetricsTracker
-import sys
+import argparse
+import time
 
 
-def main():
-    tracker = MetricsTracker()
-    
-    # Check for arguments
-    last_n = None
-    if len(sys.argv) > 1:
-        try:
-            last_n = int(sys.argv[1])
-        except ValueError:
-            print("Usage: python scripts/view_metrics.py [last_n_runs]")
-            return
-    
+def print_recent(tracker: MetricsTracker, last_n: int = None) -> None:
     # Print summary
     tracker.print_summary(last_n)
-    
+
     # Show recent runs
     entries = tracker.load_all()
     if last_n:
         entries = entries[-last_n:]
-    
+
     if entries:
         print("\n📝 RECENT RUNS:")
         print("-" * 100)
@@ -40,5 +33,91 @@ def main():
         print("-" * 100 + "\n")
 
 
+def _ms(seconds: float) -> str:
+    return "-" if seconds != seconds else f"{seconds * 1000:.0f}"  # NaN: no per-call timings
+
+
+def _pct(rate: float) -> str:
+    return "-" if rate != rate else f"{rate * 100:.1f}%"
+
+
+def print_analytics(tracker: MetricsTracker, last_n: int, window: int, recent: int, baseline: int) -> None:
+    from orchestrai import analytics
+
+    start = time.perf_counter()
+    records = tracker.load_records()
+    if last_n:
+        records = records[-last_n:]
+    if not records:
+        print("\n📊 Metrics: No metrics available")
+        return
+    cols = analytics.load_columns(records)
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tools = analytics.tool_stats(cols)
+    servers = analytics.server_stats(cols)
+    trends = analytics.trends(cols, window)
+    pairs = analytics.co_occurrence(cols)
+    regressions = analytics.regressions(cols, recent, baseline)
+    analysed = time.perf_counter() - start
+
+    print("\n" + "=" * 100)
+    print(f"📊 METRICS ANALYTICS: {len(cols):,} runs (loaded in {loaded:.2f}s, analysed in {analysed * 1000:.0f}ms)")
+    print("=" * 100)
+
+    print(f"\n{'Tool':<28}{'Runs':>8}{'Success':>10}{'Call err':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+    print("-" * 83)
+    for tool, s in sorted(tools.items(), key=lambda kv: -kv[1]["runs"]):
+        print(f"{tool:<28}{s['runs']:>8,}{_pct(s['success_rate']):>10}{_pct(s['call_error_rate']):>10}"
+              f"{_ms(s['p50']):>9}{_ms(s['p90']):>9}{_ms(s['p99']):>9}")
+
+    if servers:
+        print(f"\n{'Server':<28}{'Calls':>8}{'Call err':>10}{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}")
+        print("-" * 73)
+        for server, s in servers.items():
+            print(f"{server:<28}{s['calls']:>8,}{_pct(s['call_error_rate']):>10}"
+                  f"{_ms(s['p50']):>9}{_ms(s['p90']):>9}{_ms(s['p99']):>9}")
+
+    if trends:
+        print(f"\nRolling Trends ({window}-run window, oldest → newest):")
+        for name, values in trends.items():
+            print(f"  - {name}: {' → '.join(f'{v:g}' for v in values)}")
+
+    if pairs:
+        print("\nTool Co-occurrence (runs using both):")
+        for a, b, count in pairs:
+            print(f"  - {a} + {b}: {count:,}")
+
+    print(f"\nRegressions (last {recent} runs vs {'previous ' + str(baseline) if baseline else 'all earlier'} runs):")
+    if not regressions:
+        print("  - none")
+    for r in regressions:
+        if r["metric"] == "p50":
+            print(f"  - {r['tool']}: p50 {_ms(r['baseline'])}ms → {_ms(r['recent'])}ms")
+        else:
+            print(f"  - {r['tool']}: success {_pct(r['baseline'])} → {_pct(r['recent'])}")
+    print("=" * 100 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Show orchestration metrics",
+        usage="python scripts/view_metrics.py [last_n_runs] [--analytics ...]",
+    )
+    parser.add_argument("last_n", nargs="?", type=int, help="Only consider the last N runs")
+    parser.add_argument("--analytics", action="store_true", help="Per-tool/per-server columnar report")
+    parser.add_argument("--window", type=int, default=50, help="Rolling trend window (runs)")
+    parser.add_argument("--recent", type=int, default=100, help="Runs compared against the baseline")
+    parser.add_argument("--baseline", type=int, default=None, help="Baseline runs (default: all earlier)")
+    args = parser.parse_args()
+
+    tracker = MetricsTracker()
+    if args.analytics:
+        print_analytics(tracker, args.last_n, args.window, args.recent, args.baseline)
+    else:
+        print_recent(tracker, args.last_n)
+
+
 if __name__ == "__main__":
     main()
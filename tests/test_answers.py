@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from orchestrai import answers, prompts
+from orchestrai.schemas import PlanStep, TaskPlan
+from orchestrai.workflow import execute_plan_tools
+
+
+def _user(login: str) -> dict:
+    base = f"https://api.github.com/users/{login}"
+    return {
+        "login": login, "id": 583231, "node_id": "MDQ6VXNlcjU4MzIzMQ==",
+        "avatar_url": "https://avatars.githubusercontent.com/u/583231?v=4", "gravatar_id": "",
+        "url": base, "html_url": f"https://github.com/{login}",
+        "followers_url": f"{base}/followers", "following_url": f"{base}/following{{/other_user}}",
+        "gists_url": f"{base}/gists{{/gist_id}}", "starred_url": f"{base}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"{base}/subscriptions", "organizations_url": f"{base}/orgs",
+        "repos_url": f"{base}/repos", "events_url": f"{base}/events{{/privacy}}",
+        "received_events_url": f"{base}/received_events", "type": "User", "site_admin": False,
+    }
+
+
+def _issue(n: int) -> dict:
+    """Issue JSON shaped like a GitHub REST response (what the MCP server returns)"""
+    api = f"https://api.github.com/repos/octocat/hello-world/issues/{n}"
+    return {
+        "url": api, "repository_url": "https://api.github.com/repos/octocat/hello-world",
+        "labels_url": f"{api}/labels{{/name}}", "comments_url": f"{api}/comments",
+        "events_url": f"{api}/events", "html_url": f"https://github.com/octocat/hello-world/issues/{n}",
+        "id": 1000000 + n, "node_id": f"I_kwDOABCD{n:06d}", "number": n,
+        "title": f"Crash when loading config file #{n}", "user": _user("octocat"),
+        "labels": [{"id": 208045946, "name": "bug", "color": "f29513", "default": True,
+                    "description": "Something isn't working"}],
+        "state": "open", "locked": False, "assignee": None, "assignees": [], "milestone": None,
+        "comments": 0, "created_at": "2025-01-01T00:00:00Z", "updated_at": "2025-01-02T00:00:00Z",
+        "closed_at": None, "author_association": "OWNER",
+        "body": "Steps to reproduce:\n1. Run the app\n2. Open settings\n\nExpected: no crash.",
+        "reactions": {"url": f"{api}/reactions", "total_count": 0, "+1": 0, "-1": 0, "laugh": 0,
+                      "hooray": 0, "confused": 0, "heart": 0, "rocket": 0, "eyes": 0},
+        "timeline_url": f"{api}/timeline", "state_reason": None,
+    }
+
+
+class FakeRunner:
+    server_of = {}
+
+    def __init__(self, result: str):
+        self.result = result
+
+    async def call(self, tool_name, args):
+        return self.result
+
+
+def _run_tool(tool_name: str, goal: str, result: str, monkeypatch) -> dict:
+    monkeypatch.setenv("ORCHESTRAI_ISSUE_MIRROR", "off")
+    plan = TaskPlan(goal=goal, steps=[PlanStep(step_id=1, action="run", tools=[tool_name], success_criteria="ok")])
+    return asyncio.run(execute_plan_tools(plan, FakeRunner(result), goal))
+
+
+def test_created_issue_template_gets_the_full_response(monkeypatch):
+    payload = json.dumps(_issue(42))
+    assert len(payload) > prompts.TOOL_RESULT_CHARS
+    goal = "Create an issue titled Crash in octocat/hello-world"
+    results = _run_tool("create_issue", goal, payload, monkeypatch)
+    answer = answers.render_answer(results, goal)
+    assert answer.startswith("✅ Created issue #42: Crash when loading config file #42")
+
+
+def test_issue_list_template_gets_the_full_page(monkeypatch):
+    payload = json.dumps([_issue(n) for n in range(30, 0, -1)])
+    goal = "List issues in octocat/hello-world"
+    results = _run_tool("list_issues", goal, payload, monkeypatch)
+    answer = answers.render_answer(results, goal)
+    assert answer.startswith("Found 30 issues:")
+    assert "... and 20 more" in answer
+
+
+def test_executor_prompt_still_clips_results():
+    prompt = prompts.executor_prompt("{}", {"list_issues": "x" * 10_000}, "goal")
+    assert "x" * prompts.TOOL_RESULT_CHARS in prompt
+    assert "x" * (prompts.TOOL_RESULT_CHARS + 1) not in prompt
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+
+from orchestrai.engines import Engine, EngineRouter
+from orchestrai.schemas import ExecutionResult
+from orchestrai.tool_runner import ReadOnlyError, ToolRunner
+
+
+class FakeTool:
+    def __init__(self, name: str):
+        self.name = name
+        self.metadata = {"mcp_server": "github"}
+
+    async def ainvoke(self, args):
+        return "ok"
+
+
+class FakeEngine(Engine):
+    """Calls one tool per run; records each outcome"""
+
+    def __init__(self, name: str, runner: ToolRunner, tool: str, delay: float = 0.0):
+        self.name = name
+        self.runner = runner
+        self.tool = tool
+        self.delay = delay
+        self.outcomes = []
+
+    async def run(self, user_goal: str, context: str = "", ab_group: str = "") -> ExecutionResult:
+        await asyncio.sleep(self.delay)
+        try:
+            self.outcomes.append(await self.runner.call(self.tool, {}))
+        except ReadOnlyError as e:
+            self.outcomes.append(e)
+        return ExecutionResult(goal=user_goal, completed=True, outputs={}, errors=[], final_answer="done")
+
+
+def _router(shadow_tool: str, delay: float = 0.0, max_shadows: int = 2):
+    runner = ToolRunner([FakeTool("list_issues"), FakeTool("create_issue")])
+    primary = FakeEngine("crewai", runner, "list_issues")
+    shadow = FakeEngine("react", runner, shadow_tool, delay)
+    router = EngineRouter({"crewai": primary, "react": shadow}, ab_fraction=1.0, max_shadows=max_shadows)
+    return router, primary, shadow
+
+
+def test_shadow_runs_cannot_write():
+    router, primary, shadow = _router("create_issue")
+
+    async def main():
+        await router.run("list issues in o/r")
+        await router.drain()
+
+    asyncio.run(main())
+    assert primary.outcomes == ["ok"]
+    assert len(shadow.outcomes) == 1 and isinstance(shadow.outcomes[0], ReadOnlyError)
+
+
+def test_shadows_beyond_the_cap_are_dropped():
+    router, primary, shadow = _router("list_issues", delay=0.05, max_shadows=2)
+
+    async def main():
+        for _ in range(5):
+            await router.run("list issues in o/r")
+        assert router.shadows_pending == 2
+        await router.drain()
+
+    asyncio.run(main())
+    assert len(primary.outcomes) == 5
+    assert len(shadow.outcomes) == 2
+
+
+def test_incomplete_engine_fails_at_construction():
+    class NoRun(Engine):
+        name = "broken"
+
+    with pytest.raises(TypeError):
+        NoRun()
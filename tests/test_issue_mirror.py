@@ -0,0 +1,85 @@
+import asyncio
+import json
+
+import pytest
+
+from orchestrai import issue_mirror
+
+
+class FakeRunner:
+    """list_issues over an in-memory repo, same paging/since semantics as GitHub"""
+
+    def __init__(self, count: int, fail_on_page: int = 0):
+        self.issues = [
+            {"number": n, "title": f"Issue {n}", "state": "open", "updated_at": f"2025-01-01T00:{n // 60:02d}:{n % 60:02d}Z"}
+            for n in range(1, count + 1)
+        ]
+        self.fail_on_page = fail_on_page
+        self.calls = []
+
+    async def call(self, tool_name, args):
+        self.calls.append(args)
+        assert "perPage" not in args
+        if args["page"] == self.fail_on_page:
+            raise RuntimeError("boom")
+        selected = [i for i in self.issues if i["updated_at"] >= args.get("since", "")]
+        start = (args["page"] - 1) * args["per_page"]
+        return json.dumps(selected[start:start + args["per_page"]])
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    return issue_mirror.IssueMirror(str(tmp_path / "issues.db"), ttl=0, page_size=10, max_pages=3)
+
+
+def test_backfill_pages_until_an_empty_page(mirror):
+    runner = FakeRunner(20)  # a full last page must not end the backfill
+    assert asyncio.run(mirror.sync(runner, "o", "r")) == 20
+    assert [c["page"] for c in runner.calls] == [1, 2, 3]
+    assert mirror.complete("o", "r")
+
+
+def test_delta_sync_stops_at_a_short_page(mirror):
+    runner = FakeRunner(20)
+    asyncio.run(mirror.sync(runner, "o", "r"))
+    runner.calls.clear()
+    assert len(json.loads(asyncio.run(mirror.list_issues(runner, "o", "r")))) == 20
+    assert len(runner.calls) == 1  # one delta page per TTL, no empty terminating page
+
+
+def test_first_read_falls_back_at_once_and_backfills_in_background(mirror):
+    runner = FakeRunner(45)  # more than max_pages * page_size
+
+    async def main():
+        with pytest.raises(issue_mirror.MirrorUnavailable, match="backfilling"):
+            await mirror.list_issues(runner, "o", "r")
+        assert runner.calls == []  # the read itself did not page
+        # A second read while the backfill runs shares its task
+        with pytest.raises(issue_mirror.MirrorUnavailable):
+            await mirror.list_issues(runner, "o", "r")
+        assert len(mirror._backfills) == 1
+        await mirror.drain()
+        return json.loads(await mirror.list_issues(runner, "o", "r"))
+
+    assert len(asyncio.run(main())) == 45
+    assert mirror.complete("o", "r")
+    assert runner.calls[3]["since"] == runner.issues[29]["updated_at"]
+
+
+def test_failed_backfill_keeps_progress_and_resumes(mirror):
+    runner = FakeRunner(25, fail_on_page=2)
+
+    async def read():
+        try:
+            return await mirror.list_issues(runner, "o", "r")
+        except issue_mirror.MirrorUnavailable:
+            await mirror.drain()
+
+    asyncio.run(read())
+    assert not mirror.complete("o", "r")
+    assert len(mirror.query("o", "r")) == 10
+
+    runner.fail_on_page = 0
+    asyncio.run(read())
+    assert mirror.complete("o", "r")
+    assert len(mirror.query("o", "r")) == 25
@@ -0,0 +1,117 @@
+import json
+import multiprocessing
+import os
+import time
+
+import pytest
+
+from orchestrai import metrics_store
+
+fork = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork")
+# forkserver: forking this (possibly multi-threaded) pytest process itself can deadlock
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "fork"
+
+
+def _record(n: int, source: str = "test") -> dict:
+    return {"timestamp": f"2025-01-01T00:00:{n:06d}", "goal": f"{source}-{n}", "source": source}
+
+
+def _session(path: str, n: int) -> None:
+    """A short CLI/batch-like process: compaction on start, one run logged, exit"""
+    metrics_store.compact(path)
+    metrics_store.writer_for(path).write(_record(n, "session"))
+
+
+def _busy(path: str, worker: int, count: int) -> None:
+    writer = metrics_store.writer_for(path)
+    for i in range(count):
+        writer.write(_record(worker * 10_000 + i, f"worker{worker}"))
+        if i % 50 == 0:
+            metrics_store.compact(path)
+
+
+def _run(ctx, target, *args) -> None:
+    process = ctx.Process(target=target, args=args)
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+
+
+@fork
+def test_short_sessions_never_drop_history(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    path.write_text(json.dumps(_record(0, "legacy")) + "\n")
+    ctx = multiprocessing.get_context(START_METHOD)
+
+    for n in range(1, 36):
+        _run(ctx, _session, str(path), n)
+    metrics_store.compact(path)
+
+    records = metrics_store.read_records(path)
+    assert len(records) == 36
+    assert any(r["source"] == "legacy" for r in records)
+    assert metrics_store.legacy_segment(path).exists()
+    assert not path.exists()
+    # New records were merged into one segment instead of one segment per session
+    assert len(metrics_store.compacted_segments(path)) == 1
+
+
+@fork
+def test_concurrent_writers_and_compaction(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    ctx = multiprocessing.get_context(START_METHOD)
+    processes = [ctx.Process(target=_busy, args=(str(path), w, 200)) for w in range(4)]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join(60)
+        assert p.exitcode == 0
+    metrics_store.compact(path)
+
+    records = metrics_store.read_records(path)
+    assert len(records) == 800
+    assert len({r["goal"] for r in records}) == 800
+
+
+def test_new_segment_when_newest_is_full(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    writer = metrics_store.MetricsWriter(path, buffered=False)
+    for n in range(3):
+        writer.write(_record(n))
+        writer.close()
+        metrics_store.compact(path, max_bytes=1)  # every segment is already "full"
+    assert len(metrics_store.compacted_segments(path)) == 3
+    assert len(metrics_store.read_records(path)) == 3
+
+
+def test_prune_only_by_age_or_size(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    path.write_text(json.dumps(_record(0, "legacy")) + "\n")
+    writer = metrics_store.MetricsWriter(path, buffered=False)
+    for n in range(1, 6):
+        writer.write(_record(n))
+        writer.close()
+        metrics_store.compact(path, max_bytes=1)
+    segments = metrics_store.compacted_segments(path)
+    assert len(segments) == 5
+
+    # Defaults never delete
+    assert metrics_store.prune(path) == []
+
+    old = time.time() - 10 * 86400
+    for segment in segments[:2]:
+        os.utime(segment, (old, old))
+    assert metrics_store.prune(path, retention_days=7) == segments[:2]
+
+    # A size cap keeps the newest segment and the legacy import
+    metrics_store.prune(path, max_total_bytes=1)
+    assert metrics_store.compacted_segments(path) == segments[-1:]
+    sources = {r["source"] for r in metrics_store.read_records(path)}
+    assert sources == {"legacy", "test"}
+
+
+def test_torn_and_corrupt_lines_are_skipped():
+    line = metrics_store.frame(_record(1))
+    assert metrics_store.parse_line(line)["goal"] == "test-1"
+    assert metrics_store.parse_line(line[:-5]) is None
+    assert metrics_store.parse_line("00000000" + line[8:]) is None
@@ -0,0 +1,36 @@
+import pytest
+
+from orchestrai import plan_repair
+
+CATALOG = tuple(sorted([
+    "add_issue_comment", "create_issue", "create_pull_request", "delete_file", "get_file_contents",
+    "get_issue", "get_weather", "list_issues", "merge_pull_request", "search_issues", "tavily_search",
+    "update_issue",
+]))
+
+
+@pytest.mark.parametrize("name", ["delete_issue", "remove_issue", "list_pull_requests", "merge_issue"])
+def test_unknown_tools_are_not_mapped_onto_other_actions(name):
+    assert plan_repair.match_tool(name, CATALOG) is None
+
+
+@pytest.mark.parametrize("name, expected", [
+    ("Create Issue", "create_issue"),  # same tool, only case/separators differ
+    ("list_issue", "list_issues"),
+    ("get_issues", "get_issue"),
+    ("weather", "get_weather"),
+    ("tavily-search", "tavily_search"),
+])
+def test_close_names_are_repaired(name, expected):
+    assert plan_repair.match_tool(name, CATALOG) == expected
+
+
+def test_fuzzy_match_never_lands_on_a_write_tool():
+    assert plan_repair.match_tool("create_issues", CATALOG) is None
+    assert plan_repair.match_tool("update_issues", CATALOG) is None
+
+
+def test_unknown_write_tool_invalidates_the_plan():
+    raw = '{"goal": "g", "steps": [{"step_id": 1, "action": "x", "tools": ["delete_issue"], "success_criteria": "y"}]}'
+    with pytest.raises(plan_repair.PlanInvalid, match="unknown tool 'delete_issue'"):
+        plan_repair.parse_plan(raw, "g", CATALOG)
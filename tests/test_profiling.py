@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+from orchestrai import profiling
+
+
+def _busy(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def _run(name: str, started: asyncio.Event, other: asyncio.Event) -> None:
+    profiling.mark_phase(name)
+    started.set()
+    await other.wait()  # both runs have marked a phase before either works
+    for _ in range(10):
+        _busy(0.01)
+        await asyncio.sleep(0)
+    profiling.mark_phase(None)
+
+
+def test_concurrent_runs_on_one_loop_keep_their_own_phase():
+    async def main():
+        a, b = asyncio.Event(), asyncio.Event()
+        with profiling.SamplingProfiler(interval=0.001) as profiler:
+            await asyncio.gather(_run("planner", a, b), _run("executor", b, a))
+        return profiler
+
+    totals = asyncio.run(main()).phase_totals()
+    assert totals.get("planner", 0) > 0 and totals.get("executor", 0) > 0
+    # mark_phase(None) in one run must not clear the other's phase
+    assert totals.get("other", 0) < min(totals["planner"], totals["executor"])
@@ -0,0 +1,29 @@
+import time
+
+from orchestrai.resilience import AdaptiveLimit
+
+
+def _feed(limit: AdaptiveLimit, calls, rounds: int = 50) -> None:
+    for _ in range(rounds):
+        for tool, latency in calls:
+            limit._adjust(time.monotonic(), latency, True, tool)
+
+
+def test_mixed_latency_tools_do_not_collapse_the_limit():
+    limit = AdaptiveLimit(initial=4)
+    _feed(limit, [("get_fast", 0.02), ("get_slow", 0.1)])
+    assert limit.current > 4
+
+
+def test_slowdown_of_one_tool_still_cuts_the_limit():
+    limit = AdaptiveLimit(initial=8)
+    _feed(limit, [("get_fast", 0.02), ("get_slow", 0.1)], rounds=5)
+    before = limit.limit
+    limit._adjust(time.monotonic(), 0.3, True, "get_slow")  # 3x its own baseline
+    assert limit.limit < before
+
+
+def test_errors_cut_the_limit():
+    limit = AdaptiveLimit(initial=8)
+    limit._adjust(time.monotonic(), 0.01, False, "get_fast")
+    assert limit.current == 5
@@ -0,0 +1,35 @@
+import pytest
+from starlette.testclient import TestClient
+
+from orchestrai.schemas import ExecutionResult
+from orchestrai.service import build_app
+
+
+class FakeRuntime:
+    tools = []
+
+    async def run(self, goal: str) -> ExecutionResult:
+        return ExecutionResult(goal=goal, completed=True, outputs={}, errors=[], final_answer="done")
+
+    async def drain(self) -> None:
+        pass
+
+
+@pytest.fixture
+def client():
+    with TestClient(build_app(workers=1, queue_size=4, runtime=FakeRuntime())) as client:
+        yield client
+
+
+@pytest.mark.parametrize("timeout", ["abc", -1, 0, True, [5], "nan", "inf"])
+def test_bad_timeout_is_a_client_error(client, timeout):
+    response = client.post("/run", json={"goal": "Weather in Tokyo", "timeout": timeout})
+    assert response.status_code == 400
+    assert "timeout" in response.json()["error"]
+
+
+@pytest.mark.parametrize("timeout", [None, 5, "2.5"])
+def test_valid_timeout_runs_the_goal(client, timeout):
+    response = client.post("/run", json={"goal": "Weather in Tokyo", "timeout": timeout})
+    assert response.status_code == 200
+    assert response.json()["final_answer"] == "done"
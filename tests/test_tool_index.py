@@ -0,0 +1,28 @@
+from orchestrai.tool_index import ToolIndex
+
+DOCS = {f"tool_{n}": f"Does thing number {n}" for n in range(20)}
+DOCS.update({
+    "get_weather": "Current weather for a city",
+    "list_issues": "List issues in a GitHub repository",
+})
+
+
+def test_selects_top_k_matching_tools():
+    chosen = ToolIndex(DOCS).select("weather in Paris", k=3, pinned=())
+    assert "get_weather" in chosen and len(chosen) <= 3
+
+
+def test_no_matching_tool_falls_back_to_full_catalog():
+    index = ToolIndex(DOCS)
+    assert index.select("zzz qqq", k=3, pinned=("tavily_search",)) == index.names
+
+
+def test_planner_prefix_is_stable_only_up_to_the_catalog():
+    from orchestrai import prompts
+
+    index = ToolIndex(DOCS)
+    weather = prompts.planner_prompt(index.select("weather in Paris", k=3, pinned=()), "weather in Paris")
+    issues = prompts.planner_prompt(index.select("list issues", k=3, pinned=()), "list issues")
+    instructions = prompts.planner_instructions()
+    assert weather.startswith(instructions) and issues.startswith(instructions)
+    assert weather[len(instructions):].split("\n\n")[0] != issues[len(instructions):].split("\n\n")[0]
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+from orchestrai.resilience import CircuitOpenError
+from orchestrai.tool_runner import ReadOnlyError, ToolRunner, is_server_fault, rate_hints, read_only_tools
+
+
+class FakeTool:
+    def __init__(self, name: str, server: str = "github", error: Exception = None):
+        self.name = name
+        self.metadata = {"mcp_server": server}
+        self.error = error
+
+    async def ainvoke(self, args):
+        if self.error is not None:
+            raise self.error
+        return "ok"
+
+
+class ToolException(Exception):
+    """Stand-in for langchain_core.tools.ToolException (an MCP tool returned isError)"""
+
+
+@pytest.mark.parametrize("text", [
+    "Error: status 429",
+    "HTTP status code: 429",
+    "429 Too Many Requests",
+    "API rate limit exceeded for user ID 1",
+    "retry-after: 30",
+])
+def test_rate_limit_errors_are_recognised(text):
+    remaining, reset_in = rate_hints(text, failed=True)
+    assert remaining == 0 and reset_in is not None
+
+
+@pytest.mark.parametrize("text", ["issue 429 does not exist", "Not Found: issue #429"])
+def test_issue_number_429_is_not_a_rate_limit(text):
+    assert rate_hints(text, failed=True) == (None, None)
+
+
+def test_open_breaker_does_not_spend_rate_budget():
+    runner = ToolRunner([FakeTool("get_issue")], rate_limits={"github": (3, 3600.0)})
+    runner.breakers["github"].opened_at = float("inf")  # open and stays open
+    for _ in range(5):
+        with pytest.raises(CircuitOpenError):
+            asyncio.run(runner.call("get_issue", {}))
+    assert runner.buckets["github"].try_take()
+    assert runner.buckets["github"].tokens >= 1.9
+
+
+def test_read_only_runs_refuse_write_tools():
+    runner = ToolRunner([FakeTool("create_issue"), FakeTool("list_issues")])
+
+    async def shadow():
+        with read_only_tools():
+            assert await runner.call("list_issues", {}) == "ok"
+            # Tasks started inside the block inherit it
+            await asyncio.create_task(runner.call("create_issue", {}))
+
+    with pytest.raises(ReadOnlyError):
+        asyncio.run(shadow())
+    assert asyncio.run(runner.call("create_issue", {})) == "ok"
+
+
+@pytest.mark.parametrize("error", [
+    ToolException("Not Found: Resource not found (status 404)"),
+    ToolException("Validation Error: owner: Required"),
+    ValueError("invalid arguments"),
+])
+def test_caller_errors_leave_the_breaker_closed(error):
+    runner = ToolRunner([FakeTool("get_issue", error=error)], breaker_threshold=3)
+    for _ in range(10):
+        with pytest.raises(type(error)):
+            asyncio.run(runner.call("get_issue", {"owner": "nope", "repo": "typo"}))
+    assert runner.breakers["github"].state == "closed"
+    assert runner.limits["github"].current >= 4
+
+
+@pytest.mark.parametrize("error", [
+    ConnectionResetError("peer reset"),
+    ToolException("GitHub API error: status 502 Bad Gateway"),
+    ToolException("429 Too Many Requests"),
+])
+def test_server_faults_open_the_breaker(error):
+    assert is_server_fault(error)
+    runner = ToolRunner([FakeTool("get_issue", error=error)], breaker_threshold=3)
+    runner.buckets.clear()  # a 429 would otherwise pause the next calls in the rate governor
+    for _ in range(3):
+        with pytest.raises(type(error)):
+            asyncio.run(runner.call("get_issue", {}))
+    assert runner.breakers["github"].state == "open"